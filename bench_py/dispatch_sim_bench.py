@@ -0,0 +1,97 @@
+"""
+출동 시뮬레이터(streamlit_py/dispatch_sim.py) 정확도/속도 점검
+
+1) 정상 상태 점검: 구급차 수, 사이클 타임, 가동률 ρ를 정한 지역들을 여러 번 반복 시뮬레이션하여
+   반복 평균의 대기 확률/평균 대기 시간을 Erlang C(queueing.erlang_c)와, 가동률을 ρ와 비교한다.
+   1년 단위 비율 추정의 유한 구간 편향(수 %)을 감안한 허용 오차를 넘으면 종료 코드 1로 끝난다.
+2) 속도: 17개 지역(2023년 이송 건수 규모) × --replications회 반복에 걸린 시간
+
+사용 예:
+    python bench_py/dispatch_sim_bench.py
+    python bench_py/dispatch_sim_bench.py --replications 2000 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'streamlit_py'))
+import dispatch_sim
+import queueing
+
+# (구급차 수, 사이클 타임(시간), 가동률 ρ)
+STEADY_STATE_CASES = [
+    (5, 1.0, 0.8),
+    (10, 1.5, 0.9),
+    (20, 2.0, 0.95),
+    (3, 2.25, 0.3),
+    (161, 0.75, 0.7),
+]
+# 허용 오차: 평균 대기는 상대 오차, 대기 확률/가동률은 절대 오차
+WAIT_REL_TOL = 0.05
+PROB_ABS_TOL = 0.02
+
+# 2023년 시도별 이송 건수 (DATA/2023_move.csv)와 비슷한 규모의 17개 지역
+SPEED_CALLS = np.array([204241, 1311382, 338338, 319719, 137294, 236258, 137862, 325254, 33861,
+                        88361, 304095, 256513, 235786, 1015194, 305897, 194504, 107430], dtype=float)
+SPEED_UTILIZATION = np.array([0.95, 0.9, 0.8, 0.7, 0.6, 0.98, 0.5, 0.85, 0.9,
+                              0.7, 0.8, 0.9, 0.95, 0.55, 0.8, 0.9, 0.75])
+
+
+def check_steady_state(replications, seed):
+    servers = np.array([c for c, _, _ in STEADY_STATE_CASES])
+    cycle = np.array([h for _, h, _ in STEADY_STATE_CASES])
+    rho = np.array([r for _, _, r in STEADY_STATE_CASES])
+    calls = rho * servers / cycle * dispatch_sim.HOURS_PER_YEAR
+
+    result = dispatch_sim.simulate_chunk(calls, servers, cycle, replications, np.random.SeedSequence(seed))
+    expected_prob, expected_wait = queueing.erlang_c(calls, cycle, servers)
+
+    print(f"{'c':>5}{'사이클':>7}{'ρ':>6}{'P(대기)':>9}{'Erlang C':>10}{'대기(분)':>10}{'Erlang C':>10}{'가동률':>8}  결과")
+    print("-" * 78)
+    ok = True
+    for i, (c, h, r) in enumerate(STEADY_STATE_CASES):
+        prob = result["wait_prob"][:, i].mean()
+        wait = result["mean_wait_min"][:, i].mean()
+        util = result["utilization"][:, i].mean()
+        exp_wait = expected_wait[i] * 60
+        passed = (abs(prob - expected_prob[i]) <= PROB_ABS_TOL
+                  and abs(wait - exp_wait) <= max(WAIT_REL_TOL * exp_wait, 0.05)
+                  and abs(util - r) <= PROB_ABS_TOL)
+        ok &= passed
+        print(f"{c:>5}{h:>7.2f}{r:>6.2f}{prob:>9.3f}{expected_prob[i]:>10.3f}{wait:>10.1f}{exp_wait:>10.1f}{util:>8.3f}"
+              f"  {'✅' if passed else '❌'}")
+    return ok
+
+
+def measure_speed(replications, workers, seed):
+    cycle = np.where(np.arange(len(SPEED_CALLS)) % 2, 0.75, 2.25)
+    fleet = np.ceil(SPEED_CALLS / dispatch_sim.HOURS_PER_YEAR * cycle / SPEED_UTILIZATION).astype(int)
+    start = time.perf_counter()
+    for _ in dispatch_sim.run_simulation(np.arange(len(SPEED_CALLS)), SPEED_CALLS, fleet, cycle,
+                                         replications=replications, seed=seed, workers=workers):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="출동 시뮬레이터 정확도(Erlang C 비교)/속도 점검")
+    parser.add_argument("--replications", type=int, default=1000, help="속도 측정 반복 수")
+    parser.add_argument("--check-replications", type=int, default=1000, help="정상 상태 점검 반복 수")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: 반복 수에 따라 자동)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = check_steady_state(args.check_replications, args.seed)
+    seconds = measure_speed(args.replications, args.workers, args.seed)
+    print(f"\n⏱️ {len(SPEED_CALLS)}개 지역 × {args.replications:,}회 반복: {seconds:.2f}초")
+    if not ok:
+        print("❌ Erlang C와 맞지 않는 결과가 있습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
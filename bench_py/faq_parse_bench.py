@@ -0,0 +1,152 @@
+"""
+FAQ 크롤러 파서 처리량 벤치마크
+
+녹화된 응답(crawling_py.http_fixtures, EMERGENCY_FAQ_HTTP=replay)으로 faq.extract_answer를 질문별로 여러 번 실행해
+파서마다 1회 소요 시간, 초당 페이지 수, 초당 처리한 HTML 크기(MB/s)를 측정한다. 네트워크를 쓰지 않는다.
+
+녹화본이 없는 환경(빌드 에이전트 등)에서는 --synthetic으로 각 파서가 찾는 구조(div id, 요금표, ul.safety_sense 등)를
+갖춘 합성 페이지를 임시 폴더에 만들어 측정할 수 있다. (실제 사이트와 크기/구조가 다르므로 같은 조건끼리만 비교)
+결과는 실행마다 한 줄씩 JSON Lines 파일에 누적된다.
+
+사용 예:
+    EMERGENCY_FAQ_HTTP=record python bench_py/faq_parse_bench.py --repeat 1   # 네트워크가 있는 곳에서 한 번 녹화
+    python bench_py/faq_parse_bench.py --repeat 50
+    python bench_py/faq_parse_bench.py --synthetic --page-kb 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "bench_py", "results", "faq_parse_bench.jsonl")
+
+
+# ---------- 합성 페이지 ----------
+def synthetic_page(question, page_kb):
+    """question의 파서가 찾는 요소를 갖춘 page_kb 크기의 HTML"""
+    filler_p = "<p>안내 문구입니다. 자세한 내용은 관할 소방서로 문의하세요.</p>\n"
+    filler = filler_p * max(1, page_kb * 1024 // len(filler_p.encode("utf-8")))
+    if "구급차 이용금액" in question:
+        body = "".join(f'<div id="divnull.4729.null.{n}"><p>구간 {n} 설명 {"요금 안내 " * 20}</p></div>'
+                       for n in range(2214329, 2214334))
+        body += ("<table><thead><tr><th>구분</th><th>기본요금</th><th>추가요금</th></tr></thead><tbody>"
+                 + "<tr><td>일반구급차</td><td>30,000원</td><td>1,000원/km</td></tr>" * 10 + "</tbody></table>")
+    elif "법적인 문제" in question:
+        body = '<div id="content">' + "".join(
+            f"<p>응급처치 시 명시적 동의 {n}에 관한 법적 설명</p><li>위법성 조각 {n}</li>" for n in range(30)) + "</div>"
+    elif "긴급자동차" in question:
+        body = ('<div class="view_con"><p>긴급자동차는 말 그대로 신속하게 현장에 도착하는 것이 목표다.</p>'
+                + "<p>본문 문단입니다.</p>" * 40 + "<p>개정안의 핵심은 이렇다.</p></div>")
+    else:
+        body = '<ul class="safety_sense">' + "".join(
+            f'<li><img src="/img/{n}.png" alt="{n}. 침착하게 위치와 상황을 알려주세요"></li>' for n in range(12)) + "</ul>"
+    return f"<html><head><meta charset='utf-8'></head><body>{filler}{body}{filler}</body></html>".encode("utf-8")
+
+
+def write_synthetic_fixtures(directory, sources, page_kb):
+    from crawling_py.http_fixtures import FixtureResponse, save_fixture, fixture_path
+
+    for item in sources:
+        response = FixtureResponse(item["url"], 200, {"Content-Type": "text/html; charset=utf-8"},
+                                   synthetic_page(item["q"], page_kb), "utf-8", "utf-8")
+        save_fixture(response, fixture_path(item["url"], directory))
+
+
+# ---------- 측정 ----------
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def bench_sources(sources, extract_answer, repeat):
+    from crawling_py.http_fixtures import fixture_path, load_fixture, http_mode
+
+    results = []
+    for item in sources:
+        q, url = item["q"], item["url"]
+        if http_mode() == "replay" and not os.path.exists(fixture_path(url)):
+            results.append({"question": q, "missing": True})
+            continue
+        answer = extract_answer(q, url)  # 첫 실행(모듈 import, 녹화)은 측정에서 제외
+        html_bytes = len(load_fixture(fixture_path(url)).content) if os.path.exists(fixture_path(url)) else 0
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract_answer(q, url)
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        results.append({
+            "question": q,
+            "missing": False,
+            "html_bytes": html_bytes,
+            "answer_chars": len(answer),
+            "median_ms": median * 1000,
+            "min_ms": min(times) * 1000,
+            "pages_per_s": 1 / median if median else None,
+            "mb_per_s": html_bytes / median / 1e6 if median else None,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAQ 파서 처리량 벤치마크 (녹화 응답 재생)")
+    parser.add_argument("--repeat", type=int, default=50, help="파서별 반복 횟수")
+    parser.add_argument("--fixtures", help="녹화 파일 폴더 (기본 EMERGENCY_FAQ_FIXTURE_DIR 또는 crawling_py/fixtures)")
+    parser.add_argument("--synthetic", action="store_true", help="합성 페이지를 임시 폴더에 만들어 측정")
+    parser.add_argument("--page-kb", type=int, default=100, help="--synthetic 페이지 크기(KB)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="결과를 누적할 JSON Lines 파일")
+    args = parser.parse_args()
+
+    os.environ.setdefault("EMERGENCY_FAQ_HTTP", "replay")
+    if args.synthetic:
+        args.fixtures = tempfile.mkdtemp(prefix="faq_fixtures_")
+        os.environ["EMERGENCY_FAQ_HTTP"] = "replay"
+    if args.fixtures:
+        os.environ["EMERGENCY_FAQ_FIXTURE_DIR"] = args.fixtures
+
+    from crawling_py.page_modules.faq import QUESTION_SOURCES, extract_answer
+    from crawling_py.http_fixtures import http_mode, fixture_dir
+
+    if args.synthetic:
+        write_synthetic_fixtures(args.fixtures, QUESTION_SOURCES, args.page_kb)
+
+    print(f"모드: {http_mode()} / 녹화 폴더: {fixture_dir()}\n")
+    results = bench_sources(QUESTION_SOURCES, extract_answer, args.repeat)
+
+    print(f"{'질문':<28}{'HTML(KB)':>10}{'1회(ms)':>10}{'최소(ms)':>10}{'pages/s':>10}{'MB/s':>8}")
+    print("-" * 76)
+    for r in results:
+        label = r["question"][:14]
+        if r["missing"]:
+            print(f"{label:<28}  ⚠️ 녹화본 없음 (EMERGENCY_FAQ_HTTP=record로 녹화)")
+            continue
+        print(f"{label:<28}{r['html_bytes'] / 1024:>10.1f}{r['median_ms']:>10.2f}{r['min_ms']:>10.2f}"
+              f"{r['pages_per_s']:>10.1f}{r['mb_per_s']:>8.2f}")
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "params": {"repeat": args.repeat, "mode": http_mode(), "synthetic": args.synthetic,
+                   "page_kb": args.page_kb if args.synthetic else None},
+        "parsers": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n💾 결과 추가: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+import 시간 프로파일 리포트
+
+`python -X importtime`으로 각 대상 모듈을 새 인터프리터에서 import 하고,
+import 시간이 큰 최상위 패키지 순으로 정리한다. 대시보드 첫 화면(개요 페이지)을 그리기 전까지
+어떤 패키지가 시작 시간을 잡아먹는지 확인하는 용도이다.
+
+사용 예:
+    python bench_py/import_profile.py
+    python bench_py/import_profile.py --top 15 --target crawling_py.page_modules.faq
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# (이름, import 문) - first_paint는 main.py가 개요 페이지를 그리기 전에 import 하는 것들
+TARGETS = [
+    ("first_paint", "import streamlit, db_config, crawling_py.page_modules.overview"),
+    ("analysis", "import crawling_py.page_modules.analysis"),
+    ("faq", "import crawling_py.page_modules.faq"),
+    ("faq_crawler", "import requests, bs4"),
+]
+
+
+def profile_import(statement):
+    """
+    새 인터프리터에서 statement를 실행하고 -X importtime 출력을 파싱
+
+    Returns:
+        list[tuple[str, int, int]]: (모듈, self us, cumulative us)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([PROJECT_ROOT, os.path.join(PROJECT_ROOT, "streamlit_py")]))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def top_level_packages(rows):
+    """모듈별 self 시간을 최상위 패키지(pandas, plotly, ...) 단위로 합산"""
+    totals = {}
+    for name, self_us, _cumulative_us in rows:
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda x: x[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 import 시간 프로파일")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--target", action="append", help="추가로 측정할 모듈 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    targets = TARGETS + [(t, f"import {t}") for t in (args.target or [])]
+    for label, statement in targets:
+        try:
+            rows = top_level_packages(profile_import(statement))
+        except RuntimeError as e:
+            print(f"❌ {label}: {e}\n")
+            continue
+
+        total_ms = sum(us for _, us in rows) / 1000
+        print(f"📦 {label} ({statement}) — 총 {total_ms:,.0f}ms")
+        for package, us in rows[:args.top]:
+            print(f"    {package:<30}{us / 1000:>10,.1f}ms")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+적재(ingest) 성능 벤치마크
+
+합성 데이터를 생성한 뒤 load_car, load_move, emergency_ex.main을 각각 새 프로세스에서
+실행하여 소요 시간, 초당 적재 행 수, 최대 메모리(peak RSS)를 측정한다.
+
+사용 예:
+    python bench_py/ingest_bench.py --years 5 --regions 50 --patients 200
+    python bench_py/ingest_bench.py --backend duckdb
+    python bench_py/ingest_bench.py --backend mysql --host 127.0.0.1 --user root --password 1234
+"""
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import resource
+import tempfile
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+from bench_py.synthetic_data import generate
+
+# 벤치마크 적재의 단계별 계측 기록이 실제 적재 기록(.telemetry/ingest.jsonl)에 섞이지 않도록 분리
+os.environ.setdefault("EMERGENCY_INGEST_TELEMETRY", os.path.join(tempfile.mkdtemp(prefix="ingest_bench_"), "ingest.jsonl"))
+
+# (단계 이름, 측정 후 행 수를 셀 테이블) - 적재는 staging 테이블에 하고 마지막에 live와 교체
+STAGES = [
+    ("schema", None),
+    ("load_car", "emergency_car_staging"),
+    ("load_move", "emergency_move_staging"),
+    ("emergency_ex.main", "emergency_ex_staging"),
+    ("swap", None),
+]
+
+
+# ---------- 자식 프로세스에서 실행되는 함수들 ----------
+def _configure(settings):
+    """백엔드/데이터 경로를 설정하고 적재 모듈들을 반환"""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.append(PROJECT_ROOT)
+    import db_config
+
+    if settings["backend"] == "mysql":
+        # emergency_ex는 import 시점에 DB_CONFIG를 읽으므로 import 전에 덮어쓴다
+        db_config.DB_CONFIG.update(settings["mysql"])
+    elif settings["backend"] == "duckdb":
+        # db_config의 내장 DuckDB 백엔드를 그대로 사용 (get_connection/get_engine이 호출 시점에 읽음)
+        db_config.DB_BACKEND = "duckdb"
+        db_config.EMBEDDED_DB_PATH = settings["duckdb_path"]
+
+    import sql_py.emergency_car as sql_car
+    import sql_py.emergency_ex as sql_ex
+    import sql_py.emergerncy_move as sql_move
+    import sql_py.staging as sql_staging
+    import sql_py.quarantine as sql_quarantine
+    import csv_py.validation as validation
+    import csv_py.emergency_car as csv_car
+    import csv_py.emergency_move as csv_move
+    import csv_py.emergency_ex as csv_ex
+
+    get_connection = db_config.get_connection
+    if settings["backend"] == "sqlite":
+        from bench_py.sqlite_standin import connection_factory, engine_factory
+        get_connection = connection_factory(settings["sqlite_path"])
+        for mod in (sql_car, sql_ex, sql_move, sql_staging, sql_quarantine, csv_car, csv_move):
+            mod.get_connection = get_connection
+        csv_ex.get_engine = engine_factory(settings["sqlite_path"])
+
+    # 17개 시도 이후의 가상 지역명도 검증을 통과하도록 등록
+    validation.KNOWN_REGIONS.update(settings.get("regions", ()))
+
+    # 원본 DATA/ 대신 합성 데이터를 읽도록 경로 교체 ("DATA/2019_car.csv" 형식 유지)
+    root = settings["data_root"] + "/"
+    csv_car.loc = root
+    csv_car.files = [f"DATA/{y}_car.csv" for y in settings["years"]]
+    csv_move.loc = root
+    csv_move.files = [f"DATA/{y}_move.csv" for y in settings["years"]]
+    csv_ex.FILE_GLOB = root + "DATA/*_ex.xlsx"
+
+    stages = {
+        "schema": lambda: (sql_car.emergency_car_table(), sql_move.emergency_move_table(), sql_ex.emergency_ex_table(),
+                           sql_quarantine.quarantine_table()),
+        "load_car": csv_car.load_car,
+        "load_move": csv_move.load_move,
+        "emergency_ex.main": csv_ex.main,
+        "swap": lambda: (sql_car.emergency_car_swap(), sql_move.emergency_move_swap(), sql_ex.emergency_ex_swap()),
+    }
+    return stages, get_connection
+
+
+def _run_stage(stage, table, settings):
+    stages, get_connection = _configure(settings)
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if settings["verbose"] else log):
+        start = time.perf_counter()
+        stages[stage]()
+        elapsed = time.perf_counter() - start
+
+    rows = 0
+    if table:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM {table}")
+                rows = cur.fetchone()[0]
+
+    # Linux의 ru_maxrss 단위는 KB
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"stage": stage, "rows": rows, "seconds": elapsed, "peak_rss_mb": peak_rss_mb}
+
+
+def seed_database(settings):
+    """현재 프로세스에서 스키마 생성 + 전체 적재를 조용히 실행 (다른 벤치마크의 데이터 준비용)"""
+    stages, _ = _configure(settings)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for stage, _table in STAGES:
+            stages[stage]()
+
+
+# ---------- 벤치마크 실행 ----------
+def run_benchmark(settings):
+    """단계마다 새 프로세스를 띄워 peak RSS가 단계별로 분리되도록 측정"""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for stage, table in STAGES:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            result = pool.submit(_run_stage, stage, table, settings).result()
+        result["rows_per_sec"] = result["rows"] / result["seconds"] if result["seconds"] > 0 else 0.0
+        results.append(result)
+    return results
+
+
+def print_report(results, info):
+    print(f"\n📊 적재 벤치마크 결과 (연도 {len(info['years'])}개, 원본 행 수 {info['source_rows']})")
+    print(f"{'단계':<20}{'행 수':>10}{'시간(s)':>10}{'rows/s':>12}{'peak RSS(MB)':>14}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['stage']:<20}{r['rows']:>10,}{r['seconds']:>10.3f}{r['rows_per_sec']:>12,.0f}{r['peak_rss_mb']:>14.1f}")
+
+
+def main():
+    from db_config import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="CSV/XLSX 적재 성능 벤치마크")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--regions", type=int, default=17)
+    parser.add_argument("--patients", type=int, default=12, help="연도·지역별 환자(ex) 행 수")
+    parser.add_argument("--start-year", type=int, default=2019)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=["sqlite", "duckdb", "mysql"], default="sqlite")
+    parser.add_argument("--host", default=DB_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=DB_CONFIG["port"])
+    parser.add_argument("--user", default=DB_CONFIG["user"])
+    parser.add_argument("--password", default=DB_CONFIG["password"])
+    parser.add_argument("--db", default=DB_CONFIG["db"])
+    parser.add_argument("--out", help="합성 데이터/SQLite·DuckDB 파일을 남길 경로 (기본: 임시 폴더)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--verbose", action="store_true", help="적재 모듈의 출력을 그대로 표시")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        out_dir = args.out or stack.enter_context(tempfile.TemporaryDirectory(prefix="ingest_bench_"))
+        print(f"🔧 합성 데이터 생성 중... ({out_dir})")
+        info = generate(out_dir, args.years, args.regions, args.patients, args.start_year, args.seed)
+
+        settings = {
+            "backend": args.backend,
+            "sqlite_path": os.path.join(out_dir, "bench.sqlite3"),
+            "duckdb_path": os.path.join(out_dir, "bench.duckdb"),
+            "mysql": {"host": args.host, "port": args.port, "user": args.user,
+                      "password": args.password, "db": args.db},
+            "data_root": os.path.abspath(out_dir),
+            "years": info["years"],
+            "regions": info["regions"],
+            "verbose": args.verbose,
+        }
+        for backend in ("sqlite", "duckdb"):
+            path = settings[f"{backend}_path"]
+            if args.backend == backend and os.path.exists(path):
+                os.remove(path)
+
+        results = run_benchmark(settings)
+        print_report(results, info)
+
+        if args.json:
+            params = {k: getattr(args, k) for k in ("years", "regions", "patients", "seed", "backend")}
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"params": params, "source_rows": info["source_rows"], "results": results},
+                          f, ensure_ascii=False, indent=2)
+            print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
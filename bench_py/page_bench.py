@@ -0,0 +1,199 @@
+"""
+대시보드 페이지 렌더링 지연 벤치마크
+
+Streamlit AppTest로 show_overview_page / show_analysis_page / show_faq_page를 헤드리스로 실행하고
+데이터 규모별로 페이지당 소요 시간, DB 쿼리 수, 가져간 행 수, 차트(plotly) 페이로드 크기를 기록한다.
+결과는 실행마다 한 줄씩 JSON Lines 파일에 누적되어 회귀 여부를 시간에 따라 비교할 수 있다.
+
+사용 예:
+    python bench_py/page_bench.py --scales 17x12,50x50,100x200 --repeat 3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+import warnings
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, 'streamlit_py'))
+from bench_py.synthetic_data import generate
+from bench_py.ingest_bench import seed_database
+from bench_py.sqlite_standin import connection_factory
+
+# 합성 데이터로 만든 스냅샷이 실제 대시보드의 .snapshot/을 덮어쓰지 않도록 분리
+os.environ.setdefault("EMERGENCY_SNAPSHOT_DIR", tempfile.mkdtemp(prefix="page_bench_snapshot_"))
+
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "bench_py", "results", "page_bench.jsonl")
+
+# (페이지 이름, 모듈, 함수)
+PAGES = [
+    ("overview", "crawling_py.page_modules.overview", "show_overview_page"),
+    ("analysis", "crawling_py.page_modules.analysis", "show_analysis_page"),
+    ("faq", "crawling_py.page_modules.faq", "show_faq_page"),
+]
+
+PAGE_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from {module} import {func}
+{func}()
+"""
+
+
+# ---------- 데이터 준비 ----------
+def seed_faq(get_connection, answer_kb):
+    """FAQ 페이지가 읽는 질문 목록(ORDER_MAP)에 맞춰 answer_kb 크기의 답변을 채운다"""
+    import sql_py.emergency_faq as sql_faq
+    from crawling_py.page_modules.faq import QUESTION_SOURCES, rebuild_search_index
+    from crawling_py.faq_answer import pack_answer
+
+    sql_faq.get_connection = get_connection
+    sql_faq.emergency_faq_table()
+
+    paragraph = "| 구분 | 기본요금 | 추가요금 |\n| --- | --- | --- |\n| 일반구급차 | 30,000원 | 1,000원/km |\n\n"
+    answer = (paragraph * (answer_kb * 1024 // len(paragraph.encode("utf-8")) + 1))
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            for item in QUESTION_SOURCES:
+                cur.execute("INSERT INTO emergency_faq (faq_question, faq_summary, faq_answer_z, content_hash) "
+                            "VALUES (%s, %s, %s, %s)",
+                            (item["q"], *pack_answer(answer + f"[출처] {item['url']}")))
+            rebuild_search_index(cur)
+        conn.commit()
+
+
+def prepare_scale(work_dir, years, regions, patients, answer_kb, seed):
+    """합성 데이터 생성 후 SQLite 대역에 적재하고 DB 파일 경로 반환"""
+    info = generate(work_dir, years, regions, patients, seed=seed)
+    db_path = os.path.join(work_dir, "bench.sqlite3")
+    seed_database({
+        "backend": "sqlite",
+        "sqlite_path": db_path,
+        "data_root": os.path.abspath(work_dir),
+        "years": info["years"],
+        "regions": info["regions"],
+        "verbose": False,
+    })
+    seed_faq(connection_factory(db_path), answer_kb)
+    return db_path
+
+
+def point_pages_at(db_path, stats):
+    """페이지 모듈들이 쓰는 DB 연결을 쿼리 수를 세는 SQLite 대역으로 교체"""
+    import utils
+    import crawling_py.page_modules.faq as faq
+
+    get_connection = connection_factory(db_path, stats)
+    utils.get_connection = get_connection
+    faq._conn = get_connection
+
+
+# ---------- 측정 ----------
+def run_page(module, func, timeout):
+    from streamlit.testing.v1 import AppTest
+    from streamlit.logger import set_log_level
+
+    at = AppTest.from_string(PAGE_SCRIPT.format(root=PROJECT_ROOT, module=module, func=func),
+                             default_timeout=timeout)
+    # AppTest 실행 중 쏟아지는 경고 로그(ScriptRunContext, deprecation)는 숨긴다
+    set_log_level("error")
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+
+    figure_bytes = sum(len(e.proto.spec) for e in at.get("plotly_chart"))
+    dataframe_bytes = sum(e.proto.ByteSize() for e in at.get("arrow_data_frame"))
+    errors = [str(e.value) for e in at.exception]
+    return elapsed, figure_bytes, dataframe_bytes, errors
+
+
+def bench_scale(db_path, repeat, timeout):
+    results = []
+    for name, module, func in PAGES:
+        times = []
+        for _ in range(repeat):
+            stats = {}
+            point_pages_at(db_path, stats)
+            elapsed, figure_bytes, dataframe_bytes, errors = run_page(module, func, timeout)
+            times.append(elapsed)
+        results.append({
+            "page": name,
+            "wall_time_s": statistics.median(times),
+            "wall_time_min_s": min(times),
+            "db_queries": stats.get("queries", 0),
+            "rows_transferred": stats.get("rows", 0),
+            "figure_bytes": figure_bytes,
+            "dataframe_bytes": dataframe_bytes,
+            "errors": errors,
+        })
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def parse_scales(text):
+    """'17x12,50x100' -> [(17, 12), (50, 100)]  (지역 수 x 연도·지역별 환자 행 수)"""
+    scales = []
+    for part in text.split(","):
+        regions, patients = part.lower().split("x")
+        scales.append((int(regions), int(patients)))
+    return scales
+
+
+def main():
+    # pymysql 대신 쓰는 DBAPI 연결에 대한 pandas 경고는 측정과 무관하므로 숨긴다
+    warnings.filterwarnings("ignore", message="pandas only supports SQLAlchemy")
+
+    parser = argparse.ArgumentParser(description="대시보드 페이지 렌더링 벤치마크")
+    parser.add_argument("--scales", default="17x12,50x50,100x200", help="지역수x환자행수 목록 (콤마 구분)")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--answer-kb", type=int, default=8, help="FAQ 답변 하나의 크기(KB)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="결과를 누적할 JSON Lines 파일")
+    args = parser.parse_args()
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "params": {"years": args.years, "answer_kb": args.answer_kb, "repeat": args.repeat},
+        "scales": [],
+    }
+
+    print(f"{'규모':<12}{'페이지':<10}{'시간(s)':>9}{'쿼리':>6}{'행 수':>10}{'차트(B)':>11}{'표(B)':>11}")
+    print("-" * 69)
+    for regions, patients in parse_scales(args.scales):
+        with tempfile.TemporaryDirectory(prefix="page_bench_") as work_dir:
+            db_path = prepare_scale(work_dir, args.years, regions, patients, args.answer_kb, args.seed)
+            results = bench_scale(db_path, args.repeat, args.timeout)
+
+        label = f"{regions}x{patients}"
+        for r in results:
+            print(f"{label:<12}{r['page']:<10}{r['wall_time_s']:>9.3f}{r['db_queries']:>6}"
+                  f"{r['rows_transferred']:>10,}{r['figure_bytes']:>11,}{r['dataframe_bytes']:>11,}")
+            for err in r["errors"]:
+                print(f"    ⚠️ {err}")
+        record["scales"].append({"regions": regions, "patients": patients, "pages": results})
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n💾 결과 추가: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
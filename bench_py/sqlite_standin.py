@@ -0,0 +1,90 @@
+"""
+MySQL 서버 없이 벤치마크를 돌리기 위한 SQLite 대역(stand-in)
+
+db_config의 내장 SQLite 백엔드(EmbeddedConnection)를 그대로 쓰되, 벤치마크가 원하는
+DB 파일을 가리키고 실행한 쿼리 수/가져간 행 수를 셀 수 있도록 한 얇은 래퍼이다.
+MySQL 문법(%s 파라미터, AUTO_INCREMENT, CHARACTER SET 절, 다중 RENAME TABLE) 변환은 db_config가 담당한다.
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db_config import EmbeddedCursor, EmbeddedConnection
+from db_config import translate_sql as _translate_sql
+
+
+def translate_sql(sql):
+    """MySQL 문장을 SQLite에서 실행 가능한 형태로 변환"""
+    return _translate_sql(sql, "sqlite")
+
+
+class StandinCursor(EmbeddedCursor):
+    """
+    pymysql 커서 인터페이스를 흉내내는 SQLite 커서
+
+    stats(dict)를 넘기면 실행한 쿼리 수(queries)와 가져간 행 수(rows)를 누적한다.
+    """
+
+    def __init__(self, cursor, stats=None):
+        super().__init__(cursor, "sqlite")
+        self._stats = stats
+
+    def _count(self, key, n):
+        if self._stats is not None:
+            self._stats[key] = self._stats.get(key, 0) + n
+
+    def execute(self, sql, params=None):
+        self._count("queries", 1)
+        return super().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        self._count("queries", 1)
+        return super().executemany(sql, seq_of_params)
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count("rows", 1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size)
+        self._count("rows", len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count("rows", len(rows))
+        return rows
+
+
+class StandinConnection(EmbeddedConnection):
+    """pymysql.Connection 대신 쓰는 SQLite 연결 (with 블록 종료 시 close)"""
+
+    def __init__(self, path, stats=None):
+        super().__init__(path, "sqlite")
+        self._stats = stats
+
+    def cursor(self):
+        return StandinCursor(self._conn.cursor(), self._stats)
+
+
+def connection_factory(path, stats=None):
+    """get_connection() 자리에 끼워 넣을 함수 생성"""
+    def get_connection():
+        return StandinConnection(path, stats)
+    return get_connection
+
+
+def engine_factory(path):
+    """emergency_ex.get_engine() 자리에 끼워 넣을 SQLAlchemy 엔진 생성 함수"""
+    from sqlalchemy import create_engine, event
+
+    def get_engine():
+        engine = create_engine(f"sqlite:///{path}")
+
+        @event.listens_for(engine, "before_cursor_execute", retval=True)
+        def _translate(conn, cursor, statement, parameters, context, executemany):
+            return translate_sql(statement), parameters
+
+        return engine
+    return get_engine
@@ -0,0 +1,200 @@
+"""
+벤치마크용 합성 데이터 생성 모듈
+
+DATA/ 폴더의 원본과 같은 형태(car/move CSV, ex XLSX, 2022년 헤더 없는 레이아웃 포함)로
+연도 × 지역 × 환자 행 수를 조절해 파일을 만든다.
+"""
+import os
+import csv
+import argparse
+import numpy as np
+import pandas as pd
+
+# ---------- 지역 ----------
+# (2글자 지역명, move CSV에 쓰이는 풀네임)
+REAL_REGIONS = [
+    ("서울", "서울특별시"), ("부산", "부산광역시"), ("대구", "대구광역시"),
+    ("인천", "인천광역시"), ("광주", "광주광역시"), ("대전", "대전광역시"),
+    ("울산", "울산광역시"), ("세종", "세종특별자치시"), ("경기", "경기도"),
+    ("강원", "강원도"), ("충북", "충청북도"), ("충남", "충청남도"),
+    ("전북", "전라북도"), ("전남", "전라남도"), ("경북", "경상북도"),
+    ("경남", "경상남도"), ("제주", "제주특별자치도"),
+]
+
+# ---------- ex 파일 컬럼 (원본 71개 컬럼 순서 그대로) ----------
+_TIME_PREFIXES = ["DCLR", "DSPT", "GRNDS_ARVL", "PTN_CNTC", "GRNDS_DPTRE", "CBK"]
+EX_COLUMNS = [
+    "RLF_RPTP_NO", "REG_CMPTN_SE_NM", "PTN_OCRN_TYPE_NM", "PTN_SYM_SE_NM", "SRIL_ONCR_NM",
+    "HRTARST_NM", "CRDVSC_CRVSSCR_SE_NM", "TRFC_ACDNT_SE_NM", "ETC_TRFC_ACDNT_NM",
+    "ANML_ETC_CLSF_NM", "ETC_OCRN_TYPE_NM", "FRSTN_NM", "CNTR_NM", "RLF_ACTV_SE_NM",
+    "HLCPT_PMPBLC_EN_NM",
+    "DCLR_YMD", "DCLR_TM", "DCLR_YR", "SEASN_NM", "QTR_NO", "DCLR_MM", "DCLR_DAY", "DCLR_HR",
+    "DCLR_MN", "DCLR_DOW",
+    "DSPT_YMD", "DSPT_TM", "DSPT_YR", "DSPT_MM", "DSPT_DAY", "DSPT_HR", "DSPT_MN",
+    "GRNDS_ARVL_YMD", "GRNDS_ARVL_TM", "GRNDS_ARVL_YR", "GRNDS_ARVL_MM", "GRNDS_ARVL_DAY",
+    "GRNDS_ARVL_HR", "GRNDS_ARVL_MN",
+    "PTN_CNTC_YMD", "PTN_CNTC_TM", "PTN_CNTC_YR", "PTN_CNTC_MM", "PTN_CNTC_DAY", "PTN_CNTC_HR",
+    "PTN_CNTC_MN", "GRNDS_DSTNC",
+    "GRNDS_DPTRE_YMD", "GRNDS_DPTRE_TM", "GRNDS_DPTRE_YR", "GRNDS_DPTRE_MM", "GRNDS_DPTRE_DAY",
+    "GRNDS_DPTRE_HR", "GRNDS_DPTRE_MN",
+    "CBK_YMD", "CBK_TM", "CBK_YR", "CBK_MM", "CBK_DAY", "CBK_HR", "CBK_MN",
+    "TRMN_SE_NM", "GNDR_NM", "PTN_CTPV_NM", "CTPV_NM", "SGG_NM", "CTY_FRMVL_SE_NM", "PTN_CR_NM",
+    "GRNDS2_DSTNC", "GRNDS3_DSTNC", "TRANS_CLSF_NM",
+]
+
+CAR_HEADER = ["No", "분류", "계", "특수", "일반", "인구 십만 명당 119 구급차 수",
+              "계", "1급 응급구조사", "2급 응급구조사", "간호사", "기타"]
+
+SYMPTOMS = ["기타통증", "기타", "두통", "복통", "전신쇠약", "고열", "열상", "요통", "호흡곤란", "토혈"]
+JOBS = ["무직", "직장인", "주부", "기타", "자영업", "학생", "유아", "영아"]
+SEASONS = {12: "겨울", 1: "겨울", 2: "겨울", 3: "봄", 4: "봄", 5: "봄",
+           6: "여름", 7: "여름", 8: "여름", 9: "가을", 10: "가을", 11: "가을"}
+DOW = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+
+def make_regions(count):
+    """
+    지역 목록 생성. 17개 실제 시도를 먼저 쓰고, 그 이상은 겹치지 않는 2음절 가상 지역명을 만든다.
+    (convert_region_name이 앞 2글자만 남기므로 가상 지역명도 2글자여야 서로 구분된다)
+    """
+    regions = REAL_REGIONS[:count]
+    taken = {short for short, _ in REAL_REGIONS} | {"전체"}
+    code = 0
+    while len(regions) < count:
+        name = chr(0xAC00 + (code // 97) * 28) + chr(0xAC00 + (code % 97) * 28 + 4)
+        code += 1
+        if name in taken:
+            continue
+        taken.add(name)
+        regions.append((name, name))
+    return regions
+
+
+# ---------- 파일별 생성 함수 ----------
+def write_car_csv(path, regions, rng):
+    """원본과 같은 car CSV (첫 행 '전체' 합계, 천 단위 콤마 포함)"""
+    n = len(regions)
+    cars = rng.integers(30, 300, n)
+    per_100k = np.round(rng.uniform(1.5, 9.0, n), 1)
+    staff = cars * rng.integers(7, 10, n)
+    emt1 = (staff * rng.uniform(0.3, 0.5, n)).astype(int)
+    emt2 = (staff * rng.uniform(0.1, 0.3, n)).astype(int)
+    nurse = (staff * rng.uniform(0.1, 0.2, n)).astype(int)  # 세 비율의 합이 1 이하가 되도록 (기타 >= 0)
+    etc = staff - emt1 - emt2 - nurse
+
+    rows = [[i + 2, regions[i][0], cars[i], cars[i], 0, per_100k[i],
+             staff[i], emt1[i], emt2[i], nurse[i], etc[i]] for i in range(n)]
+    total = ["1", "전체", cars.sum(), cars.sum(), 0, round(float(per_100k.mean()), 1),
+             staff.sum(), emt1.sum(), emt2.sum(), nurse.sum(), etc.sum()]
+
+    def fmt(v):
+        return f"{v:,}" if isinstance(v, (int, np.integer)) else str(v)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CAR_HEADER)
+        for row in [total] + rows:
+            writer.writerow([fmt(v) for v in row])
+    return n + 1
+
+
+def write_move_csv(path, regions, rng):
+    """원본과 같은 move CSV (' move_count' 헤더 공백, 풀네임 지역, CRLF)"""
+    counts = rng.integers(30_000, 1_400_000, len(regions))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write("move_local, move_count\r\n")
+        for (_, full_name), count in zip(regions, counts):
+            f.write(f"{full_name}, {count}\r\n")
+    return len(regions)
+
+
+def build_ex_frame(year, regions, patients, rng):
+    """ex XLSX 한 해 분량의 DataFrame (원본 71개 컬럼)"""
+    n = len(regions) * patients
+    region_idx = np.repeat(np.arange(len(regions)), patients)
+    shorts = np.array([r[0] for r in regions], dtype=object)[region_idx]
+    fulls = np.array([r[1] for r in regions], dtype=object)[region_idx]
+
+    data = {c: np.full(n, None, dtype=object) for c in EX_COLUMNS}
+    data["RLF_RPTP_NO"] = np.array([f"{year}42{i:07d}M{i % 100000:05d}" for i in range(n)], dtype=object)
+    data["REG_CMPTN_SE_NM"][:] = "등록완료"
+    data["PTN_OCRN_TYPE_NM"] = rng.choice(["질병", "질병외"], n)
+    data["PTN_SYM_SE_NM"] = rng.choice(SYMPTOMS, n)
+    data["FRSTN_NM"] = shorts + "소방서"
+    data["CNTR_NM"] = shorts + "119안전센터"
+    data["RLF_ACTV_SE_NM"] = rng.choice(["특수전문", "일반"], n)
+
+    # 신고 -> 출동 -> 도착 -> 접촉 -> 출발 -> 귀소 시각을 누적 분 단위로 생성
+    t = pd.Timestamp(f"{year}-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+    data["SEASN_NM"] = np.array([SEASONS[m] for m in t.month], dtype=object)
+    data["QTR_NO"] = ((t.month - 1) // 3 + 1).astype(str)
+    data["DCLR_DOW"] = np.array([DOW[d] for d in t.dayofweek], dtype=object)
+    for prefix in _TIME_PREFIXES:
+        data[f"{prefix}_YMD"] = t.strftime("%Y%m%d")
+        data[f"{prefix}_TM"] = t.strftime("%H%M%S").str.lstrip("0")
+        data[f"{prefix}_YR"] = t.year.astype(str)
+        data[f"{prefix}_MM"] = t.month.astype(str)
+        data[f"{prefix}_DAY"] = t.day.astype(str)
+        data[f"{prefix}_HR"] = t.hour.astype(str)
+        data[f"{prefix}_MN"] = t.minute.astype(str)
+        t = t + pd.to_timedelta(rng.integers(1, 40, n), unit="m")
+
+    data["GRNDS_DSTNC"] = rng.integers(0, 30, n).astype(str)
+    data["TRMN_SE_NM"][:] = "정상"
+    data["GNDR_NM"] = rng.choice(["남", "여"], n)
+    data["PTN_CTPV_NM"] = fulls
+    data["CTPV_NM"] = fulls
+    data["SGG_NM"] = shorts + "시"
+    data["CTY_FRMVL_SE_NM"] = rng.choice(["도시", "농촌"], n)
+    data["PTN_CR_NM"] = rng.choice(JOBS, n)
+    data["TRANS_CLSF_NM"][:] = "이송"
+    return pd.DataFrame(data, columns=EX_COLUMNS)
+
+
+def write_ex_xlsx(path, year, regions, patients, rng):
+    """
+    ex XLSX 저장. 2022년 파일은 원본처럼 헤더 행 없이 저장한다
+    (emergency_ex.load_file이 컬럼 인덱스로 읽는 레이아웃).
+    """
+    df = build_ex_frame(year, regions, patients, rng)
+    df.to_excel(path, index=False, header=(year != 2022))
+    return len(df)
+
+
+# ---------- 진입점 ----------
+def generate(out_dir, years=5, regions=17, patients=12, start_year=2019, seed=0):
+    """
+    out_dir/DATA/ 아래에 {연도}_car.csv, {연도}_move.csv, {연도}_ex.xlsx를 생성
+
+    Returns:
+        dict: 연도 목록, 2글자 지역명 목록, 파일 종류별 원본 행 수, 생성된 DATA 경로
+    """
+    data_dir = os.path.join(out_dir, "DATA")
+    os.makedirs(data_dir, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    region_list = make_regions(regions)
+    year_list = list(range(start_year, start_year + years))
+
+    source_rows = {"car": 0, "move": 0, "ex": 0}
+    for year in year_list:
+        source_rows["car"] += write_car_csv(os.path.join(data_dir, f"{year}_car.csv"), region_list, rng)
+        source_rows["move"] += write_move_csv(os.path.join(data_dir, f"{year}_move.csv"), region_list, rng)
+        source_rows["ex"] += write_ex_xlsx(os.path.join(data_dir, f"{year}_ex.xlsx"), year, region_list, patients, rng)
+
+    return {"years": year_list, "regions": [short for short, _ in region_list],
+            "source_rows": source_rows, "data_dir": data_dir}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 응급의료 데이터 생성")
+    parser.add_argument("out_dir")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--regions", type=int, default=17)
+    parser.add_argument("--patients", type=int, default=12, help="연도·지역별 환자(ex) 행 수")
+    parser.add_argument("--start-year", type=int, default=2019)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    info = generate(args.out_dir, args.years, args.regions, args.patients, args.start_year, args.seed)
+    print(f"✅ {info['data_dir']}에 {len(info['years'])}개 연도 데이터 생성 완료: {info['source_rows']}")
@@ -0,0 +1,140 @@
+"""
+FAQ 답변 저장 형식과 HTML 렌더링
+
+크롤러는 답변 Markdown을 zlib으로 압축해(faq_answer_z) 짧은 요약(faq_summary), 내용 해시(content_hash)와 함께 저장한다.
+FAQ 페이지는 목록을 그릴 때 질문/요약/해시만 읽고, 사용자가 전체 답변을 펼칠 때에만 그 행의 본문을 읽는다.
+
+본문은 크롤러 파서가 만드는 Markdown(문단, "- " 목록, "#### " 제목, 표, 이미지, [출처] 줄)만 쓰므로
+그 범위만 서버에서 HTML로 바꾸고, 결과는 내용 해시별로 캐시해 같은 답변을 다시 펼칠 때는 DB도 읽지 않는다.
+"""
+import re
+import html
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+
+SUMMARY_LENGTH = 200
+# 캐시할 렌더링 결과 수 (질문 수보다 넉넉하게)
+HTML_CACHE_SIZE = 64
+
+_IMAGE = re.compile(r"^!\[(.*?)\]\((\S+?)\)$")
+_SOURCE = re.compile(r"^\[출처\]\s*(\S+)$")
+
+
+# ===== 저장 형식 =====
+def content_hash(answer):
+    return hashlib.sha256(answer.encode("utf-8")).hexdigest()
+
+
+def compress_answer(answer):
+    return zlib.compress(answer.encode("utf-8"), 9)
+
+
+def decompress_answer(data):
+    return zlib.decompress(bytes(data)).decode("utf-8")
+
+
+def summarize(answer, limit=SUMMARY_LENGTH):
+    """표/이미지/출처 줄을 뺀 본문 앞부분 (본문이 표뿐이면 표 제목 줄)"""
+    texts, tables = [], []
+    for line in answer.splitlines():
+        line = line.strip()
+        if not line or _IMAGE.match(line) or _SOURCE.match(line) or set(line) <= set("|- "):
+            continue
+        if line.startswith("|"):
+            if not tables:
+                tables.append(" · ".join(c.strip() for c in line.strip("|").split("|") if c.strip()))
+            continue
+        texts.append(line.lstrip("#- ").strip())
+    text = " ".join(texts or tables)
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def pack_answer(answer):
+    """INSERT용 (faq_summary, faq_answer_z, content_hash)"""
+    return summarize(answer), compress_answer(answer), content_hash(answer)
+
+
+# ===== 렌더링 =====
+def _table_html(rows):
+    cells = [[html.escape(c.strip()) for c in row.strip().strip("|").split("|")] for row in rows]
+    body = [r for r in cells[1:] if not all(set(c) <= set("-: ") for c in r)]
+    head = "".join(f"<th>{c}</th>" for c in cells[0])
+    trs = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in r) + "</tr>" for r in body)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{trs}</tbody></table>"
+
+
+def render_html(answer):
+    """크롤러 Markdown -> HTML"""
+    out, para, items, table = [], [], [], []
+
+    def flush():
+        if para:
+            out.append("<p>" + "<br>".join(para) + "</p>")
+            para.clear()
+        if items:
+            out.append("<ul>" + "".join(f"<li>{i}</li>" for i in items) + "</ul>")
+            items.clear()
+        if table:
+            out.append(_table_html(table))
+            table.clear()
+
+    for line in answer.splitlines():
+        line = line.strip()
+        if line.startswith("|"):
+            if not table:
+                flush()
+            table.append(line)
+            continue
+        if table or not line:
+            flush()
+            if not line:
+                continue
+        image, source = _IMAGE.match(line), _SOURCE.match(line)
+        if line.startswith("#"):
+            flush()
+            level = min(len(line) - len(line.lstrip("#")), 6)
+            out.append(f"<h{level}>{html.escape(line.lstrip('#').strip())}</h{level}>")
+        elif line.startswith("- "):
+            if para:
+                flush()
+            items.append(html.escape(line[2:]))
+        elif image:
+            flush()
+            alt, src = html.escape(image.group(1)), html.escape(image.group(2))
+            out.append(f'<img src="{src}" alt="{alt}" style="max-width:100%">')
+        elif source:
+            flush()
+            url = html.escape(source.group(1))
+            out.append(f'<p>[출처] <a href="{url}" target="_blank">{url}</a></p>')
+        else:
+            if items:
+                flush()
+            para.append(html.escape(line))
+    flush()
+    return "\n".join(out)
+
+
+# 내용 해시 -> 렌더링된 HTML (프로세스 안에서 공유, 오래 안 쓴 것부터 제거)
+_html_cache = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+
+def cached_html(digest):
+    """해시에 해당하는 렌더링 결과 (없으면 None)"""
+    with _html_cache_lock:
+        rendered = _html_cache.get(digest)
+        if rendered is not None:
+            _html_cache.move_to_end(digest)
+        return rendered
+
+
+def render_cached(digest, data):
+    """압축된 본문을 풀어 렌더링하고 해시로 캐시"""
+    rendered = render_html(decompress_answer(data))
+    with _html_cache_lock:
+        _html_cache[digest] = rendered
+        while len(_html_cache) > HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return rendered
@@ -0,0 +1,142 @@
+"""
+FAQ 답변 변경 이력 (버전 + 델타 저장)
+
+크롤링할 때마다 질문별 답변을 직전 버전과 비교해, 내용 해시가 바뀌었을 때만 새 버전을 남긴다.
+새 버전에는 전체 본문 대신 직전 버전 대비 델타만 압축해 저장하므로, 저장량은 크롤링 횟수가 아니라 바뀐 양에 비례한다.
+(내용이 같으면 최신 버전의 checked_at만 갱신)
+
+델타는 본문을 문장/줄 단위 조각으로 나눈 뒤 difflib으로 비교한 연산 목록이다.
+    ["=", i, j]   직전 버전의 조각 i..j-1을 그대로 사용
+    ["+", [...]]  새 조각
+첫 버전은 빈 문서 대비 델타(= 전체 본문)이며, 특정 버전의 본문은 첫 버전부터 델타를 차례로 적용해 복원한다.
+
+"X 이후 무엇이 바뀌었나"는 created_at 인덱스(idx_faq_version_time)로 조회한다.
+"""
+import re
+import json
+import zlib
+import difflib
+import threading
+from datetime import datetime
+
+# emergency_faq.content_hash와 같은 해시를 써야 이력의 "바뀜" 판단이 어긋나지 않는다
+from crawling_py.faq_answer import content_hash
+
+VERSION_TABLE = "emergency_faq_version"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_CHUNK = re.compile(r"(?<=[\n.!?])")
+
+# (질문, 버전 번호, 내용 해시) -> 복원한 본문 (버전은 바뀌지 않으므로 그대로 캐시)
+_text_cache = {}
+_text_cache_lock = threading.Lock()
+
+
+def split_chunks(text):
+    """문장/줄 단위 조각 (이어 붙이면 원문과 같음)"""
+    return [c for c in _CHUNK.split(text) if c]
+
+
+def make_delta(old, new):
+    """old -> new 델타 (zlib 압축 JSON)"""
+    a, b = split_chunks(old), split_chunks(new)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i1, i2])
+        elif j2 > j1:
+            ops.append(["+", b[j1:j2]])
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(old, delta):
+    a = split_chunks(old)
+    out = []
+    for op in json.loads(zlib.decompress(bytes(delta)).decode("utf-8")):
+        out.extend(a[op[1]:op[2]] if op[0] == "=" else op[1])
+    return "".join(out)
+
+
+# ===== 저장/조회 =====
+def _latest(cur, question):
+    cur.execute(f"SELECT version_no, content_hash FROM {VERSION_TABLE} "
+                "WHERE faq_question = %s ORDER BY version_no DESC LIMIT 1", (question,))
+    return cur.fetchone()
+
+
+def load_version(cur, question, version_no):
+    """질문의 version_no 버전 본문 (첫 버전부터 델타를 적용해 복원)"""
+    cur.execute(f"SELECT version_no, content_hash, delta FROM {VERSION_TABLE} "
+                "WHERE faq_question = %s AND version_no <= %s ORDER BY version_no", (question, version_no))
+    text = ""
+    for no, digest, delta in cur.fetchall():
+        key = (question, no, digest)
+        with _text_cache_lock:
+            cached = _text_cache.get(key)
+        if cached is None:
+            cached = apply_delta(text, delta)
+            with _text_cache_lock:
+                _text_cache[key] = cached
+        text = cached
+    return text
+
+
+def record_versions(cur, results, now=None):
+    """
+    크롤링 결과를 버전으로 기록 (FAQ를 갱신한 트랜잭션 안에서 호출)
+
+    Args:
+        cur: emergency_faq를 갱신한 연결의 cursor
+        results: [(질문, 답변), ...]
+        now: 버전 시각 (기본 현재 시각)
+
+    Returns:
+        list[str]: 새 버전이 생긴 질문
+    """
+    now = (now or datetime.now()).strftime(TIME_FORMAT)
+    changed = []
+    for question, answer in results:
+        digest = content_hash(answer)
+        latest = _latest(cur, question)
+        if latest is not None and latest[1] == digest:
+            cur.execute(f"UPDATE {VERSION_TABLE} SET checked_at = %s "
+                        "WHERE faq_question = %s AND version_no = %s", (now, question, latest[0]))
+            continue
+        version_no = latest[0] + 1 if latest is not None else 1
+        previous = load_version(cur, question, latest[0]) if latest is not None else ""
+        cur.execute(
+            f"INSERT INTO {VERSION_TABLE} (faq_question, version_no, created_at, checked_at, content_hash, delta) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            (question, version_no, now, now, digest, make_delta(previous, answer)),
+        )
+        changed.append(question)
+    return changed
+
+
+def changes_since(cur, since):
+    """
+    since 이후에 생긴 버전 목록 (created_at 인덱스 범위 조회)
+
+    Args:
+        since: datetime/date 또는 "YYYY-MM-DD[ HH:MM:SS]" 문자열
+
+    Returns:
+        list[dict]: question, version_no, created_at, content_hash (시각 순)
+    """
+    if hasattr(since, "strftime"):
+        since = since.strftime(TIME_FORMAT)
+    cur.execute(f"SELECT faq_question, version_no, created_at, content_hash FROM {VERSION_TABLE} "
+                "WHERE created_at >= %s ORDER BY created_at, faq_question", (str(since),))
+    return [{"question": q, "version_no": n, "created_at": t, "content_hash": h}
+            for q, n, t, h in cur.fetchall()]
+
+
+def version_diff(cur, question, version_no):
+    """version_no 버전이 직전 버전에서 바뀐 내용 (문장/줄 조각 단위 unified diff 문자열)"""
+    before = load_version(cur, question, version_no - 1) if version_no > 1 else ""
+    after = load_version(cur, question, version_no)
+    before, after = ([c.strip() for c in split_chunks(t) if c.strip()] for t in (before, after))
+    return "\n".join(difflib.unified_diff(
+        before, after,
+        fromfile=f"v{version_no - 1}", tofile=f"v{version_no}", lineterm="",
+    ))
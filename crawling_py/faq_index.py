@@ -0,0 +1,165 @@
+"""
+FAQ 전문 검색 인덱스 (한국어 n-gram + BM25)
+
+질문/답변 텍스트를 토큰으로 나눠 역색인(토큰 -> [(문서, 빈도)])을 만들고 BM25로 순위를 매긴다.
+한국어는 띄어쓰기/조사 때문에 단어 단위로는 잘 맞지 않으므로, 한글 구간은 글자 2-gram으로 나눈다.
+("구급차를" -> 구급, 급차, 차를 / 검색어 "구급차" -> 구급, 급차)
+영문/숫자는 소문자 단어 단위로 쓴다.
+
+인덱스는 크롤러가 emergency_faq를 저장할 때 만들어 emergency_faq_index 테이블에 (압축된 JSON으로) 저장하고,
+페이지에서는 FAQ 내용 해시가 바뀌었을 때만 다시 읽어 메모리에 캐시한다.
+검색은 메모리의 역색인만 보므로 TEXT 컬럼을 LIKE '%...%'로 훑지 않는다.
+"""
+import re
+import json
+import math
+import zlib
+import hashlib
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+INDEX_TABLE = "emergency_faq_index"
+
+# BM25 파라미터 (일반적인 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 질문에 나온 토큰은 답변보다 가중 (질문 텍스트를 이 횟수만큼 반복한 것과 같음)
+QUESTION_BOOST = 3
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+def tokenize(text):
+    """한글 구간은 글자 2-gram(한 글자면 그대로), 영문/숫자는 단어 단위 토큰 목록"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    tokens = []
+    for run in _TOKEN.findall(text):
+        if run[0] >= "가" and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def content_hash(faqs):
+    """[(idx, 질문, 답변), ...]의 내용 해시 - 인덱스가 현재 FAQ와 맞는지 확인하는 키"""
+    h = hashlib.sha256()
+    for idx, question, answer in sorted(faqs, key=lambda x: x[0]):
+        h.update(f"{idx}\x00{question}\x00{answer}\x01".encode("utf-8"))
+    return h.hexdigest()
+
+
+class FaqIndex:
+    """
+    BM25 역색인
+
+    Attributes:
+        doc_ids: 문서(emergency_faq.idx) 목록
+        doc_len: 문서별 토큰 수
+        postings: {토큰: [(문서 번호, 빈도), ...]}
+        doc_hash: 인덱스를 만든 FAQ 내용 해시
+    """
+
+    def __init__(self, doc_ids, doc_len, postings, doc_hash):
+        self.doc_ids = doc_ids
+        self.doc_len = doc_len
+        self.postings = postings
+        self.doc_hash = doc_hash
+        self.avg_len = (sum(doc_len) / len(doc_len)) if doc_len else 0.0
+
+    @classmethod
+    def build(cls, faqs):
+        """[(idx, 질문, 답변), ...]로 인덱스 생성"""
+        doc_ids, doc_len = [], []
+        postings = defaultdict(list)
+        for n, (idx, question, answer) in enumerate(faqs):
+            tokens = tokenize(question) * QUESTION_BOOST + tokenize(answer)
+            for token, tf in Counter(tokens).items():
+                postings[token].append((n, tf))
+            doc_ids.append(idx)
+            doc_len.append(len(tokens))
+        return cls(doc_ids, doc_len, dict(postings), content_hash(faqs))
+
+    def search(self, query, limit=10):
+        """
+        검색어와 관련된 문서를 BM25 점수 순으로
+
+        Returns:
+            list[tuple[int, float]]: [(emergency_faq.idx, 점수), ...]
+        """
+        n_docs = len(self.doc_ids)
+        scores = defaultdict(float)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc] / self.avg_len)
+                scores[doc] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [(self.doc_ids[doc], score) for doc, score in ranked]
+
+    def dumps(self):
+        """저장용 바이트 (zlib 압축 JSON)"""
+        payload = {"doc_ids": self.doc_ids, "doc_len": self.doc_len, "postings": self.postings}
+        return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def loads(cls, data, doc_hash):
+        payload = json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+        postings = {token: [tuple(p) for p in posting] for token, posting in payload["postings"].items()}
+        return cls(payload["doc_ids"], payload["doc_len"], postings, doc_hash)
+
+
+# ===== 저장/조회 =====
+def save_index(cursor, faqs):
+    """
+    FAQ 전체로 인덱스를 다시 만들어 저장 (크롤러가 FAQ 저장과 같은 트랜잭션에서 호출)
+
+    프로세스 캐시는 건드리지 않는다. commit이 성공한 뒤 remember_index()로 넣어야
+    저장에 실패한 인덱스가 메모리에 남지 않는다.
+
+    Args:
+        cursor: emergency_faq를 갱신한 연결의 cursor
+        faqs: [(idx, 질문, 답변), ...] - 저장 후의 전체 FAQ
+    """
+    index = FaqIndex.build(faqs)
+    cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+    cursor.execute(f"INSERT INTO {INDEX_TABLE} (doc_hash, payload) VALUES (%s, %s)",
+                   (index.doc_hash, index.dumps()))
+    return index
+
+
+# 프로세스 안의 마지막으로 읽은 인덱스 (해시가 같으면 다시 읽지 않음)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def remember_index(index):
+    """commit까지 끝난 인덱스를 프로세스 캐시에 넣음 (다음 load_index가 본문을 다시 읽지 않도록)"""
+    with _cache_lock:
+        _cache["index"] = index
+
+
+def load_index(cursor):
+    """
+    저장된 인덱스를 반환 (해시만 먼저 읽고, 메모리의 인덱스와 다를 때만 본문을 읽어 역직렬화)
+    인덱스가 없으면 None
+    """
+    cursor.execute(f"SELECT doc_hash FROM {INDEX_TABLE}")
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    doc_hash = row[0]
+    with _cache_lock:
+        cached = _cache.get("index")
+    if cached is not None and cached.doc_hash == doc_hash:
+        return cached
+
+    cursor.execute(f"SELECT payload FROM {INDEX_TABLE} WHERE doc_hash = %s", (doc_hash,))
+    index = FaqIndex.loads(cursor.fetchone()[0], doc_hash)
+    with _cache_lock:
+        _cache["index"] = index
+    return index
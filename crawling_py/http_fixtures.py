@@ -0,0 +1,100 @@
+"""
+FAQ 크롤러용 HTTP 녹화/재생
+
+faq.get_soup는 이 모듈의 http_get으로 페이지를 받는다. 모드는 환경변수 EMERGENCY_FAQ_HTTP로 고른다.
+
+    live   (기본) requests로 바로 요청
+    record 요청한 응답을 상태 코드/헤더/인코딩과 함께 gzip 파일로 저장
+    replay 저장된 파일로만 응답 (네트워크를 쓰지 않음, 없으면 FileNotFoundError)
+
+파일은 EMERGENCY_FAQ_FIXTURE_DIR(기본 crawling_py/fixtures)에 URL 해시 이름(<sha1 앞 16자>.http.gz)으로 저장하며,
+내용은 gzip(JSON 메타 한 줄 + 원본 본문 바이트)이다. 녹화할 때 판별한 인코딩(apparent_encoding)도 메타에 넣어
+재생할 때 다시 판별하지 않으므로 파서 벤치마크(bench_py/faq_parse_bench.py)는 순수 파싱 시간만 잰다.
+
+사용 예:
+    EMERGENCY_FAQ_HTTP=record python -c "from crawling_py.page_modules.faq import *; [extract_answer(i['q'], i['url']) for i in QUESTION_SOURCES]"
+    EMERGENCY_FAQ_HTTP=replay python bench_py/faq_parse_bench.py
+"""
+import os
+import gzip
+import json
+import hashlib
+
+MODES = ("live", "record", "replay")
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# 재생 시 의미 없는 전송 관련 헤더는 저장하지 않음
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def http_mode():
+    mode = os.environ.get("EMERGENCY_FAQ_HTTP", "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"EMERGENCY_FAQ_HTTP는 {' / '.join(MODES)} 중 하나여야 합니다: {mode}")
+    return mode
+
+
+def fixture_dir():
+    return os.environ.get("EMERGENCY_FAQ_FIXTURE_DIR", DEFAULT_FIXTURE_DIR)
+
+
+def fixture_path(url, directory=None):
+    return os.path.join(directory or fixture_dir(), hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".http.gz")
+
+
+class FixtureResponse:
+    """requests.Response에서 get_soup가 쓰는 부분(status_code, headers, content, encoding, text)만 가진 응답"""
+
+    def __init__(self, url, status_code, headers, content, encoding=None, apparent_encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.apparent_encoding = apparent_encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def save_fixture(response, path):
+    """응답을 gzip 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    meta = {
+        "url": response.url,
+        "status_code": response.status_code,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS},
+        "encoding": response.encoding,
+        "apparent_encoding": response.apparent_encoding,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wb") as f:
+        f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+        f.write(response.content)
+    os.replace(tmp, path)
+
+
+def load_fixture(path):
+    with gzip.open(path, "rb") as f:
+        data = f.read()
+    header, _, content = data.partition(b"\n")
+    meta = json.loads(header.decode("utf-8"))
+    return FixtureResponse(meta["url"], meta["status_code"], meta["headers"], content,
+                           meta.get("encoding"), meta.get("apparent_encoding"))
+
+
+def http_get(url, headers=None, timeout=20):
+    """모드에 따라 실제 요청/녹화/재생 (live, record는 requests.Response, replay는 FixtureResponse)"""
+    mode = http_mode()
+    if mode == "replay":
+        path = fixture_path(url)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"녹화된 응답이 없습니다: {url} ({path}) - EMERGENCY_FAQ_HTTP=record로 먼저 녹화하세요")
+        return load_fixture(path)
+
+    import requests
+
+    r = requests.get(url, headers=headers, timeout=timeout)
+    if mode == "record":
+        save_fixture(r, fixture_path(url))
+    return r
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -7,7 +8,29 @@ import sys
 import os
 # utils.py 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'streamlit_py'))
-from utils import create_sample_data, calculate_required_ambulances, load_emergency_ex_data
+from utils import create_sample_data, required_ambulances, load_emergency_ex_data, load_concurrently
+import scenario
+import dispatch_sim
+import reallocation
+import forecast
+
+def _shortage_table(year_df, cycle_time_hours, target_utilization):
+    """한 연도의 지역별 필요 구급차 수/과부족/상태 표 (지역 전체를 한 번에 계산)"""
+    # 실제 호출수 사용 (emergency_move 테이블의 move_count)
+    actual_calls = year_df['이송환자수'].astype(int).to_numpy()
+    current_ambulances = year_df['구급차수'].astype(int).to_numpy()
+    required = required_ambulances(actual_calls, cycle_time_hours, target_utilization)
+    shortage = required - current_ambulances
+    short = shortage > 0
+    return pd.DataFrame({
+        '지역': year_df['지역'].to_numpy(),
+        '현재 구급차수': current_ambulances,
+        '실제 호출수': [f"{c:,}" for c in actual_calls],
+        '필요 구급차수': required,
+        '과부족': shortage,
+        '상태': np.where(short, "부족", "적절"),
+        '배경색': np.where(short, "#ffebee", "#ffffff"),  # 연한 빨간색 / 흰색 배경
+    })
 
 def show_analysis_page():
     st.markdown('<div class="section-header"><h2>📊 데이터 분석 및 구급차 수요 분석</h2></div>', unsafe_allow_html=True)
@@ -19,8 +42,8 @@ def show_analysis_page():
         # 데이터 분석 섹션
         st.markdown("### 📈 전국 응급의료 현황 데이터")
         
-        # 데이터 로드
-        df = create_sample_data()
+        # 데이터 로드 (통합 데이터와 아래 환자 정보 분석에 쓰는 emergency_ex를 동시에 조회)
+        df, ex_data = load_concurrently(create_sample_data, load_emergency_ex_data)
         
         # 데이터가 비어있거나 연도 컬럼이 없는 경우 처리
         if df.empty or '연도' not in df.columns:
@@ -103,8 +126,7 @@ def show_analysis_page():
         # 환자 정보 분석 (연도별 탭 바깥에 위치)
         st.markdown("#### 📊 환자 정보 분석")
         
-        # emergency_ex 데이터 로드
-        ex_data = load_emergency_ex_data()
+        # emergency_ex 데이터는 탭 시작 시 통합 데이터와 함께 로드됨
         
         if not ex_data.empty:
             # 환자 정보 분석을 위한 연도 선택 (별도의 selectbox)
@@ -258,42 +280,8 @@ def show_analysis_page():
                     CYCLE_TIME_HOURS = 1.5  # 90분
                     TARGET_UTILIZATION = 0.5  # 50%
                     
-                    # 각 지역별 분석 계산
-                    analysis_results = []
-                    for _, row in analysis_data.iterrows():
-                        # 실제 호출수 사용 (emergency_move 테이블의 move_count)
-                        actual_calls = int(row['이송환자수'])  # 이미 move_count 값
-                        
-                        # 필요 구급차 수 계산
-                        required_ambulances = calculate_required_ambulances(
-                            actual_calls, CYCLE_TIME_HOURS, TARGET_UTILIZATION
-                        )
-                        
-                        # 현재 구급차 수 (실제 데이터 사용)
-                        current_ambulances = int(row['구급차수'])
-                        
-                        shortage = required_ambulances - current_ambulances
-                        
-                        # 상태 판정
-                        if shortage > 0:
-                            status = "부족"
-                            status_color = "#ffebee"  # 연한 빨간색 배경
-                        else:
-                            status = "적절"
-                            status_color = "#ffffff"  # 흰색 배경
-                        
-                        analysis_results.append({
-                            '지역': row['지역'],
-                            '현재 구급차수': current_ambulances,
-                            '실제 호출수': f"{actual_calls:,}",
-                            '필요 구급차수': required_ambulances,
-                            '과부족': shortage,
-                            '상태': status,
-                            '배경색': status_color
-                        })
-                    
-                    # 결과를 DataFrame으로 변환
-                    analysis_df = pd.DataFrame(analysis_results)
+                    # 각 지역별 분석 계산 (전 지역을 한 번에 벡터 연산)
+                    analysis_df = _shortage_table(analysis_data, CYCLE_TIME_HOURS, TARGET_UTILIZATION)
                     
                     # 현재 연도 통계 계산
                     total_regions = len(analysis_df)
@@ -309,25 +297,7 @@ def show_analysis_page():
                         prev_year_data = df[df['연도'] == previous_year].copy()
                         
                         # 전년도 분석 결과 계산
-                        prev_analysis_results = []
-                        for _, row in prev_year_data.iterrows():
-                            actual_calls = int(row['이송환자수'])  # 실제 호출수
-                            required_ambulances = calculate_required_ambulances(
-                                actual_calls, CYCLE_TIME_HOURS, TARGET_UTILIZATION
-                            )
-                            
-                            current_ambulances = int(row['구급차수'])  # 실제 구급차수
-                            
-                            shortage = required_ambulances - current_ambulances
-                            status = "부족" if shortage > 0 else "적절"
-                            
-                            prev_analysis_results.append({
-                                '지역': row['지역'],
-                                '상태': status,
-                                '과부족': shortage
-                            })
-                        
-                        prev_analysis_df = pd.DataFrame(prev_analysis_results)
+                        prev_analysis_df = _shortage_table(prev_year_data, CYCLE_TIME_HOURS, TARGET_UTILIZATION)
                         
                         # 전년도 통계
                         prev_total_regions = len(prev_analysis_df)
@@ -418,3 +388,242 @@ def show_analysis_page():
                     )
                 else:
                     st.warning(f"📊 {analysis_year}년 분석 데이터가 없습니다.")
+        
+        # 사이클 타임/가동률을 바꿔 보는 what-if 분석
+        _show_what_if(df)
+
+def _show_what_if(df):
+    """슬라이더로 도시/농촌 사이클 타임과 목표 가동률을 바꿔 전 지역 × 전 연도를 다시 계산"""
+    st.markdown("#### 🎛️ What-if 시나리오 분석")
+    st.markdown("도시(특별·광역시)와 농촌(도) 지역에 서로 다른 평균 사이클 타임을 적용하여 모든 연도를 다시 계산합니다.")
+    
+    # 보유 대수가 아니라 구급대원 수로 실제 운영 가능한 대수 기준 (csv_py.emergency_car.add_staffed_capacity)
+    staffed = st.checkbox(
+        "인력 기준 가용 구급차 수로 계산",
+        value='가용구급차수' in df.columns,
+        disabled='가용구급차수' not in df.columns,
+        key="whatif_staffed",
+        help="구급대원 3인 1조, 3교대 기준으로 편성 가능한 조 수만큼만 구급차를 운영한다고 보고 계산합니다."
+    )
+    panel = scenario.Panel.from_frame(df, '가용구급차수' if staffed else '구급차수')
+    
+    # 가동률 공식은 대기를 고려하지 않으므로, 대기 확률 목표로 계산하는 Erlang C(M/M/c) 방식도 선택 가능
+    method_label = st.radio(
+        "계산 방식",
+        ["가동률 공식", "Erlang C (대기 확률 목표)"],
+        horizontal=True,
+        key="whatif_method"
+    )
+    method = "erlang_c" if method_label.startswith("Erlang") else "utilization"
+    wait_hours = 0.0
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        urban_cycle = st.slider("도시 사이클 타임 (시간)", 0.5, 1.0, scenario.DEFAULT_URBAN_CYCLE_HOURS, 0.05, key="whatif_urban_cycle")
+    with col2:
+        rural_cycle = st.slider("농촌 사이클 타임 (시간)", 2.0, 2.5, scenario.DEFAULT_RURAL_CYCLE_HOURS, 0.05, key="whatif_rural_cycle")
+    with col3:
+        if method == "utilization":
+            target = st.slider("목표 가동률", 0.3, 0.5, scenario.DEFAULT_TARGET_UTILIZATION, 0.05, key="whatif_utilization")
+            target_grid = np.round(np.arange(0.3, 0.51, 0.05), 2)
+            target_label = "목표 가동률"
+        else:
+            target = st.slider("허용 대기 확률", 0.05, 0.5, scenario.DEFAULT_MAX_WAIT_PROB, 0.05, key="whatif_wait_prob",
+                               help="호출이 바로 출동하지 못하고 기다리게 될 확률의 상한")
+            wait_minutes = st.slider("대기 허용 시간 (분)", 0, 30, 0, 5, key="whatif_wait_minutes",
+                                     help="0이면 대기 자체의 확률, 0보다 크면 이 시간을 넘겨 기다릴 확률을 목표로 계산")
+            wait_hours = wait_minutes / 60
+            target_grid = np.round(np.arange(0.05, 0.51, 0.05), 2)
+            target_label = "허용 대기 확률"
+    
+    # 선택한 시나리오 하나 (지역 × 연도 × 1)
+    scenarios = scenario.scenario_grid(urban_cycle, rural_cycle, target, method)
+    required, shortage = scenario.evaluate(panel, scenarios, method=method, wait_hours=wait_hours)
+    summary = scenario.summarize(panel, scenarios, shortage)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        # 연도별 총 부족 대수 (막대 위 숫자는 부족 지역 수)
+        trend_fig = px.bar(
+            summary,
+            x='연도',
+            y='총_부족대수',
+            text='부족_지역수',
+            title='연도별 총 부족 대수 (막대 위: 부족 지역 수)'
+        )
+        trend_fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            height=400,
+            xaxis_type='category'
+        )
+        st.plotly_chart(trend_fig, use_container_width=True)
+    
+    with col2:
+        # 최근 연도의 목표값 × 농촌 사이클 타임 전체 격자 (도시 사이클 타임은 슬라이더 값 고정)
+        latest_year = panel.years.max()
+        grid = scenario.scenario_grid(
+            urban_cycle,
+            np.round(np.arange(2.0, 2.51, 0.1), 2),
+            target_grid,
+            method
+        )
+        _, grid_shortage = scenario.evaluate(panel, grid, method=method, wait_hours=wait_hours)
+        grid_summary = scenario.summarize(panel, grid, grid_shortage)
+        grid_summary = grid_summary[grid_summary['연도'] == latest_year]
+        heatmap = grid_summary.pivot(index=scenario.TARGET_COLUMNS[method], columns='농촌_사이클', values='총_부족대수')
+        
+        heat_fig = px.imshow(
+            heatmap,
+            text_auto=True,
+            aspect='auto',
+            color_continuous_scale='Reds',
+            labels={'x': '농촌 사이클 타임 (시간)', 'y': target_label, 'color': '총 부족 대수'},
+            title=f'{latest_year}년 시나리오별 총 부족 대수'
+        )
+        heat_fig.update_layout(height=400)
+        st.plotly_chart(heat_fig, use_container_width=True)
+    
+    # 최근 연도 지역별 결과
+    latest = int(np.argmax(panel.years))
+    region_df = pd.DataFrame({
+        '지역': panel.regions,
+        '구분': np.where(panel.is_urban(), '도시', '농촌'),
+        '현재 구급차수 (대)': np.nan_to_num(panel.fleet[:, latest]).astype(int),
+        '필요 구급차수 (대)': required[:, latest, 0],
+        '과부족 (대)': shortage[:, latest, 0],
+    }).sort_values('과부족 (대)', ascending=False).reset_index(drop=True)
+    st.markdown(f"##### 📋 {panel.years[latest]}년 지역별 시나리오 결과")
+    st.dataframe(region_df, use_container_width=True, hide_index=True)
+    
+    _show_forecast(panel, scenarios, method, wait_hours)
+    _show_reallocation(panel, shortage[:, :, 0], (method, urban_cycle, rural_cycle, target, wait_hours))
+    _show_dispatch_simulation(panel, urban_cycle, rural_cycle)
+
+def _show_forecast(panel, scenarios, method, wait_hours):
+    """지역별 이송 건수 추세로 향후 연도를 예측하고, 위 시나리오 기준 필요 구급차 수를 계산"""
+    st.markdown("#### 📈 향후 수요 예측")
+    st.markdown("지역별 연도 추세로 앞으로의 이송 건수를 예측하고, 현재 구급차 수 대비 과부족을 계산합니다.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        horizon = st.slider("예측 기간 (년)", 1, 5, 3, 1, key="forecast_horizon")
+    with col2:
+        model_label = st.radio("추세 모델", ["선형", "로그 선형 (비율 증가)"], horizontal=True, key="forecast_model")
+    model = "log" if model_label.startswith("로그") else "linear"
+    
+    future = forecast.forecast_panel(panel, horizon, model)
+    required, shortage = scenario.evaluate(future, scenarios, method=method, wait_hours=wait_hours)
+    
+    # 전국 합계: 실제(과거) + 예측(미래)
+    trend_df = pd.concat([
+        pd.DataFrame({'연도': panel.years, '이송환자수': np.nansum(panel.calls, axis=0), '구분': '실제'}),
+        pd.DataFrame({'연도': future.years, '이송환자수': future.calls.sum(axis=0), '구분': '예측'}),
+    ], ignore_index=True)
+    fig = px.line(trend_df, x='연도', y='이송환자수', color='구분', markers=True, title='전국 이송 건수 추이와 예측')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=350,
+        xaxis_type='category'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    last = -1
+    forecast_df = pd.DataFrame({
+        '지역': future.regions,
+        f'{future.years[last]}년 예측 이송 건수': future.calls[:, last].astype(int),
+        '현재 구급차수 (대)': np.nan_to_num(future.fleet[:, last]).astype(int),
+        '필요 구급차수 (대)': required[:, last, 0],
+        '과부족 (대)': shortage[:, last, 0],
+    }).sort_values('과부족 (대)', ascending=False).reset_index(drop=True)
+    st.markdown(f"##### 📋 {future.years[last]}년 예측 기준 지역별 과부족")
+    st.dataframe(forecast_df, use_container_width=True, hide_index=True)
+
+def _show_reallocation(panel, shortage, params):
+    """전국 구급차 총수를 유지하면서 여유 지역 -> 부족 지역 재배치 계획 (이동 거리 최소화)"""
+    st.markdown("#### 🚚 구급차 재배치 최적화")
+    st.markdown("전국 구급차 수는 그대로 두고, 여유 지역의 구급차를 가까운 부족 지역부터 옮기는 계획입니다. "
+                "(시도 대표 좌표 사이 거리 기준)")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        year = st.selectbox("재배치 연도", sorted(panel.years, reverse=True), key="realloc_year")
+    with col2:
+        max_km = st.slider("최대 이동 거리 (km)", 50, 500, 500, 50, key="realloc_max_km")
+    
+    y = int(np.flatnonzero(panel.years == year)[0])
+    has_data = ~np.isnan(panel.calls[:, y])
+    # 좌표가 없는 지역(시도 대표 좌표/EMERGENCY_REGION_COORDS에 없음)은 재배치에서 제외
+    located = has_data & reallocation.has_coordinates(panel.regions)
+    skipped = panel.regions[has_data & ~located]
+    if len(skipped):
+        names = ", ".join(map(str, skipped[:10])) + (f" 외 {len(skipped) - 10}곳" if len(skipped) > 10 else "")
+        st.info(f"좌표가 없어 재배치에서 제외한 지역 {len(skipped)}곳: {names} "
+                "(EMERGENCY_REGION_COORDS 좌표 파일로 추가할 수 있습니다)")
+    if not located.any():
+        return
+    
+    regions = panel.regions[located]
+    before = shortage[located, y]
+    try:
+        moves, after = reallocation.reallocate(year, regions, before, params, max_cost=max_km)
+    except Exception as e:
+        # 재배치 계산이 실패해도 아래 시뮬레이션 등 나머지 분석은 그대로 표시
+        st.warning(f"재배치 계획을 계산하지 못했습니다: {e}")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("이동 대수", f"{int(moves['대수'].sum()):,}대")
+    with col2:
+        st.metric("총 부족 대수", f"{int(after[after > 0].sum()):,}대",
+                  delta=f"{int(after[after > 0].sum() - before[before > 0].sum()):,}대", delta_color="inverse")
+    with col3:
+        st.metric("총 이동 거리", f"{float((moves['대수'] * moves['거리(km)']).sum()):,.0f}km")
+    
+    if moves.empty:
+        st.info("옮길 수 있는 여유 구급차가 없거나 부족 지역이 없습니다.")
+    else:
+        st.dataframe(moves, use_container_width=True, hide_index=True)
+
+def _show_dispatch_simulation(panel, urban_cycle, rural_cycle):
+    """선택한 연도의 호출 수/구급차 수로 1년 출동을 반복 시뮬레이션하여 대기 시간 분포를 표시"""
+    st.markdown("#### 🎲 Monte Carlo 출동 시뮬레이션")
+    st.markdown("위 시나리오의 사이클 타임으로 1년 동안의 출동을 여러 번 반복 시뮬레이션하여 "
+                "지역별 대기 시간·대기 확률·가동률의 분포(5/50/95 백분위수)를 구합니다.")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sim_year = st.selectbox("시뮬레이션 연도", sorted(panel.years, reverse=True), key="sim_year")
+    with col2:
+        replications = st.slider("반복 횟수", 100, 2000, 1000, 100, key="sim_replications")
+    with col3:
+        seed = st.number_input("난수 seed", min_value=0, value=0, step=1, key="sim_seed")
+    
+    if st.button("▶️ 시뮬레이션 실행", key="sim_run"):
+        y = int(np.flatnonzero(panel.years == sim_year)[0])
+        has_data = ~np.isnan(panel.calls[:, y])
+        cycle = np.where(panel.is_urban(), urban_cycle, rural_cycle)[has_data]
+        
+        # 묶음이 끝날 때마다 진행률과 중간 백분위수 표를 갱신
+        progress = st.progress(0.0, text="시뮬레이션 중...")
+        table = st.empty()
+        for done, result in dispatch_sim.run_simulation(
+            panel.regions[has_data],
+            panel.calls[has_data, y],
+            np.nan_to_num(panel.fleet[has_data, y]).astype(int),
+            cycle,
+            replications=replications,
+            seed=int(seed)
+        ):
+            progress.progress(done / replications, text=f"시뮬레이션 중... ({done:,}/{replications:,}회)")
+            table.dataframe(result.round(3), use_container_width=True, hide_index=True)
+        progress.empty()
+        table.empty()
+        st.session_state['sim_result'] = (sim_year, replications, result)
+    
+    if 'sim_result' in st.session_state:
+        sim_year, replications, result = st.session_state['sim_result']
+        st.markdown(f"##### 📋 {sim_year}년 시뮬레이션 결과 ({replications:,}회 반복)")
+        st.dataframe(result.round(3), use_container_width=True, hide_index=True)
@@ -1,21 +1,29 @@
 # faq.py
+from __future__ import annotations
 import streamlit as st
-import pymysql
-import requests
-from bs4 import BeautifulSoup, NavigableString, Tag
 import html, re, time
+from urllib.parse import urlparse
+import datetime as dt
 import sys
 import os
 
 # 홈디렉토리의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from db_config import DB_CONFIG
+from db_config import get_connection, advisory_lock
+from single_flight import SingleFlight
+from crawling_py.faq_index import FaqIndex, save_index, load_index, remember_index
+from crawling_py.faq_answer import pack_answer, decompress_answer, cached_html, render_cached
+from crawling_py.faq_history import record_versions, changes_since, version_diff
+from crawling_py.http_fixtures import http_get
+import metrics
 
 # ===== UPSERT만 사용 (CREATE TABLE 제거) =====
+# faq_question이 UNIQUE이므로 다시 크롤링하면 같은 질문의 행을 갱신 (이전 답변은 emergency_faq_version에 남음)
 UPSERT_SQL = """
-INSERT INTO emergency_faq (faq_question, faq_answer)
-VALUES (%s, %s)
-ON DUPLICATE KEY UPDATE faq_answer = VALUES(faq_answer);
+INSERT INTO emergency_faq (faq_question, faq_summary, faq_answer_z, content_hash)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE faq_summary = VALUES(faq_summary), faq_answer_z = VALUES(faq_answer_z),
+                        content_hash = VALUES(content_hash);
 """
 
 # ===== 질문 & 링크 =====
@@ -35,6 +43,9 @@ ORDER_MAP = {item["q"]: i for i, item in enumerate(QUESTION_SOURCES)}
 
 UA = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
 
+# requests / BeautifulSoup은 크롤링할 때만 필요하므로 함수 안에서 import 한다
+# (FAQ 페이지를 조회만 할 때는 크롤러 의존성을 불러오지 않음)
+
 # ===== 공통 유틸 =====
 def clean(text: str) -> str:
     text = html.unescape(text or "")
@@ -56,7 +67,10 @@ def safe_rerun():
         st.experimental_rerun()
 
 def get_soup(url: str) -> BeautifulSoup:
-    r = requests.get(url, headers=UA, timeout=20)
+    from bs4 import BeautifulSoup
+
+    # EMERGENCY_FAQ_HTTP=record/replay면 응답을 파일로 녹화/재생 (crawling_py.http_fixtures)
+    r = http_get(url, headers=UA, timeout=20)
     r.encoding = r.apparent_encoding or "utf-8"
     return BeautifulSoup(r.text, "html.parser")
 
@@ -86,6 +100,8 @@ def _table_to_markdown(tbl: Tag) -> str:
 
 def node_to_markdown(node: Tag) -> str:
     """선택 노드를 Markdown으로 변환"""
+    from bs4 import NavigableString, Tag
+
     if isinstance(node, NavigableString):
         return clean(str(node))
     if not isinstance(node, Tag):
@@ -144,6 +160,8 @@ def parse_q1_easylaw_segment(url: str) -> str:
 
 # 5) 정책브리핑(질문 5): 시작 p ~ 끝 p 사이 "문단만" 수집 (이미지/캡션 테이블 제거)
 def parse_q5_koreakr_segment(url: str) -> str:
+    from bs4 import Tag
+
     soup = get_soup(url)
     root = soup.select_one("div.view_con, div.article_area, #contents, #content, article") or soup
     start_text = "긴급자동차는 말 그대로 신속하게 현장에 도착하는 것이 목표다"
@@ -258,15 +276,7 @@ def extract_answer(q_text: str, url: str) -> str:
 
 # ===== DB I/O =====
 def _conn():
-    return pymysql.connect(
-        host=DB_CONFIG['host'],
-        port=DB_CONFIG['port'],
-        user=DB_CONFIG['user'],
-        password=DB_CONFIG['password'],
-        db=DB_CONFIG['db'],
-        charset='utf8mb4',
-        autocommit=False
-    )
+    return get_connection(charset='utf8mb4', autocommit=False)
 
 def load_faq_from_db():
     try:
@@ -275,18 +285,91 @@ def load_faq_from_db():
             qs = list(ORDER_MAP.keys())
             ph = ",".join(["%s"] * len(qs))
             cur.execute(
-                f"SELECT faq_question, faq_answer FROM emergency_faq WHERE faq_question IN ({ph})",
+                f"SELECT idx, faq_question, faq_summary, content_hash FROM emergency_faq WHERE faq_question IN ({ph})",
                 qs,
             )
             rows = cur.fetchall()
         conn.close()
-        data = [{"question": q, "answer": a} for (q, a) in rows]
+        data = [{"idx": i, "question": q, "summary": s, "hash": h} for (i, q, s, h) in rows]
         return sorted(data, key=lambda x: ORDER_MAP.get(x["question"], 999))
     except Exception:
         return []
 
+def rebuild_search_index(cur):
+    """emergency_faq 전체로 검색 인덱스를 다시 만들어 저장 (FAQ를 갱신한 트랜잭션 안에서 호출)"""
+    cur.execute("SELECT idx, faq_question, faq_answer_z FROM emergency_faq")
+    return save_index(cur, [(i, q, decompress_answer(z)) for i, q, z in cur.fetchall()])
+
+def load_answer_html(idx, digest):
+    """답변 하나의 렌더링된 HTML (같은 내용 해시를 이미 렌더링했으면 DB를 읽지 않음)"""
+    rendered = cached_html(digest)
+    if rendered is not None:
+        return rendered
+    conn = _conn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT faq_answer_z FROM emergency_faq WHERE idx = %s", (idx,))
+            row = cur.fetchone()
+    finally:
+        conn.close()
+    return render_cached(digest, row[0]) if row else ""
+
+def search_faq(faqs, query, limit=10):
+    """
+    저장된 BM25 인덱스로 FAQ 검색 (인덱스는 내용 해시가 바뀔 때만 다시 읽음)
+
+    Returns:
+        list[dict]: 점수 순으로 정렬한 faqs의 항목
+    """
+    try:
+        conn = _conn()
+        with conn.cursor() as cur:
+            index = load_index(cur)
+        conn.close()
+    except Exception:
+        index = None
+    if index is None:
+        # 인덱스 테이블이 없는 이전 DB - 화면에 있는 FAQ(질문/요약)로 메모리에서만 만든다
+        index = FaqIndex.build([(f["idx"], f["question"], f["summary"]) for f in faqs])
+    by_idx = {f["idx"]: f for f in faqs}
+    return [by_idx[i] for i, _ in index.search(query, limit) if i in by_idx]
+
 # ===== 크롤링 & 저장 =====
+# 같은 프로세스의 동시 클릭은 single-flight로, 다른 프로세스/서버와는 DB 잠금으로 크롤링을 하나로 제한
+CRAWL_LOCK_NAME = "emergency_faq_crawl"
+CRAWL_WAIT_SECONDS = 120
+_crawl_flight = SingleFlight()
+
 def crawl_and_update():
+    if _crawl_flight.in_flight(CRAWL_LOCK_NAME):
+        st.info("📌 다른 사용자가 실행한 크롤링이 끝나기를 기다리는 중입니다...")
+    ok, shared = _crawl_flight.do(CRAWL_LOCK_NAME, _crawl_with_lock)
+    if shared:
+        st.success("✅ 다른 사용자가 실행한 크롤링 결과를 불러왔습니다" if ok else "⛔ 크롤링 실패")
+    return ok
+
+def _crawl_with_lock():
+    with advisory_lock(CRAWL_LOCK_NAME) as acquired:
+        if acquired:
+            return _timed_crawl()
+
+    # 다른 서버에서 크롤링 중 - 끝날 때까지 기다린 뒤 그 결과를 사용
+    st.info("📌 다른 서버에서 크롤링 중입니다. 완료될 때까지 기다립니다...")
+    with advisory_lock(CRAWL_LOCK_NAME, timeout=CRAWL_WAIT_SECONDS) as acquired:
+        return acquired and bool(load_faq_from_db())
+
+def _timed_crawl():
+    """크롤링 소요 시간과 성공/실패를 metrics로 기록 (다른 서버의 크롤링을 기다린 경우는 제외)"""
+    start = time.perf_counter()
+    ok = False
+    try:
+        ok = _crawl_and_save()
+        return ok
+    finally:
+        metrics.FAQ_CRAWL_SECONDS.observe(time.perf_counter() - start)
+        metrics.FAQ_CRAWLS.inc(result="ok" if ok else "fail")
+
+def _crawl_and_save():
     st.info("📌 크롤링 중입니다. 잠시만 기다려주세요...")
     results = []
     for item in QUESTION_SOURCES:
@@ -297,6 +380,7 @@ def crawl_and_update():
             st.success(f"✅ {q} (완료)")
             time.sleep(0.2)
         except Exception as e:
+            metrics.FAQ_SOURCE_FAILURES.inc(host=urlparse(url).hostname or "unknown")
             st.error(f"❌ {q} 실패: {e}")
 
     if not results:
@@ -306,13 +390,15 @@ def crawl_and_update():
     conn = _conn()
     try:
         with conn.cursor() as cur:
+            # 질문은 500자로 제한 (UNIQUE 키 길이, 답변은 압축해 LONGBLOB에 저장하므로 자르지 않음)
+            results = [(truncate_text(q, 500), a) for q, a in results]
             for q, a in results:
-                # 텍스트 길이 제한 (TEXT 타입이라도 너무 긴 텍스트는 자르기)
-                q_truncated = truncate_text(q, 1000)  # 질문은 1000자로 제한
-                a_truncated = truncate_text(a, 60000)  # 답변은 60000자로 제한
-                cur.execute(UPSERT_SQL, (q_truncated, a_truncated))
+                cur.execute(UPSERT_SQL, (q, *pack_answer(a)))
+            changed = record_versions(cur, results)
+            index = rebuild_search_index(cur)
         conn.commit()
-        st.success(f"✅ 총 {len(results)}건 DB 저장/갱신 완료")
+        remember_index(index)
+        st.success(f"✅ 총 {len(results)}건 DB 저장/갱신 완료 (내용이 바뀐 질문 {len(changed)}건)")
         return True
     except Exception as e:
         conn.rollback()
@@ -322,6 +408,36 @@ def crawl_and_update():
         conn.close()
 
 # ===== Streamlit UI =====
+@st.fragment
+def show_answer(faq):
+    """요약을 먼저 보여주고, 펼쳤을 때만 본문을 읽어 렌더링 (토글은 이 fragment만 다시 실행)"""
+    st.markdown(faq["summary"])
+    if st.toggle("전체 답변 보기", key=f"faq_full_{faq['idx']}"):
+        st.markdown(load_answer_html(faq["idx"], faq["hash"]), unsafe_allow_html=True)
+
+@st.fragment
+def show_faq_history():
+    """선택한 날짜 이후에 내용이 바뀐 답변과 바뀐 부분 (날짜를 바꾸면 이 fragment만 다시 실행)"""
+    st.markdown("### 🕘 답변 변경 이력")
+    since = st.date_input("이 날짜 이후 변경", value=dt.date.today() - dt.timedelta(days=30), key="faq_since")
+    try:
+        conn = _conn()
+        try:
+            with conn.cursor() as cur:
+                changes = changes_since(cur, since)
+                diffs = [version_diff(cur, c["question"], c["version_no"]) for c in changes]
+        finally:
+            conn.close()
+    except Exception:
+        changes, diffs = [], []
+    if not changes:
+        st.caption("이 기간에 바뀐 답변이 없습니다.")
+        return
+    for change, diff in zip(changes, diffs):
+        label = f"{change['created_at']} · {change['question']} (v{change['version_no']})"
+        with st.expander(label):
+            st.code(diff or "(변경 없음)", language="diff")
+
 def show_faq_page():
     st.markdown('<div class="section-header"><h2>❓ 자주 묻는 질문 (FAQ)</h2></div>', unsafe_allow_html=True)
 
@@ -333,9 +449,17 @@ def show_faq_page():
                 safe_rerun()
         return
 
+    query = st.text_input("🔍 FAQ 검색", key="faq_query", placeholder="예: 구급차 요금, 신고 요령")
+    if query.strip():
+        faqs = search_faq(faqs, query)
+        if not faqs:
+            st.info("검색 결과가 없습니다.")
+
     for faq in faqs:
         with st.expander(faq["question"]):
-            st.markdown(faq["answer"])
+            show_answer(faq)
+
+    show_faq_history()
 
     st.markdown("---")
     st.markdown("### 📞 응급상황 연락처")
@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 def show_overview_page():
     st.markdown('<div class="section-header"><h2>🏥 응급의료시스템 개요 및 현황</h2></div>', unsafe_allow_html=True)
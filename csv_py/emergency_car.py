@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import pymysql
 import sys
 import os
@@ -6,9 +7,15 @@ import os
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from csv_py import validation, telemetry
+from sql_py.quarantine import clear_quarantine, insert_quarantine
 
 loc = os.path.dirname(os.path.dirname(__file__))+"/"
 
+# 적재는 staging 테이블에 하고, run.py가 적재 후 live 테이블과 교체한다
+TABLE_NAME = "emergency_car_staging"
+SOURCE_TABLE = "emergency_car"
+
 
 files = [
     "DATA/2019_car.csv",
@@ -17,27 +24,102 @@ files = [
     "DATA/2022_car.csv",
     "DATA/2023_car.csv"]
 
+# 원본 헤더(계가 두 번 나옴)를 열 위치 순서대로 테이블 컬럼명으로 바꾼다
+# No, 분류, 계, 특수, 일반, 인구 십만 명당 119 구급차 수, 계, 1급 응급구조사, 2급 응급구조사, 간호사, 기타
+CSV_COLUMNS = ["no", "car_local", "car_count", "special_car_count", "general_car_count", "car_per_100k",
+               "emp_count", "emt1_count", "emt2_count", "nurse_count", "other_staff_count"]
+INT_COLUMNS = ["car_count", "special_car_count", "general_car_count",
+               "emp_count", "emt1_count", "emt2_count", "nurse_count", "other_staff_count"]
+COLUMNS = ["year", "car_local", *INT_COLUMNS, "car_per_100k", "crews_per_car", "staffed_car_count"]
+UPDATE_COLUMNS = COLUMNS[2:]  # 키(year, car_local)를 뺀 나머지
+
+# 구급차 1대 출동에 필요한 인원(구급대원 3인 탑승)과 하루 교대 조 수(3교대)
+CREW_SIZE = 3
+SHIFTS = 3
+
+
+def add_staffed_capacity(df):
+    """
+    인력 기준 가용 구급차 수를 계산하여 컬럼으로 추가
+
+    한 조는 CREW_SIZE명이고 그중 1명 이상은 자격 인력(1급/2급 응급구조사, 간호사)이어야 한다.
+    하루를 SHIFTS 조가 나눠 맡으므로 차량 1대를 상시 운영하려면 SHIFTS개 조가 필요하다.
+        crews_per_car = 편성 가능한 조 수 / 구급차 수
+        staffed_car_count = min(구급차 수, 편성 가능한 조 수 // SHIFTS)
+    """
+    qualified = df["emt1_count"] + df["emt2_count"] + df["nurse_count"]
+    crews = np.minimum(df["emp_count"] // CREW_SIZE, qualified)
+    df["crews_per_car"] = np.round(crews / df["car_count"].where(df["car_count"] > 0), 2)
+    df["staffed_car_count"] = np.minimum(df["car_count"], crews // SHIFTS)
+    return df
+
+
+# 검증 규칙 (대수/인원은 0 이상 정수, 인구 십만 명당 대수는 0 이상 실수, (연도, 지역)은 파일 안에서 하나)
+CHECK_INTS = {col: (0, 10_000_000) for col in INT_COLUMNS}
+CHECK_FLOATS = {"car_per_100k": (0, 1000)}
+
+
+def read_car_csv(path, year):
+    """
+    car CSV 한 파일을 읽어 검증
+
+    천 단위 콤마는 read_csv(thousands=",")에서 한 번에 처리한다.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (테이블 컬럼 순서(COLUMNS)의 통과 행, 격리 행)
+    """
+    with telemetry.stage(SOURCE_TABLE, "read", file=path, bytes_read=os.path.getsize(path)) as s:
+        df = pd.read_csv(path, thousands=",", header=0, names=CSV_COLUMNS, dtype={"car_local": str})
+        s.rows_out = len(df)
+
+    with telemetry.stage(SOURCE_TABLE, "normalize", file=path, rows_in=len(df)) as s:
+        df["car_local"] = df["car_local"].str.strip()
+        # 첫 행의 '전체'는 지역 합계이므로 적재하지 않음 (대시보드는 지역 행만 사용)
+        df = df[df["car_local"] != "전체"].assign(year=year)
+        s.rows_out = len(df)
+
+    with telemetry.stage(SOURCE_TABLE, "validate", file=path, rows_in=len(df)) as s:
+        good, bad = validation.validate(
+            df,
+            ints={"year": validation.YEAR_RANGE, **CHECK_INTS},
+            floats=CHECK_FLOATS,
+            required=["car_local"],
+            region="car_local",
+            keys=["year", "car_local"],
+        )
+        good = add_staffed_capacity(good)[COLUMNS]
+        s.rows_out = len(good)
+    return good, bad
+
 
 def load_car():
+    clear_quarantine(SOURCE_TABLE)
+    quarantined = []
+
     with get_connection() as connection:
         with connection.cursor() as cursor:
 
             for f in files:
-                df = pd.read_csv(loc+f)
+                df, bad = read_car_csv(loc+f, int(f[5:9]))  # "DATA/2019_car.csv"에서 연도 추출 (5:9)
+                if not bad.empty:
+                    quarantined.append((f, bad))
+                    print(f"{f}에서 검증에 실패한 {len(bad)}개 행을 격리합니다.")
 
-                df = df.rename(columns={"분류": "car_local", "계": "car_count", "계.1" : "emp_count"})
-                df = df[["car_count", "emp_count", "car_local"]]
-                
-
-                df["year"] = int(f[5:9])  # "DATA/2019_car.csv"에서 연도 추출 (5:9)
-
-                sql = 'insert into emergency_car (year, car_count, emp_count, car_local) values (%s, %s, %s, %s)'
-                for row in df.iterrows():
-                    row_data = row[1]
-                    # print((row_data['year'], row_data['car_count'].replace(',', ''), row_data['emp_count'].replace(',', ''), row_data['car_local']))
-                    cursor.execute(sql, (row_data['year'], int(row_data['car_count'].replace(',','')), int(row_data['emp_count'].replace(',','')), row_data['car_local']))
+                # (year, car_local) UNIQUE - 같은 연도/지역을 다시 적재하면 값만 갱신
+                sql = (f'insert into {TABLE_NAME} ({", ".join(COLUMNS)}) values ({", ".join(["%s"] * len(COLUMNS))}) '
+                       f'on duplicate key update {", ".join(f"{c} = values({c})" for c in UPDATE_COLUMNS)}')
+                # NaN(구급차 0대의 crews_per_car)은 NULL로, numpy 값은 파이썬 기본형으로
+                rows = df.astype(object).where(df.notna(), None).to_numpy().tolist()
+                # 파일 단위로 한 번에 적재 (pymysql이 여러 행 INSERT 하나로 묶어서 전송)
+                with telemetry.stage(SOURCE_TABLE, "write", file=f, rows_in=len(rows)):
+                    cursor.executemany(sql, rows)
                 
                 print(f"{f} 파일 적재 완료")
 
-            connection.commit()
-            print("모든 데이터 커밋 완료")
\ No newline at end of file
+            with telemetry.stage(SOURCE_TABLE, "commit"):
+                connection.commit()
+            print("모든 데이터 커밋 완료")
+
+    # 적재 트랜잭션이 끝난 뒤 격리 행을 한 번에 기록
+    with telemetry.stage(SOURCE_TABLE, "quarantine", rows_in=sum(len(bad) for _, bad in quarantined)):
+        insert_quarantine(SOURCE_TABLE, quarantined)
@@ -1,23 +1,23 @@
 import os
 import glob
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import sys
 
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from db_config import DB_CONFIG
+from db_config import get_engine
+from csv_py import validation, telemetry
+from sql_py.quarantine import clear_quarantine, insert_quarantine
 
 # 프로젝트 루트 경로 설정
 loc = os.path.dirname(os.path.dirname(__file__)) + "/"
 
 # ---------- 사용자 설정 ----------
-MYSQL_USER = DB_CONFIG['user']
-MYSQL_PASSWORD = DB_CONFIG['password']
-MYSQL_HOST = DB_CONFIG['host']
-MYSQL_PORT = DB_CONFIG['port']
-MYSQL_DATABASE = DB_CONFIG['db']
-TABLE_NAME = "emergency_ex"
+# DB 연결 정보/백엔드(mysql, sqlite, duckdb)는 db_config에서 관리
+# 적재는 staging 테이블에 하고, run.py가 적재 후 live 테이블(emergency_ex)과 교체한다
+TABLE_NAME = "emergency_ex_staging"
+SOURCE_TABLE = "emergency_ex"
 
 # 파일 패턴 (예: "DATA/2019_ex.xlsx", "DATA/2020_ex.xlsx", ...)
 FILE_GLOB = loc + "DATA/*_ex.xlsx"  # 프로젝트 루트의 DATA 폴더의 ex 파일들
@@ -36,12 +36,12 @@ COLUMN_MAP = {
     "PTN_CR_NM": "job",
 }
 
-# 2022년 파일용 컬럼 인덱스 매핑 (D=증상, R=연도, BM=지역, BP=직업)
+# 2022년 파일용 컬럼 인덱스 매핑 (D=증상, R=연도, BL=지역, BP=직업)
 COLUMN_MAP_2022 = {
     17: "year",    # R - 연도
     3: "cause",    # D - 증상  
     62: "gender",  # 성별
-    65: "local",   # BM - 지역 (동해시 헤더, 실제로는 시/군)
+    63: "local",   # BL - 지역 (시도, 다른 연도의 PTN_CTPV_NM과 같은 위치. BN(65)은 시/군)
     67: "job",     # BP - 직업
 }
 
@@ -102,16 +102,9 @@ def convert_region_name(region_name):
     return region_name
 
 # ---------- 함수들 ----------
-def get_engine():
-    url = (
-        f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}"
-        f"@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}?charset=utf8mb4"
-    )
-    return create_engine(url, pool_pre_ping=True)
-
 def ensure_table(engine):
     """
-    emergency_ex 테이블이 없으면 생성합니다.
+    emergency_ex_staging 테이블이 없으면 생성합니다.
     스키마는 아래와 같이 가정합니다:
       - year: INT
       - cause, gender, local, job: VARCHAR(255)
@@ -128,32 +121,45 @@ def ensure_table(engine):
     with engine.begin() as conn:
         conn.execute(text(ddl))
         
-def load_file(path: str) -> pd.DataFrame:
+def load_file(path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    엑셀 파일을 읽어 필요한 컬럼만 추출/정리하여 반환합니다.
+    엑셀 파일을 읽어 필요한 컬럼만 추출/정리하고, 검증을 통과한 행과 격리할 행(reason 포함)을 반환합니다.
     CSV를 사용할 경우에는 pd.read_excel -> pd.read_csv로 바꾸세요.
     """
     filename = os.path.basename(path)
     
     # 엑셀: 첫 번째 시트 기준
-    df = pd.read_excel(path, dtype=str)
-    
+    with telemetry.stage(SOURCE_TABLE, "read", file=path, bytes_read=os.path.getsize(path)) as s:
+        df = pd.read_excel(path, dtype=str)
+        s.rows_out = len(df)
+
+    with telemetry.stage(SOURCE_TABLE, "normalize", file=path, rows_in=len(df)) as s:
+        result_df = normalize_frame(df, filename)
+        s.rows_out = len(result_df)
+
+    # ✅ 빈 값/연도 형식/지역 검증 - 실패한 행은 버리지 않고 사유와 함께 격리
+    with telemetry.stage(SOURCE_TABLE, "validate", file=path, rows_in=len(result_df)) as s:
+        result_df, bad = validation.validate(
+            result_df,
+            ints={"year": validation.YEAR_RANGE},
+            required=TARGET_COLS,
+            region="local",
+        )
+        s.rows_out = len(result_df)
+
+    return result_df, bad
+
+def normalize_frame(df: pd.DataFrame, filename: str) -> pd.DataFrame:
+    """원본 시트에서 타겟 컬럼만 뽑아 공백/지역명/'전체'/빈 줄을 정리 (검증 전 단계)"""
     # 2022년 파일은 구조가 다르므로 별도 처리
     if "2022" in filename:
         print(f"📋 {filename}은 2022년 파일로 특별 처리합니다.")
         
-        # 2022년 파일은 컬럼 인덱스로 접근
-        result_data = []
-        for i in range(len(df)):
-            row_data = {}
-            for col_idx, target_col in COLUMN_MAP_2022.items():
-                if col_idx < len(df.columns):
-                    row_data[target_col] = str(df.iloc[i, col_idx]).strip() if pd.notna(df.iloc[i, col_idx]) else ""
-                else:
-                    row_data[target_col] = ""
-            result_data.append(row_data)
-        
-        result_df = pd.DataFrame(result_data)
+        # 2022년 파일은 컬럼 인덱스로 접근 (없는 컬럼은 빈 값)
+        result_df = pd.DataFrame({
+            target_col: df.iloc[:, col_idx] if col_idx < len(df.columns) else ""
+            for col_idx, target_col in COLUMN_MAP_2022.items()
+        }, index=df.index)
         
     else:
         # 기존 파일들 처리 (2019-2021, 2023 등)
@@ -168,22 +174,19 @@ def load_file(path: str) -> pd.DataFrame:
         # 컬럼명 매핑 -> 타겟 컬럼명으로 변경
         result_df = df.rename(columns=COLUMN_MAP)
 
-    # 문자열 공백 제거
+    # 문자열 공백 제거 (빈 칸은 NaN 그대로 두어 검증에서 걸러지게 함)
     for col in result_df.columns:
         if result_df[col].dtype == object:
-            result_df[col] = result_df[col].astype(str).str.strip()
+            result_df[col] = result_df[col].str.strip()
 
     # 빈 문자열을 NaN으로 치환 ("" -> <NA>)
     result_df = result_df.replace({"": pd.NA})
 
-    # 지역명 변환 (풀네임 -> 2글자)
+    # 지역명 변환 (풀네임 -> 2글자, 서로 다른 지역명마다 한 번만 변환)
     if 'local' in result_df.columns:
-        result_df['local'] = result_df['local'].apply(convert_region_name)
+        result_df['local'] = result_df['local'].map({name: convert_region_name(name) for name in result_df['local'].unique()})
         print(f"'{filename}'에서 지역명을 2글자로 변환했습니다.")
 
-    # year 숫자 변환 (실패 시 NaN으로)
-    result_df["year"] = pd.to_numeric(result_df["year"], errors="coerce").astype("Int64")
-
     # 최종 컬럼 존재 확인
     missing_target = [c for c in TARGET_COLS if c not in result_df.columns]
     if missing_target:
@@ -194,9 +197,6 @@ def load_file(path: str) -> pd.DataFrame:
     # 타겟 컬럼만 남기고 순서 고정
     result_df = result_df[TARGET_COLS]
 
-    # ✅ 타겟 컬럼 중 하나라도 비어 있으면 행 제거
-    result_df = result_df.dropna(subset=TARGET_COLS, how="any")
-
     # ✅ 지역이 '전체'인 경우 제외
     if 'local' in result_df.columns:
         before_count = len(result_df)
@@ -206,10 +206,8 @@ def load_file(path: str) -> pd.DataFrame:
         if removed_count > 0:
             print(f"'{filename}'에서 지역이 '전체'인 {removed_count}개 행을 제외했습니다.")
 
-    # (선택) NaN -> None (to_sql에서 NULL로 인식되게 하고 싶다면 유지)
-    result_df = result_df.where(pd.notnull(result_df), None)
-
-    return result_df
+    # 모든 컬럼이 빈 행(원본 엑셀의 구분용 빈 줄)은 데이터가 아니므로 제외
+    return result_df.dropna(how="all")
 
 def main():
     engine = get_engine() # db 연결 엔진 생성
@@ -222,26 +220,40 @@ def main():
 
     print(f"발견된 파일: {files}")
 
+    clear_quarantine(SOURCE_TABLE)
+    quarantined = []
+
     total_rows = 0
     for fp in files:
         print(f"처리 중: {fp}")
-        df = load_file(fp)
-
-        # 미리보기(선택) — 문제 없으면 주석 처리해도 됩니다.
-        print(df.head(3))
-
-        # MySQL에 적재 (append)
-        df.to_sql(
-            name=TABLE_NAME,
-            con=engine,
-            if_exists="append",
-            index=False,
-            method="multi",
-            chunksize=1000,
-        )
+        df, bad = load_file(fp)
+        if not bad.empty:
+            quarantined.append((fp, bad))
+            print(f"'{os.path.basename(fp)}'에서 검증에 실패한 {len(bad)}개 행을 격리합니다.")
+
+        # MySQL에 적재 (append) - 파일/단계별 시간과 행 수는 csv_py.telemetry가 기록 (미리보기 출력 대신)
+        with telemetry.stage(SOURCE_TABLE, "write", file=fp, rows_in=len(df)):
+            df.to_sql(
+                name=TABLE_NAME,
+                con=engine,
+                if_exists="append",
+                index=False,
+                method="multi",
+                chunksize=1000,
+            )
         total_rows += len(df)
 
     print(f"적재 완료: 총 {total_rows}행을 '{TABLE_NAME}' 테이블에 추가했습니다.")
 
+    # 격리 행은 파일별 적재가 끝난 뒤 한 번에 기록
+    with telemetry.stage(SOURCE_TABLE, "quarantine", rows_in=sum(len(bad) for _, bad in quarantined)):
+        inserted = insert_quarantine(SOURCE_TABLE, quarantined)
+    if inserted:
+        print(f"검증 실패: 총 {sum(len(bad) for _, bad in quarantined)}행을 격리 테이블에 기록했습니다.")
+
 if __name__ == "__main__":
+    import sql_py.emergency_ex as sql_ex
+    telemetry.start_run()
     main()
+    sql_ex.emergency_ex_swap()
+    telemetry.finish_run()
@@ -6,6 +6,8 @@ import os
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from csv_py import validation, telemetry
+from sql_py.quarantine import clear_quarantine, insert_quarantine
 
 # ---------- 지역명 변환 함수 ----------
 def convert_region_name(region_name):
@@ -59,6 +61,10 @@ def convert_region_name(region_name):
     
     return region_name
 loc = os.path.dirname(os.path.dirname(__file__))+"/"
+
+# 적재는 staging 테이블에 하고, run.py가 적재 후 live 테이블과 교체한다
+TABLE_NAME = "emergency_move_staging"
+SOURCE_TABLE = "emergency_move"
 files = [
     "DATA/2019_move.csv",
     "DATA/2020_move.csv",
@@ -68,40 +74,64 @@ files = [
 
 
 def load_move():
+    clear_quarantine(SOURCE_TABLE)
+    quarantined = []
+
     with get_connection() as connection:
         with connection.cursor() as cursor:
 
             for f in files:
-                df = pd.read_csv(loc+f)
-                
-                # 컬럼명의 공백 제거
-                df.columns = df.columns.str.strip()
-                print(f"{f} 컬럼명: {df.columns.tolist()}")
+                with telemetry.stage(SOURCE_TABLE, "read", file=f, bytes_read=os.path.getsize(loc+f)) as s:
+                    df = pd.read_csv(loc+f, thousands=",", dtype={"move_local": str}, skipinitialspace=True)
+                    s.rows_out = len(df)
+
+                with telemetry.stage(SOURCE_TABLE, "normalize", file=f, rows_in=len(df)) as s:
+                    # 컬럼명의 공백 제거
+                    df.columns = df.columns.str.strip()
+                    print(f"{f} 컬럼명: {df.columns.tolist()}")
 
-                df = df[["move_local", "move_count"]]
-                
-                # 지역명을 2글자로 변환
-                df['move_local'] = df['move_local'].apply(convert_region_name)
-                print(f"{f}에서 지역명을 2글자로 변환했습니다.")
-                
-                # 지역이 '전체'인 경우 제외
-                before_count = len(df)
-                df = df[df['move_local'] != '전체']
-                after_count = len(df)
-                removed_count = before_count - after_count
-                if removed_count > 0:
-                    print(f"{f}에서 지역이 '전체'인 {removed_count}개 행을 제외했습니다.")
+                    df = df[["move_local", "move_count"]]
+                    
+                    # 지역명을 2글자로 변환 (서로 다른 지역명마다 한 번만 변환)
+                    df['move_local'] = df['move_local'].map({name: convert_region_name(name) for name in df['move_local'].unique()})
+                    print(f"{f}에서 지역명을 2글자로 변환했습니다.")
+                    
+                    # 지역이 '전체'인 경우 제외
+                    before_count = len(df)
+                    df = df[df['move_local'] != '전체']
+                    after_count = len(df)
+                    removed_count = before_count - after_count
+                    if removed_count > 0:
+                        print(f"{f}에서 지역이 '전체'인 {removed_count}개 행을 제외했습니다.")
 
-                df["year"] = int(f[5:9])
+                    df["year"] = int(f[5:9])
+                    s.rows_out = len(df)
 
-                cur = connection.cursor()
+                # 타입/범위/지역/중복 (연도, 지역) 검증 - 실패한 행은 사유와 함께 격리
+                with telemetry.stage(SOURCE_TABLE, "validate", file=f, rows_in=len(df)) as s:
+                    df, bad = validation.validate(
+                        df,
+                        ints={"year": validation.YEAR_RANGE, "move_count": (0, 100_000_000)},
+                        required=["move_local"],
+                        region="move_local",
+                        keys=["year", "move_local"],
+                    )
+                    s.rows_out = len(df)
+                if not bad.empty:
+                    quarantined.append((f, bad))
+                    print(f"{f}에서 검증에 실패한 {len(bad)}개 행을 격리합니다.")
 
-                sql = 'insert into emergency_move (year, move_local, move_count) values (%s, %s, %s)'
-                for row in df.iterrows():
-                    row_data = row[1]
-                    # print((row_data['year'], row_data['car_count'].replace(',', ''), row_data['emp_count'].replace(',', ''), row_data['car_local']))
-                    cursor.execute(sql, (row_data['year'], (row_data['move_local']), int(row_data['move_count'])))
+                # (year, move_local) UNIQUE - 같은 연도/지역을 다시 적재하면 건수만 갱신
+                sql = (f'insert into {TABLE_NAME} (year, move_local, move_count) values (%s, %s, %s) '
+                       'on duplicate key update move_count = values(move_count)')
+                rows = df[["year", "move_local", "move_count"]].astype(object).to_numpy().tolist()
+                # 파일 단위로 한 번에 적재 (pymysql이 여러 행 INSERT 하나로 묶어서 전송)
+                with telemetry.stage(SOURCE_TABLE, "write", file=f, rows_in=len(rows)):
+                    cursor.executemany(sql, rows)
 
-            connection.commit()
-            
+            with telemetry.stage(SOURCE_TABLE, "commit"):
+                connection.commit()
 
+    # 적재 트랜잭션이 끝난 뒤 격리 행을 한 번에 기록
+    with telemetry.stage(SOURCE_TABLE, "quarantine", rows_in=sum(len(bad) for _, bad in quarantined)):
+        insert_quarantine(SOURCE_TABLE, quarantined)
@@ -0,0 +1,179 @@
+"""
+적재(ingest) 단계별 계측
+
+적재 모듈(load_car, load_move, emergency_ex.main)은 파일마다 읽기(read) / 정리(normalize) / 검증(validate) / 쓰기(write)
+단계를 stage()로 감싸고, 단계가 끝날 때마다 한 줄짜리 JSON 레코드를 INGEST_TELEMETRY_PATH에 덧붙인다.
+
+    {"type": "stage", "run_id": ..., "table": "emergency_car", "file": "DATA/2019_car.csv", "stage": "write",
+     "seconds": 0.012, "rows_in": 17, "rows_out": 17, "bytes": 0, "rows_per_s": 1416.7, "peak_rss_mb": 182.4}
+
+run.py는 적재 전후로 start_run() / finish_run()을 호출하고, finish_run()은 테이블 × 단계 요약 레코드(type=summary)를
+같은 파일에 쓰고 요약 표를 출력한다. 적재 모듈을 단독으로 실행하면 첫 stage()에서 실행 ID가 자동으로 만들어진다.
+
+peak_rss_mb는 단계가 끝난 시점까지의 프로세스 최대 RSS이다. (테이블 적재가 병렬로 돌면 다른 테이블의 사용량도 포함)
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import resource
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+INGEST_TELEMETRY_PATH = os.environ.get(
+    "EMERGENCY_INGEST_TELEMETRY",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".telemetry", "ingest.jsonl"),
+)
+
+STAGE_ORDER = ("read", "normalize", "validate", "write", "commit", "quarantine")
+
+_lock = threading.Lock()
+_run = {"id": None, "records": []}
+
+
+class Stage:
+    """
+    진행 중인 단계 하나 (with 블록 안에서 rows_in/rows_out/bytes_read를 채운다)
+
+    Attributes:
+        table: 대상 live 테이블명 (예: emergency_car)
+        stage: 단계 이름 (STAGE_ORDER)
+        file: 원본 파일 경로 (테이블 단위 단계면 None)
+        rows_in, rows_out: 단계에 들어온 행 수, 통과한 행 수
+        bytes_read: 읽은 바이트 수 (read 단계)
+    """
+
+    def __init__(self, table, stage, file=None, rows_in=None, bytes_read=0):
+        self.table = table
+        self.stage = stage
+        self.file = file
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.bytes_read = bytes_read
+
+
+def _peak_rss_mb():
+    # ru_maxrss 단위: Linux는 KB, macOS는 바이트
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _write(record):
+    os.makedirs(os.path.dirname(os.path.abspath(INGEST_TELEMETRY_PATH)), exist_ok=True)
+    with open(INGEST_TELEMETRY_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _new_run_id():
+    return datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+def start_run():
+    """새 적재 실행 시작 (이후 stage() 레코드가 이 실행 ID로 묶임)"""
+    with _lock:
+        _run["id"] = _new_run_id()
+        _run["records"] = []
+        return _run["id"]
+
+
+@contextmanager
+def stage(table, name, file=None, rows_in=None, bytes_read=0):
+    """
+    단계 하나를 계측
+
+    사용 예:
+        with telemetry.stage(SOURCE_TABLE, "validate", file=f, rows_in=len(df)) as s:
+            good, bad = validation.validate(df, ...)
+            s.rows_out = len(good)
+    """
+    with _lock:
+        if _run["id"] is None:
+            _run["id"] = _new_run_id()
+        run_id = _run["id"]
+    current = Stage(table, name, file, rows_in, bytes_read)
+    error = None
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        rows_out = current.rows_out if current.rows_out is not None else current.rows_in
+        record = {
+            "type": "stage",
+            "run_id": run_id,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "table": table,
+            "file": file,
+            "stage": name,
+            "seconds": round(seconds, 6),
+            "rows_in": current.rows_in,
+            "rows_out": rows_out,
+            "bytes": current.bytes_read,
+            "rows_per_s": round(rows_out / seconds, 1) if rows_out and seconds > 0 else None,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+        if error:
+            record["error"] = error
+        with _lock:
+            _run["records"].append(record)
+            _write(record)
+
+
+def summarize(records):
+    """stage 레코드를 (테이블, 단계)별로 합산한 요약 레코드 목록"""
+    groups = {}
+    for r in records:
+        g = groups.setdefault((r["table"], r["stage"]), {
+            "type": "summary", "run_id": r["run_id"], "table": r["table"], "stage": r["stage"],
+            "files": 0, "seconds": 0.0, "rows_in": 0, "rows_out": 0, "bytes": 0, "peak_rss_mb": 0.0, "errors": 0,
+        })
+        g["files"] += 1
+        g["seconds"] += r["seconds"]
+        g["rows_in"] += r["rows_in"] or 0
+        g["rows_out"] += r["rows_out"] or 0
+        g["bytes"] += r["bytes"] or 0
+        g["peak_rss_mb"] = max(g["peak_rss_mb"], r["peak_rss_mb"])
+        g["errors"] += "error" in r
+
+    table_seconds = {}
+    for (table, _), g in groups.items():
+        table_seconds[table] = table_seconds.get(table, 0.0) + g["seconds"]
+    order = {name: i for i, name in enumerate(STAGE_ORDER)}
+    summary = []
+    for (table, name), g in sorted(groups.items(), key=lambda x: (x[0][0], order.get(x[0][1], len(order)))):
+        g["seconds"] = round(g["seconds"], 6)
+        g["rows_per_s"] = round(g["rows_out"] / g["seconds"], 1) if g["seconds"] > 0 else None
+        g["share"] = round(g["seconds"] / table_seconds[table], 3) if table_seconds[table] > 0 else None
+        summary.append(g)
+    return summary
+
+
+def print_summary(summary):
+    print(f"\n{'테이블':<16}{'단계':<12}{'파일':>5}{'시간(s)':>9}{'비중':>7}{'입력 행':>10}{'출력 행':>10}"
+          f"{'MB':>8}{'rows/s':>11}{'peak MB':>9}")
+    print("-" * 97)
+    for g in summary:
+        rate = f"{g['rows_per_s']:,.0f}" if g["rows_per_s"] else "-"
+        share = f"{g['share']:.0%}" if g["share"] is not None else "-"
+        print(f"{g['table']:<16}{g['stage']:<12}{g['files']:>5}{g['seconds']:>9.3f}{share:>7}"
+              f"{g['rows_in']:>10,}{g['rows_out']:>10,}{g['bytes'] / 1e6:>8.2f}{rate:>11}{g['peak_rss_mb']:>9.1f}")
+
+
+def finish_run(show=True):
+    """실행을 마치고 요약 레코드를 기록/출력 (요약 목록 반환)"""
+    with _lock:
+        records = list(_run["records"])
+        _run["id"] = None
+        _run["records"] = []
+    summary = summarize(records)
+    with _lock:
+        for g in summary:
+            _write(g)
+    if show and summary:
+        print_summary(summary)
+    return summary
@@ -0,0 +1,69 @@
+import pandas as pd
+
+# ---------- 적재 전 검증 단계 ----------
+# 파일 하나를 DataFrame째로 검사하여 통과한 행과 격리할 행(사유 포함)으로 나눈다.
+# 행마다 int()/replace()를 호출하다 중간에 예외가 나서 적재가 멈추거나, 빈 값이 있는 행을 말없이 버리는 대신
+# 규칙마다 열 전체에 대한 마스크를 한 번 계산하고, 걸린 행은 sql_py.quarantine으로 한 번에 보낸다.
+
+# 적재 대상 시도 (2글자 지역명). 원본의 '전체' 합계 행은 각 적재 모듈이 검증 전에 제외한다
+KNOWN_REGIONS = {
+    "서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기",
+    "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주",
+}
+
+# MySQL YEAR 타입 범위
+YEAR_RANGE = (1901, 2155)
+
+
+def validate(df, ints=None, floats=None, required=(), region=None, keys=()):
+    """
+    DataFrame 전체를 한 번에 검증
+
+    Args:
+        df: 원본 DataFrame (숫자 컬럼은 문자열이어도 됨)
+        ints: {컬럼: (최소, 최대)} - 정수여야 하는 컬럼과 허용 범위
+        floats: {컬럼: (최소, 최대)} - 실수 컬럼과 허용 범위
+        required: 비어 있으면 안 되는 컬럼
+        region: KNOWN_REGIONS에 있어야 하는 지역 컬럼
+        keys: 중복되면 안 되는 키 컬럼 (먼저 나온 행을 남기고 뒤의 행을 격리)
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (통과한 행 - 숫자 컬럼은 int64/float64로 변환됨,
+                                           격리할 행 - 원본 값 + reason 컬럼)
+    """
+    original = df
+    df = df.copy()
+    reasons = pd.Series("", index=df.index)
+
+    def flag(mask, reason):
+        nonlocal reasons
+        reasons = reasons.mask(mask, reasons + reason + "; ")
+
+    for col in required:
+        flag(df[col].isna() | (df[col].astype(str).str.strip() == ""), f"{col} 빈 값")
+
+    for columns, integer in ((ints or {}, True), (floats or {}, False)):
+        for col, (low, high) in columns.items():
+            raw = df[col]
+            if raw.dtype == object:
+                # 한 칸이라도 숫자가 아니면 read_csv(thousands=",")가 열 전체를 문자열로 남기므로 콤마를 여기서 제거
+                raw = raw.where(raw.isna(), raw.astype(str).str.replace(",", "", regex=False).str.strip())
+            values = pd.to_numeric(raw, errors="coerce")
+            if col not in required:
+                flag(df[col].isna(), f"{col} 빈 값")
+            flag(values.isna() & df[col].notna(), f"{col} 숫자 아님")
+            if integer:
+                flag(values.notna() & (values % 1 != 0), f"{col} 정수 아님")
+            flag((values < low) | (values > high), f"{col} 범위 밖({low}~{high})")
+            df[col] = values
+
+    if region is not None:
+        flag(df[region].notna() & ~df[region].isin(KNOWN_REGIONS), f"{region} 알 수 없는 지역")
+
+    if keys:
+        flag(df.duplicated(subset=list(keys), keep="first"), f"중복 키({', '.join(keys)})")
+
+    bad = reasons != ""
+    good = df[~bad].astype({col: "int64" for col in (ints or {})})
+    quarantined = original[bad].assign(reason=reasons[bad].str.rstrip("; "))
+    return good, quarantined
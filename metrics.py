@@ -0,0 +1,309 @@
+"""
+운영 모니터링용 Prometheus 메트릭 (텍스트 노출 형식, 외부 라이브러리 없음)
+
+db_config.get_connection, streamlit_py.utils의 로더, FAQ 크롤러가 이 모듈의 카운터/히스토그램에 값을 쌓고,
+start_server()가 띄운 HTTP 서버가 /metrics 요청마다 Prometheus 텍스트 형식으로 내보낸다.
+
+    emergency_db_connections_total{backend}          열린 DB 연결 수
+    emergency_db_connect_errors_total{backend}       연결 실패 수
+    emergency_db_connect_seconds{backend}            연결 생성 시간 (histogram)
+    emergency_loader_calls_total{loader}             로더 호출 수
+    emergency_loader_seconds{loader}                 로더 소요 시간 (histogram, 캐시/스냅샷 적중 포함)
+    emergency_loader_rows_total{loader}              로더가 돌려준 행 수 누계
+    emergency_faq_crawls_total{result}               FAQ 크롤링 횟수 (ok / fail)
+    emergency_faq_crawl_seconds                      FAQ 크롤링 소요 시간 (histogram)
+    emergency_faq_source_failures_total{host}        출처 페이지 수집 실패 수
+    emergency_ingest_rows_per_second{table,stage}    마지막 적재 실행의 단계별 처리량
+    emergency_ingest_seconds{table,stage}            마지막 적재 실행의 단계별 소요 시간
+    emergency_ingest_rows{table,stage}               마지막 적재 실행의 단계별 출력 행 수
+    emergency_ingest_errors{table,stage}             마지막 적재 실행의 단계별 오류 파일 수
+    emergency_ingest_last_run_timestamp_seconds      마지막 적재 요약을 읽은 파일의 수정 시각
+
+적재(run.py setup_database)는 Streamlit과 다른 프로세스에서 돌기 때문에 ingest_* 값은 csv_py.telemetry가 남긴
+JSON Lines 파일에서 마지막 실행의 요약(type=summary) 레코드를 읽어 만든다. (스크레이프마다 새로 덧붙은 줄만 읽음)
+
+run.py는 Streamlit을 띄울 때 EMERGENCY_METRICS_PORT를 넘기고, main.py가 start_server()를 호출한다.
+포트가 지정되지 않으면 서버를 띄우지 않는다. (값은 그대로 쌓이므로 같은 프로세스에서 render()로 확인 가능)
+"""
+import os
+import json
+import time
+import bisect
+import abc
+import logging
+import functools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("emergency.metrics")
+
+METRICS_HOST = os.environ.get("EMERGENCY_METRICS_HOST", "127.0.0.1")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 버킷 (DB 연결/로더는 ms~초, 크롤링은 수 초~수 분)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CRAWL_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    """라벨 조합별 값을 가진 메트릭 (라벨은 labelnames 이름의 키워드 인자로 받는다)"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 라벨은 {self.labelnames}이어야 합니다: {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self):
+        """[(샘플 이름, [(라벨, 값)...], 값)]"""
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self.samples()]
+        return lines
+
+
+class Counter(_Metric):
+    """증가만 하는 값"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, list(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """구간(bucket)별 관측 횟수와 합계 (노출할 때 누적 분포로 바꾼다)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        out = []
+        for key, (counts, total) in items:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                out.append((f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative))
+            out.append((f"{self.name}_sum", labels, total))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+
+class _IngestCollector:
+    """csv_py.telemetry JSON Lines 파일에서 마지막 적재 실행의 요약 레코드를 게이지로 노출"""
+
+    GAUGES = (
+        ("emergency_ingest_rows_per_second", "rows_per_s", "마지막 적재 실행의 단계별 처리량 (rows/s)"),
+        ("emergency_ingest_seconds", "seconds", "마지막 적재 실행의 단계별 소요 시간 (초)"),
+        ("emergency_ingest_rows", "rows_out", "마지막 적재 실행의 단계별 출력 행 수"),
+        ("emergency_ingest_errors", "errors", "마지막 적재 실행의 단계별 오류 파일 수"),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._run_id = None
+        self._summary = {}
+        self._updated = None
+
+    def _path(self):
+        from csv_py.telemetry import INGEST_TELEMETRY_PATH
+        return INGEST_TELEMETRY_PATH
+
+    def _refresh(self):
+        path = self._path()
+        try:
+            size = os.path.getsize(path)
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        if size < self._offset:  # 파일이 지워지고 새로 만들어짐
+            self._offset, self._run_id, self._summary = 0, None, {}
+        if size == self._offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        # 쓰는 중인 마지막 줄은 다음 스크레이프에서 읽는다
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") != "summary":
+                continue
+            if record.get("run_id") != self._run_id:
+                self._run_id, self._summary = record.get("run_id"), {}
+            self._summary[(record["table"], record["stage"])] = record
+            self._updated = mtime
+
+    def render(self):
+        with self._lock:
+            self._refresh()
+            summary = sorted(self._summary.items())
+            updated = self._updated
+        lines = []
+        for name, field, help_text in self.GAUGES:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for (table, stage), record in summary:
+                if record.get(field) is not None:
+                    labels = _format_labels([("table", table), ("stage", stage)])
+                    lines.append(f"{name}{labels} {_format_value(record[field])}")
+        if updated is not None:
+            lines += ["# HELP emergency_ingest_last_run_timestamp_seconds 마지막 적재 요약이 기록된 시각 (unix time)",
+                      "# TYPE emergency_ingest_last_run_timestamp_seconds gauge",
+                      f"emergency_ingest_last_run_timestamp_seconds {_format_value(updated)}"]
+        return lines
+
+
+REGISTRY = []
+
+DB_CONNECTIONS = Counter("emergency_db_connections_total", "열린 DB 연결 수", ["backend"])
+DB_CONNECT_ERRORS = Counter("emergency_db_connect_errors_total", "DB 연결 실패 수", ["backend"])
+DB_CONNECT_SECONDS = Histogram("emergency_db_connect_seconds", "DB 연결 생성 시간 (초)", ["backend"])
+
+LOADER_CALLS = Counter("emergency_loader_calls_total", "데이터 로더 호출 수", ["loader"])
+LOADER_SECONDS = Histogram("emergency_loader_seconds", "데이터 로더 소요 시간 (초)", ["loader"])
+LOADER_ROWS = Counter("emergency_loader_rows_total", "데이터 로더가 돌려준 행 수", ["loader"])
+
+FAQ_CRAWLS = Counter("emergency_faq_crawls_total", "FAQ 크롤링 횟수", ["result"])
+FAQ_CRAWL_SECONDS = Histogram("emergency_faq_crawl_seconds", "FAQ 크롤링 소요 시간 (초)", buckets=CRAWL_BUCKETS)
+FAQ_SOURCE_FAILURES = Counter("emergency_faq_source_failures_total", "FAQ 출처 페이지 수집 실패 수", ["host"])
+
+_ingest = _IngestCollector()
+
+
+def render():
+    """등록된 모든 메트릭을 Prometheus 텍스트 형식으로"""
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += _ingest.render()
+    return "\n".join(lines) + "\n"
+
+
+def instrument_loader(func):
+    """로더 함수의 호출 수, 소요 시간, 반환 행 수(len)를 기록하는 데코레이터 (라벨은 함수 이름)"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            LOADER_CALLS.inc(loader=name)
+            LOADER_SECONDS.observe(time.perf_counter() - start, loader=name)
+        LOADER_ROWS.inc(len(result) if hasattr(result, "__len__") else 0, loader=name)
+        return result
+
+    return wrapper
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        try:
+            body = render().encode("utf-8")
+        except Exception as e:
+            logger.exception("메트릭 생성 실패")
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 스크레이프마다 stderr에 접근 로그를 남기지 않음
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(port=None, host=None):
+    """
+    /metrics를 내보내는 HTTP 서버를 데몬 스레드로 시작 (프로세스당 한 번만, 이미 떠 있으면 그대로 둔다)
+
+    Args:
+        port: 포트 (None이면 EMERGENCY_METRICS_PORT, 그것도 없으면 시작하지 않음)
+        host: 바인드 주소 (기본 EMERGENCY_METRICS_HOST 또는 127.0.0.1)
+
+    Returns:
+        int | None: 서버가 듣고 있는 포트 (시작하지 않았거나 실패하면 None)
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        if port is None:
+            port = os.environ.get("EMERGENCY_METRICS_PORT")
+            if not port:
+                return None
+        try:
+            server = ThreadingHTTPServer((host or METRICS_HOST, int(port)), _Handler)
+        except OSError as e:
+            # 포트를 다른 프로세스가 쓰고 있어도 대시보드는 그대로 동작해야 한다
+            logger.warning("메트릭 서버를 시작하지 못했습니다 (포트 %s): %s", port, e)
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _server = server
+        logger.info("메트릭 서버 시작: http://%s:%s/metrics", *server.server_address[:2])
+        return server.server_address[1]
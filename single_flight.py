@@ -0,0 +1,64 @@
+"""
+같은 작업의 동시 요청을 한 번의 실행으로 합치는 single-flight 모듈
+
+Streamlit은 세션마다 스크립트를 별도 스레드에서 실행하므로, 데이터 갱신 직후 여러 사용자가
+동시에 대시보드를 열면 같은 테이블 조회가 사용자 수만큼 DB로 나간다.
+SingleFlight.do(key, fn)는 같은 key로 이미 실행 중인 호출이 있으면 그 결과를 기다려 함께 쓴다.
+(프로세스 안에서만 합쳐진다. 여러 프로세스/서버 사이는 db_config.advisory_lock을 사용)
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """key별로 실행 중인 호출을 하나만 유지하는 조정자"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self, key):
+        """key로 실행 중인 호출이 있는지 (기다리기 전에 안내 메시지를 띄울 때 사용)"""
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs)를 실행하거나, 같은 key의 실행이 진행 중이면 그 결과를 기다린다.
+
+        Returns:
+            tuple: (결과, shared) - shared가 True면 다른 호출자와 같은 결과 객체를 받은 것이므로
+                   (실행한 쪽 포함) 수정이 필요하면 복사해서 써야 한다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        return call.result, shared
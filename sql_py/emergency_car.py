@@ -6,32 +6,39 @@ import os
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from sql_py.staging import staging_name, create_staging_table, swap_staging_table
 
-def emergency_car_table():
-    try: 
-        conn = get_connection()
-
-        cursor = conn.cursor()
+TABLE_NAME = "emergency_car"
+# 적재가 끝난 뒤 한 번만 만드는 인덱스 - (year, car_local) 조회는 UNIQUE 제약의 인덱스를 사용
+INDEXES = []
 
-        createsql = """
-        CREATE TABLE emergency_car (
+def emergency_car_table():
+    """emergency_car_staging 테이블 생성 (live 테이블은 emergency_car_swap()에서 교체)"""
+    createsql = f"""
+        CREATE TABLE {staging_name(TABLE_NAME)} (
             idx INT AUTO_INCREMENT PRIMARY KEY,
             year YEAR NOT NULL,
             car_count INT,
+            special_car_count INT,
+            general_car_count INT,
+            car_per_100k FLOAT,
             emp_count INT,
-            car_local VARCHAR(50) NOT NULL
+            emt1_count INT,
+            emt2_count INT,
+            nurse_count INT,
+            other_staff_count INT,
+            crews_per_car FLOAT,
+            staffed_car_count INT,
+            car_local VARCHAR(50) NOT NULL,
+            -- 지역별 연도 데이터는 하나만 (다시 적재하면 INSERT ... ON DUPLICATE KEY UPDATE로 덮어씀)
+            UNIQUE (year, car_local)
         );
         """
-        cursor.execute("DROP TABLE IF EXISTS emergency_car")
-        cursor.execute(createsql)
-
-        conn.commit()
+    create_staging_table(TABLE_NAME, createsql)
 
-    finally:
- 
-        if conn:
-            cursor.close() 
-            conn.close()
+def emergency_car_swap():
+    """적재가 끝난 staging 테이블에 인덱스를 만들고 emergency_car 테이블과 원자적으로 교체"""
+    swap_staging_table(TABLE_NAME, INDEXES)
 
 def car_all():
 
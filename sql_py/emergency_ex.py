@@ -6,16 +6,16 @@ import os
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from sql_py.staging import staging_name, create_staging_table, swap_staging_table
 
-def emergency_ex_table():
-    
-    try:
-        conn = get_connection()
-
-        cursor = conn.cursor()
+TABLE_NAME = "emergency_ex"
+# 적재가 끝난 뒤 한 번만 만드는 인덱스
+INDEXES = [("idx_emergency_ex_year_local", "year, local")]
 
-        create_sql = """
-        CREATE TABLE emergency_ex (
+def emergency_ex_table():
+    """emergency_ex_staging 테이블 생성 (live 테이블은 emergency_ex_swap()에서 교체)"""
+    createsql = f"""
+        CREATE TABLE {staging_name(TABLE_NAME)} (
             idx INT AUTO_INCREMENT PRIMARY KEY,
             year YEAR NOT NULL,
             cause VARCHAR(50),
@@ -24,15 +24,11 @@ def emergency_ex_table():
             job VARCHAR(50)
         );
         """
+    create_staging_table(TABLE_NAME, createsql)
 
-        cursor.execute("DROP TABLE IF EXISTS emergency_ex")
-        cursor.execute(create_sql)
-        conn.commit()
-
-    finally:
-        if conn:
-            cursor.close()
-            conn.close()
+def emergency_ex_swap():
+    """적재가 끝난 staging 테이블에 인덱스를 만들고 emergency_ex 테이블과 원자적으로 교체"""
+    swap_staging_table(TABLE_NAME, INDEXES)
 
 def ex_all():
       
@@ -13,16 +13,65 @@ def emergency_faq_table():
         conn = get_connection()
         cursor = conn.cursor()
 
+        # 답변은 zlib 압축 Markdown(faq_answer_z) + 요약 + 내용 해시 (crawling_py.faq_answer)
         create_sql = """
         CREATE TABLE emergency_faq (
             idx INT AUTO_INCREMENT PRIMARY KEY,
-            faq_question TEXT NOT NULL,
-            faq_answer TEXT NOT NULL
+            faq_question VARCHAR(500) NOT NULL UNIQUE,
+            faq_summary VARCHAR(300) NOT NULL,
+            faq_answer_z LONGBLOB NOT NULL,
+            content_hash CHAR(64) NOT NULL
+        );
+        """
+
+        # 검색 인덱스 (crawling_py.faq_index가 크롤링 결과를 저장할 때 다시 만든다)
+        index_sql = """
+        CREATE TABLE emergency_faq_index (
+            idx INT AUTO_INCREMENT PRIMARY KEY,
+            doc_hash CHAR(64) NOT NULL,
+            payload LONGBLOB NOT NULL
         );
         """
 
         cursor.execute("DROP TABLE IF EXISTS emergency_faq")
+        cursor.execute("DROP TABLE IF EXISTS emergency_faq_index")
         cursor.execute(create_sql)
+        cursor.execute(index_sql)
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
+
+    # 변경 이력은 DB CLEAR 대상이 아니므로 없을 때만 생성
+    emergency_faq_version_table()
+
+def emergency_faq_version_table():
+    """emergency_faq_version 테이블이 없으면 생성 (crawling_py.faq_history가 크롤링마다 버전을 추가)"""
+    createsql = """
+        CREATE TABLE IF NOT EXISTS emergency_faq_version (
+            idx INT AUTO_INCREMENT PRIMARY KEY,
+            faq_question VARCHAR(500) NOT NULL,
+            version_no INT NOT NULL,
+            created_at DATETIME NOT NULL,
+            checked_at DATETIME NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            delta LONGBLOB NOT NULL,
+            UNIQUE (faq_question, version_no)
+        );
+        """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(createsql)
+        try:
+            cursor.execute("CREATE INDEX idx_faq_version_time ON emergency_faq_version (created_at)")
+        except pymysql.err.MySQLError as e:
+            # 1061: 이미 있는 인덱스 (MySQL에는 CREATE INDEX IF NOT EXISTS가 없음)
+            if e.args[0] != 1061:
+                raise
         conn.commit()
 
 
@@ -37,7 +86,7 @@ def faq_all():
         conn = get_connection()
 
         sql_all = """
-        SELECT idx, faq_question, faq_answer
+        SELECT idx, faq_question, faq_summary, content_hash
         FROM emergency_faq
         ORDER BY idx;
         """
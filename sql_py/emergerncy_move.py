@@ -6,31 +6,29 @@ import os
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from sql_py.staging import staging_name, create_staging_table, swap_staging_table
 
-def emergency_move_table():
-    
-    try:
-        conn = get_connection()
-
-        cursor = conn.cursor()
+TABLE_NAME = "emergency_move"
+# 적재가 끝난 뒤 한 번만 만드는 인덱스 - (year, move_local) 조회는 UNIQUE 제약의 인덱스를 사용
+INDEXES = []
 
-        create_sql = """
-        CREATE TABLE emergency_move (
+def emergency_move_table():
+    """emergency_move_staging 테이블 생성 (live 테이블은 emergency_move_swap()에서 교체)"""
+    createsql = f"""
+        CREATE TABLE {staging_name(TABLE_NAME)} (
             idx INT AUTO_INCREMENT PRIMARY KEY,
             year YEAR NOT NULL,
             move_count INT,
-            move_local VARCHAR(50) NOT NULL
+            move_local VARCHAR(50) NOT NULL,
+            -- 지역별 연도 데이터는 하나만 (다시 적재하면 INSERT ... ON DUPLICATE KEY UPDATE로 덮어씀)
+            UNIQUE (year, move_local)
         );
         """
+    create_staging_table(TABLE_NAME, createsql)
 
-        cursor.execute("DROP TABLE IF EXISTS emergency_move")
-        cursor.execute(create_sql)
-        conn.commit()
-
-    finally:
-        if conn:
-            cursor.close()
-            conn.close()
+def emergency_move_swap():
+    """적재가 끝난 staging 테이블에 인덱스를 만들고 emergency_move 테이블과 원자적으로 교체"""
+    swap_staging_table(TABLE_NAME, INDEXES)
 
 def move_all():
 
@@ -0,0 +1,84 @@
+import sys
+import os
+
+# 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db_config import get_connection
+
+# 검증(csv_py.validation)에서 걸러진 행을 사유와 함께 보관하는 테이블.
+# staging/교체 대상이 아니며, 적재할 때마다 해당 테이블(source_table)의 이전 기록을 지우고 새로 채운다.
+TABLE_NAME = "ingest_quarantine"
+
+def quarantine_table():
+    """ingest_quarantine 테이블이 없으면 생성 (run.py가 적재 시작 전에 한 번 호출)"""
+    createsql = f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            idx INT AUTO_INCREMENT PRIMARY KEY,
+            source_table VARCHAR(50) NOT NULL,
+            source_file VARCHAR(255),
+            reason VARCHAR(500) NOT NULL,
+            row_data TEXT
+        );
+        """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(createsql)
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
+
+def clear_quarantine(source_table):
+    """source_table의 이전 적재에서 격리된 행 삭제 (적재 시작 시 호출)"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE source_table = %s", (source_table,))
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
+
+def insert_quarantine(source_table, batches):
+    """
+    검증에 실패한 행을 한 번에 격리 테이블에 적재 (적재 트랜잭션이 끝난 뒤 호출)
+
+    Args:
+        source_table: live 테이블명 (예: emergency_car)
+        batches: [(원본 파일 경로, csv_py.validation.validate()가 돌려준 격리 행(reason 컬럼 포함)), ...]
+
+    Returns:
+        int: 격리한 행 수
+    """
+    rows = []
+    for source_file, bad in batches:
+        if bad.empty:
+            continue
+        # 원본 행은 JSON 문자열로 보관 (to_json이 프레임 전체를 한 번에 직렬화)
+        row_data = bad.drop(columns="reason").to_json(orient="records", lines=True, force_ascii=False).splitlines()
+        rows += zip([source_table] * len(bad), [source_file] * len(bad), bad["reason"].tolist(), row_data)
+    if not rows:
+        return 0
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany(
+            f"INSERT INTO {TABLE_NAME} (source_table, source_file, reason, row_data) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
+    return len(rows)
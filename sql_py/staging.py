@@ -0,0 +1,74 @@
+import sys
+import os
+
+# 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db_config import get_connection
+
+# 적재는 {테이블}_staging에 먼저 하고, 끝나면 RENAME TABLE로 한 번에 교체한다.
+# 교체 전까지 대시보드는 기존 테이블을 그대로 읽으므로 빈 테이블을 보는 순간이 없다.
+
+def staging_name(table):
+    return f"{table}_staging"
+
+def _table_exists(cursor, table):
+    try:
+        cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        cursor.fetchall()
+        return True
+    except Exception:
+        return False
+
+def create_staging_table(table, create_sql):
+    """
+    {table}_staging 테이블을 새로 만든다 (live 테이블은 건드리지 않음)
+
+    Args:
+        table: live 테이블명 (예: emergency_car)
+        create_sql: staging 테이블 CREATE 문
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_name(table)}")
+        cursor.execute(create_sql)
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
+
+def swap_staging_table(table, indexes=()):
+    """
+    적재가 끝난 staging 테이블에 인덱스를 만든 뒤 live 테이블과 원자적으로 교체
+
+    Args:
+        table: live 테이블명
+        indexes: [(인덱스명, "컬럼1, 컬럼2"), ...] - 적재 후 한 번만 생성
+    """
+    staging = staging_name(table)
+    old = f"{table}_old"
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # 행 단위 적재 중에는 인덱스를 유지하지 않고, 적재가 끝난 뒤 한 번에 생성
+        for index_name, columns in indexes:
+            cursor.execute(f"CREATE INDEX {index_name} ON {staging} ({columns})")
+
+        cursor.execute(f"DROP TABLE IF EXISTS {old}")
+        if _table_exists(cursor, table):
+            # 두 이름 변경이 하나의 문장이므로 읽는 쪽은 교체 전/후 테이블 중 하나만 본다
+            cursor.execute(f"RENAME TABLE {table} TO {old}, {staging} TO {table}")
+            cursor.execute(f"DROP TABLE {old}")
+        else:
+            cursor.execute(f"RENAME TABLE {staging} TO {table}")
+        conn.commit()
+
+    finally:
+        if conn:
+            cursor.close()
+            conn.close()
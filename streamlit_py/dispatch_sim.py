@@ -0,0 +1,213 @@
+"""
+Monte Carlo 출동 시뮬레이터
+
+emergency_move의 연간 이송 건수를 포아송 호출(λ)로, emergency_car의 구급차 수를 서버 수(c)로,
+사이클 타임을 지수분포 서비스(μ = 1 / 사이클 타임)로 두고 지역별 1년 출동(M/M/c 대기행렬)을 반복 시뮬레이션하여
+대기 시간/대기 확률/가동률의 분포를 구한다.
+
+시간 스텝이나 호출 하나하나를 따라가지 않고, 출동 중 + 대기 중인 호출 수 N(t)의 birth-death 과정을
+상태(레벨)별로 한 번에 뽑는다. (시간 스텝 근사의 편향이 없고, 루프는 시간 스텝 수가 아니라 상태 수만큼만 돈다)
+    - 기준 상태 m(정상 분포의 최빈값)에서 위로 올라가는 횟수 K를 1년 기대값 π_m·λ·1년으로 고정
+    - 상태 n에 들어온 횟수가 주어지면, 아래로 내려가기 전까지 위로 올라가는 횟수는 기하분포의 합(음이항분포)
+      이므로 U_{n+1} ~ NegBin(U_n, 1 - p_{n+1}),  p_n = λ / (λ + min(n, c)μ)  (m 아래쪽도 같은 방식)
+    - 상태 n에 머문 총 시간 T_n ~ Gamma(방문 횟수, 1 / (λ + min(n, c)μ)),  상태 n에서 받은 호출 수 = U_n
+    - 대기 확률 = N ≥ c에서 받은 호출 비율, 평균 대기 = Σ (n - c)⁺ T_n / 호출 수 (Little),
+      가동률 = Σ min(n, c) T_n / (c · Σ T_n)
+한 해를 기준 상태에서 시작하므로(정상 상태) 반복 평균은 Erlang C(queueing.erlang_c)와 일치한다.
+(1년 단위 비율이라 ρ가 1에 가까우면 평균 대기가 1~2% 작게 나올 수 있음, bench_py/dispatch_sim_bench.py로 점검)
+부하가 구급차 수 이상(a ≥ c)인 지역은 대기열이 한 해 동안 계속 길어지므로 유체 근사
+(대기 확률 1, 가동률 1, 평균 대기 = (λ - cμ) · 1년 / 2λ)로 채우고, 구급차가 0대인 지역은 NaN이다.
+
+모든 반복 × 지역을 배열 하나(lane)로 두고 레벨마다 한 번에 뽑으며, 더 올라가거나 내려가지 않는 lane은 빼고 진행한다.
+반복 수가 PARALLEL_MIN_REPLICATIONS 이상이면 반복 묶음(chunk)을 프로세스 풀에 나눠 보낸다. 묶음마다 SeedSequence.spawn으로 만든 독립 난수열을 쓰므로
+작업자 수와 상관없이 같은 seed면 같은 결과가 나온다. 묶음이 끝날 때마다 중간 백분위수를 돌려준다(스트리밍).
+"""
+import os
+import math
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+HOURS_PER_YEAR = 365 * 24
+# 한 작업 단위(프로세스에 보내는 묶음)의 반복 수 - 결과 재현성을 위해 작업자 수와 무관하게 고정
+CHUNK_REPLICATIONS = 250
+# 프로세스 풀을 쓰는 최소 반복 수 (이보다 적으면 spawn 비용이 계산 시간보다 큼)
+PARALLEL_MIN_REPLICATIONS = 20000
+
+PERCENTILES = (5, 50, 95)
+
+
+def _base_state(lam, mu, servers):
+    """
+    안정 지역(a < c)의 기준 상태 m(정상 분포 최빈값)과 1년 동안 m에서 위로 올라가는 기대 횟수
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (m, K) 각각 (R,) 정수
+    """
+    base = np.zeros(len(lam), dtype=np.int64)
+    crossings = np.zeros(len(lam), dtype=np.int64)
+    for r, (l, u, c) in enumerate(zip(lam, mu, servers)):
+        a = l / u
+        if l <= 0 or c <= a:
+            continue
+        # log π_n (정규화 전): n < c는 a^n / n!, n ≥ c는 π_c ρ^(n-c)의 등비 꼬리
+        n = np.arange(c + 1)
+        log_p = n * math.log(a) - np.array([math.lgamma(k + 1) for k in n])
+        rho = a / c
+        log_tail = log_p[c] - math.log1p(-rho)
+        log_terms = np.append(log_p[:c], log_tail)
+        top = log_terms.max()
+        log_norm = top + math.log(np.exp(log_terms - top).sum())
+        m = min(int(a), int(c) - 1)
+        base[r] = m
+        crossings[r] = max(1, int(round(math.exp(log_p[m] - log_norm) * l * HOURS_PER_YEAR)))
+    return base, crossings
+
+
+def _negative_binomial(rng, count, p):
+    """count번 성공할 때까지의 실패 수 (count = 0이면 0)"""
+    out = np.zeros(len(count), dtype=np.int64)
+    live = count > 0
+    if live.any():
+        out[live] = rng.negative_binomial(count[live], p[live])
+    return out
+
+
+def simulate_chunk(calls_per_year, fleet, cycle_hours, replications, seed):
+    """
+    반복 묶음 하나를 시뮬레이션 (프로세스 풀 작업 단위)
+
+    Args:
+        calls_per_year: 지역별 연간 호출 수 (R,)
+        fleet: 지역별 구급차 수 (R,)
+        cycle_hours: 지역별 평균 사이클 타임 (R,)
+        replications: 이 묶음의 반복 수
+        seed: np.random.SeedSequence
+
+    Returns:
+        dict[str, np.ndarray]: mean_wait_min, wait_prob, utilization 각각 (replications, R)
+    """
+    rng = np.random.default_rng(seed)
+    calls = np.asarray(calls_per_year, dtype=float)
+    servers = np.asarray(fleet, dtype=np.int64)
+    lam = calls / HOURS_PER_YEAR
+    mu = 1.0 / np.asarray(cycle_hours, dtype=float)
+    base, crossings = _base_state(lam, mu, servers)
+
+    # lane = (반복, 지역)을 펼친 1차원 배열
+    region = np.tile(np.arange(len(calls)), replications)
+    lanes = len(region)
+    arrivals = np.zeros(lanes)
+    waited = np.zeros(lanes)
+    total_hours = np.zeros(lanes)
+    busy_hours = np.zeros(lanes)
+    queue_hours = np.zeros(lanes)
+
+    def visit(idx, n, ups, downs):
+        """lane idx가 상태 n에서 위로 ups번, 아래로 downs번 움직였을 때의 호출 수/체류 시간 누적"""
+        r = region[idx]
+        c = servers[r]
+        hours = rng.gamma(ups + downs, 1.0 / (lam[r] + np.minimum(n, c) * mu[r]))
+        arrivals[idx] += ups
+        waited[idx] += np.where(n >= c, ups, 0)
+        total_hours[idx] += hours
+        busy_hours[idx] += np.minimum(n, c) * hours
+        queue_hours[idx] += np.maximum(n - c, 0) * hours
+
+    def up_prob(r, n):
+        return lam[r] / (lam[r] + np.minimum(n, servers[r]) * mu[r])
+
+    # 기준 상태 m과 그 아래: 위로 U_n번 올라가는 사이 아래로 내려가는 횟수 D_n ~ NegBin(U_n, p_n), U_{n-1} = D_n
+    idx = np.flatnonzero(crossings[region] > 0)
+    n = base[region[idx]]
+    ups = crossings[region[idx]]
+    while len(idx):
+        downs = _negative_binomial(rng, ups, up_prob(region[idx], n))
+        visit(idx, n, ups, downs)
+        keep = downs > 0
+        idx, n, ups = idx[keep], n[keep] - 1, downs[keep]
+
+    # 기준 상태 위: 아래에서 들어온 D_n = U_{n-1}번마다 위로 올라가는 횟수 U_n ~ NegBin(U_{n-1}, 1 - p_n)
+    idx = np.flatnonzero(crossings[region] > 0)
+    n = base[region[idx]] + 1
+    downs = crossings[region[idx]]
+    while len(idx):
+        ups = _negative_binomial(rng, downs, 1 - up_prob(region[idx], n))
+        visit(idx, n, ups, downs)
+        keep = ups > 0
+        idx, n, downs = idx[keep], n[keep] + 1, ups[keep]
+
+    shape = (replications, len(calls))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = {
+            "mean_wait_min": (queue_hours / arrivals * 60).reshape(shape),
+            "wait_prob": (waited / arrivals).reshape(shape),
+            "utilization": (busy_hours / (servers[region] * total_hours)).reshape(shape),
+        }
+        # 과부하 지역(a ≥ c > 0): 대기열이 1년 내내 (λ - cμ)의 속도로 길어지는 유체 근사
+        overload = (servers > 0) & (lam >= servers * mu) & (lam > 0)
+        result["mean_wait_min"][:, overload] = ((lam - servers * mu) * HOURS_PER_YEAR / (2 * lam) * 60)[overload]
+        result["wait_prob"][:, overload] = 1.0
+        result["utilization"][:, overload] = 1.0
+        # 호출이 없는 지역은 대기 없음, 가동률 0
+        idle = (lam <= 0) & (servers > 0)
+        result["utilization"][:, idle] = 0.0
+    return result
+
+
+def _summarize(regions, results):
+    """반복 결과를 지역별 백분위수 표로 (반복 방향 백분위수)"""
+    rows = {"지역": regions, "반복 수": len(results["utilization"])}
+    labels = {"mean_wait_min": "평균 대기(분)", "wait_prob": "대기 확률", "utilization": "가동률"}
+    for key, label in labels.items():
+        values = results[key]
+        with warnings.catch_warnings():
+            # 구급차가 0대인 지역은 모든 반복이 NaN (All-NaN slice 경고)
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for p in PERCENTILES:
+                rows[f"{label} P{p}"] = np.nanpercentile(values, p, axis=0)
+    return pd.DataFrame(rows)
+
+
+def run_simulation(regions, calls_per_year, fleet, cycle_hours, replications=1000, seed=0, workers=None):
+    """
+    전체 반복을 묶음으로 나눠 실행하고, 묶음이 끝날 때마다 중간 결과를 yield
+
+    반복 수가 PARALLEL_MIN_REPLICATIONS 이상일 때만 프로세스 풀에 나눠 보낸다.
+    구급차가 0대인 지역은 대기열이 무한히 길어지므로 결과가 NaN이 된다.
+
+    Yields:
+        tuple[int, pd.DataFrame]: (지금까지 끝난 반복 수, 지역별 백분위수 표)
+    """
+    chunks = [CHUNK_REPLICATIONS] * (replications // CHUNK_REPLICATIONS)
+    if replications % CHUNK_REPLICATIONS:
+        chunks.append(replications % CHUNK_REPLICATIONS)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = (np.asarray(calls_per_year, dtype=float), np.asarray(fleet), np.asarray(cycle_hours, dtype=float))
+
+    if workers is None:
+        workers = os.cpu_count() or 1 if replications >= PARALLEL_MIN_REPLICATIONS else 1
+    workers = min(workers, len(chunks))
+    done = {}
+
+    def merged():
+        ordered = [done[i] for i in sorted(done)]
+        return {key: np.concatenate([r[key] for r in ordered]) for key in ordered[0]}
+
+    if workers <= 1:
+        for i, (n, s) in enumerate(zip(chunks, seeds)):
+            done[i] = simulate_chunk(*args, n, s)
+            yield sum(chunks[j] for j in done), _summarize(regions, merged())
+        return
+
+    # Streamlit 서버는 여러 스레드를 쓰므로 fork 대신 spawn으로 작업 프로세스를 만든다
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {pool.submit(simulate_chunk, *args, n, s): i
+                   for i, (n, s) in enumerate(zip(chunks, seeds))}
+        for future in as_completed(futures):
+            done[futures[future]] = future.result()
+            yield sum(chunks[j] for j in done), _summarize(regions, merged())
@@ -0,0 +1,119 @@
+"""
+지역별 이송 건수(move_count) 추세 예측
+
+emergency_move는 연 단위 데이터(2019~2023)라 계절 성분은 없고, 지역마다 연도 추세만 맞춘다.
+지역 × 연도 배열 전체에 가중 최소제곱 닫힌 식을 한 번에 적용하므로 지역 수만큼 반복문을 돌지 않는다.
+(데이터가 없는 칸은 가중치 0)
+
+    linear: 이송 건수 = a + b · (연도 - 평균 연도)
+    log:    log(이송 건수) = a + b · (연도 - 평균 연도)   (매년 일정 비율로 증가/감소)
+
+적합한 계수는 적재 세대(utils.ingest_generation)별로 캐시하므로, 데이터가 바뀌기 전까지
+페이지를 다시 열어도 다시 적합하지 않는다. 예측값은 scenario.Panel로 돌려주어
+scenario.evaluate로 미래 연도의 필요 구급차 수를 그대로 계산할 수 있다.
+"""
+import threading
+
+import numpy as np
+
+from scenario import Panel
+from utils import ingest_generation
+
+MODELS = ("linear", "log")
+
+# (적재 세대, 모델, 지역, 연도) -> 적합 계수
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class TrendFit:
+    """
+    지역별 추세 계수
+
+    Attributes:
+        model: "linear" 또는 "log"
+        regions: 지역 이름 배열 (R,)
+        center: 기준 연도 (지역별 관측 연도 평균) (R,)
+        intercept, slope: 기준 연도에서의 값과 연간 변화량 (R,) - log 모델이면 로그 척도
+        resid_std: 잔차 표준편차 (R,) - 관측이 2개 이하면 NaN
+    """
+
+    def __init__(self, model, regions, center, intercept, slope, resid_std):
+        self.model = model
+        self.regions = regions
+        self.center = center
+        self.intercept = intercept
+        self.slope = slope
+        self.resid_std = resid_std
+
+    def predict(self, years):
+        """연도 배열 (F,)의 예측 이송 건수 (R, F)"""
+        x = np.asarray(years, dtype=float)[None, :] - self.center[:, None]
+        value = self.intercept[:, None] + self.slope[:, None] * x
+        if self.model == "log":
+            value = np.exp(value)
+        return np.maximum(value, 0.0)
+
+
+def fit_trend(years, calls, model="linear"):
+    """
+    모든 지역의 추세를 한 번에 적합
+
+    Args:
+        years: 연도 배열 (Y,)
+        calls: 이송 건수 (R, Y) - 데이터가 없는 칸은 NaN
+        model: "linear" 또는 "log"
+
+    Returns:
+        tuple: (center, intercept, slope, resid_std) 각각 (R,)
+    """
+    if model not in MODELS:
+        raise ValueError(f"지원하지 않는 예측 모델: {model} ({' / '.join(MODELS)})")
+    x = np.asarray(years, dtype=float)[None, :]
+    y = np.asarray(calls, dtype=float)
+    weight = np.isfinite(y) & ((y > 0) if model == "log" else True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(weight, np.log(y) if model == "log" else y, 0.0)
+        w = weight.astype(float)
+        n = w.sum(axis=1)
+        center = (w * x).sum(axis=1) / n
+        dx = np.where(weight, x - center[:, None], 0.0)
+        intercept = (w * y).sum(axis=1) / n
+        sxx = (dx * dx).sum(axis=1)
+        # 관측이 1개뿐이면 기울기 0 (마지막 값 유지)
+        slope = np.where(sxx > 0, (dx * (y - intercept[:, None])).sum(axis=1) / sxx, 0.0)
+        resid = np.where(weight, y - intercept[:, None] - slope[:, None] * dx, 0.0)
+        resid_std = np.where(n > 2, np.sqrt((resid * resid).sum(axis=1) / (n - 2)), np.nan)
+    return center, np.nan_to_num(intercept), slope, resid_std
+
+
+def get_fit(panel, model="linear"):
+    """panel의 추세 계수 (같은 적재 세대/모델/지역/연도면 캐시에서 반환)"""
+    generation = ingest_generation()
+    # 적재 기록이 없으면(개발용 DB 등) 데이터 자체를 키로 사용
+    data_key = generation if generation is not None else np.nan_to_num(panel.calls).tobytes()
+    key = (data_key, model, tuple(panel.regions), tuple(panel.years))
+    with _cache_lock:
+        fit = _cache.get(key)
+    if fit is None:
+        fit = TrendFit(model, panel.regions, *fit_trend(panel.years, panel.calls, model))
+        with _cache_lock:
+            if generation is not None:
+                # 이전 세대 계수 정리
+                for old in [k for k in _cache if k[0] != generation]:
+                    del _cache[old]
+            _cache[key] = fit
+    return fit
+
+
+def forecast_panel(panel, horizon=3, model="linear"):
+    """
+    마지막 관측 연도 이후 horizon년의 예측 이송 건수를 Panel로 반환
+
+    구급차 수는 마지막 관측 연도 값을 그대로 둔다 (현재 보유 대수 대비 과부족 계산용).
+    """
+    last = int(np.max(panel.years))
+    future = np.arange(last + 1, last + 1 + horizon)
+    calls = get_fit(panel, model).predict(future)
+    fleet = np.repeat(panel.fleet[:, [int(np.argmax(panel.years))]], horizon, axis=1)
+    return Panel(panel.regions, future, np.round(calls), fleet)
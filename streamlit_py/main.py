@@ -1,13 +1,9 @@
 import os
 import sys
+import importlib
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-from datetime import datetime
 # run 모듈은 제거 - 별도로 실행
+# pandas/plotly 등 무거운 패키지와 페이지 모듈은 해당 페이지로 처음 이동할 때 import 합니다.
 
 # === 0) 모듈 경로 보정 ===
 import os, sys
@@ -18,6 +14,18 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 if _CRAWLING_PATH not in sys.path:
     sys.path.insert(0, _CRAWLING_PATH)
+if _THIS_DIR not in sys.path:
+    sys.path.insert(0, _THIS_DIR)
+
+from db_config import start_query_log, query_page, summarize_queries
+from profiling import profiling_enabled, profile_rerun, recent_profiles
+import metrics
+
+# run.py가 넘긴 EMERGENCY_METRICS_PORT로 Prometheus 메트릭 서버를 띄움 (프로세스당 한 번, 포트가 없으면 무시)
+metrics.start_server()
+
+# rerun 한 번에 허용하는 쿼리 수 (디버그 패널에서 초과 여부 표시)
+QUERY_BUDGET = int(os.environ.get("EMERGENCY_QUERY_BUDGET", "10"))
 
 # === 1) Page config는 스트림릿 명령어 중 가장 먼저 호출 ===
 st.set_page_config(
@@ -30,15 +38,14 @@ st.set_page_config(
 # 오류 메시지는 먼저 모아두었다가 UI 로딩 후 표시
 _pending_errors: list[str] = []
 
-# === 2) 유틸리티 함수 import (실패해도 앱이 죽지 않도록) ===
-try:
-    from utils import create_sample_data, calculate_required_ambulances
-except Exception as e:
-    _pending_errors.append(f"utils 모듈을 찾을 수 없습니다: {e}")
-    create_sample_data = None
-    calculate_required_ambulances = None
+# === 2) 페이지 모듈 지연 로딩 ===
+# 메뉴 이름 -> (모듈 경로, 모듈 이름). 처음 선택될 때만 import 하고 이후에는 sys.modules 캐시를 사용
+PAGE_MODULES = {
+    "🏥 응급의료시스템 개요": ("crawling_py.page_modules.overview", "overview"),
+    "📊 데이터 및 수요 분석": ("crawling_py.page_modules.analysis", "analysis"),
+    "❓ 자주 묻는 질문": ("crawling_py.page_modules.faq", "faq"),
+}
 
-# === 3) 페이지 모듈 안전 로딩 ===
 def _pick_func(mod, names):
     for n in names:
         fn = getattr(mod, n, None)
@@ -46,35 +53,26 @@ def _pick_func(mod, names):
             return fn
     return None
 
-show_overview_page = None
-show_analysis_page = None
-show_faq_page = None
-
-try:
-    import crawling_py.page_modules.overview as _ov
-    show_overview_page = _pick_func(_ov, ["show_overview_page", "show_page", "main"])
-    if show_overview_page is None:
-        _pending_errors.append("overview 모듈에서 호출 가능한 함수(show_overview_page/show_page/main)를 찾지 못했습니다.")
-except Exception as e:
-    _pending_errors.append(f"페이지 모듈 로드 오류(overview): {e}")
-
-try:
-    import crawling_py.page_modules.analysis as _an
-    show_analysis_page = _pick_func(_an, ["show_analysis_page", "show_page", "main"])
-    if show_analysis_page is None:
-        _pending_errors.append("analysis 모듈에서 호출 가능한 함수(show_analysis_page/show_page/main)를 찾지 못했습니다.")
-except Exception as e:
-    _pending_errors.append(f"페이지 모듈 로드 오류(analysis): {e}")
-
-try:
-    import crawling_py.page_modules.faq as _fq
-    show_faq_page = _pick_func(_fq, ["show_faq_page", "show_page", "main"])
-    if show_faq_page is None:
-        _pending_errors.append("faq 모듈에서 호출 가능한 함수(show_faq_page/show_page/main)를 찾지 못했습니다.")
-except Exception as e:
-    _pending_errors.append(f"페이지 모듈 로드 오류(faq): {e}")
-
-# === 4) CSS ===
+def _load_page(page):
+    """
+    페이지 모듈을 import 하여 화면 함수를 반환 (실패해도 앱이 죽지 않도록 오류를 기록)
+
+    Returns:
+        callable | None: show_xxx_page 함수
+    """
+    module_path, name = PAGE_MODULES[page]
+    try:
+        mod = importlib.import_module(module_path)
+    except Exception as e:
+        _pending_errors.append(f"페이지 모듈 로드 오류({name}): {e}")
+        return None
+
+    fn = _pick_func(mod, [f"show_{name}_page", "show_page", "main"])
+    if fn is None:
+        _pending_errors.append(f"{name} 모듈에서 호출 가능한 함수(show_{name}_page/show_page/main)를 찾지 못했습니다.")
+    return fn
+
+# === 3) CSS ===
 st.markdown("""
 <style>
     .section-header {
@@ -147,13 +145,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# === 5) 메인 앱 ===
+# === 4) 쿼리 디버그 패널 (?debug=1 또는 EMERGENCY_DEBUG=1 일 때만 표시) ===
+def _debug_enabled():
+    return os.environ.get("EMERGENCY_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
+def _show_query_debug_panel(query_log):
+    import pandas as pd
+
+    total_seconds = sum(q["seconds"] for q in query_log)
+    total_rows = sum(q["rows"] for q in query_log)
+    total_bytes = sum(q["bytes"] for q in query_log)
+
+    with st.sidebar.expander("🐞 쿼리 디버그", expanded=False):
+        c1, c2 = st.columns(2)
+        c1.metric("쿼리 수", f"{len(query_log)}/{QUERY_BUDGET}")
+        c2.metric("DB 시간", f"{total_seconds * 1000:,.0f}ms")
+        c1.metric("행 수", f"{total_rows:,}")
+        c2.metric("전송량", f"{total_bytes / 1024:,.1f}KB")
+
+        if len(query_log) > QUERY_BUDGET:
+            st.warning(f"이번 rerun에서 쿼리 예산({QUERY_BUDGET}개)을 초과했습니다.")
+
+        summary = pd.DataFrame(summarize_queries(query_log))
+        if not summary.empty:
+            repeated = summary[summary["count"] > 1]
+            if not repeated.empty:
+                st.warning(f"같은 쿼리가 반복 실행되었습니다 (N+1 의심): {', '.join(repeated['caller'].unique())}")
+            summary["ms"] = (summary["seconds"] * 1000).round(1)
+            st.dataframe(summary[["page", "caller", "count", "ms", "rows", "bytes", "sql"]],
+                         hide_index=True, use_container_width=True)
+
+# === 5) 프로파일 패널 (?profile=1 또는 EMERGENCY_PROFILE=1 일 때만 표시) ===
+def _show_profile_panel():
+    import pandas as pd
+
+    profiles = recent_profiles()
+    with st.sidebar.expander("⏱️ rerun 프로파일", expanded=False):
+        st.caption("이 세션의 rerun만 표시합니다.")
+        if not profiles:
+            st.caption("아직 기록된 프로파일이 없습니다.")
+            return
+        labels = [p.label() for p in profiles]
+        chosen = profiles[labels.index(st.selectbox("rerun (최신 순)", labels, key="profile_pick"))]
+
+        c1, c2 = st.columns(2)
+        c1.metric("rerun 시간", f"{chosen.wall_seconds * 1000:,.0f}ms")
+        c2.metric("샘플 수", f"{chosen.samples:,}")
+
+        top = pd.DataFrame(chosen.top_functions())
+        if not top.empty:
+            st.dataframe(top, hide_index=True, use_container_width=True)
+        st.download_button("🔥 플레임그래프(folded) 내려받기", chosen.folded(),
+                           file_name=f"rerun_{chosen.started:%Y%m%d_%H%M%S}.folded", mime="text/plain",
+                           key="profile_download")
+
+# === 6) 메인 앱 ===
 def main():
     # 데이터베이스 설정은 streamlit 실행 전에 별도로 처리됩니다.
-    
-    # (로딩 중 쌓인 에러 메시지 출력)
-    for msg in _pending_errors:
-        st.warning(msg)
+    query_log = start_query_log()
+    _pending_errors.clear()
 
     st.sidebar.title("📊 PT 순서")
 
@@ -161,7 +211,7 @@ def main():
     if "current_page" not in st.session_state:
         st.session_state.current_page = "🏥 응급의료시스템 개요"
 
-    menu_options = ["🏥 응급의료시스템 개요", "📊 데이터 및 수요 분석", "❓ 자주 묻는 질문"]
+    menu_options = list(PAGE_MODULES)
 
     for option in menu_options:
         if option == st.session_state.current_page:
@@ -172,28 +222,30 @@ def main():
                 st.rerun()
 
     page = st.session_state.current_page
-
-    try:
-        if page == "🏥 응급의료시스템 개요":
-            if callable(show_overview_page):
-                show_overview_page()
-            else:
-                st.error("페이지를 로드하는 중 오류가 발생했습니다: name 'show_overview_page' is not defined")
-
-        elif page == "📊 데이터 및 수요 분석":
-            if callable(show_analysis_page):
-                show_analysis_page()
-            else:
-                st.error("페이지를 로드하는 중 오류가 발생했습니다: name 'show_analysis_page' is not defined")
-
-        elif page == "❓ 자주 묻는 질문":
-            if callable(show_faq_page):
-                show_faq_page()
-            else:
-                st.error("페이지를 로드하는 중 오류가 발생했습니다: name 'show_faq_page' is not defined")
-
-    except Exception as e:
-        st.error(f"페이지를 표시하는 중 오류가 발생했습니다: {e}")
+    profiling = profiling_enabled()
+
+    # 페이지 모듈 import(첫 방문)부터 렌더링까지를 하나의 프로파일로 기록
+    with profile_rerun(page, enabled=profiling):
+        show_page = _load_page(page)
+
+        # (로딩 중 쌓인 에러 메시지 출력)
+        for msg in _pending_errors:
+            st.warning(msg)
+
+        try:
+            with query_page(page):
+                if callable(show_page):
+                    show_page()
+                else:
+                    st.error(f"페이지를 로드하는 중 오류가 발생했습니다: {PAGE_MODULES[page][1]} 페이지 함수를 찾을 수 없습니다")
+
+        except Exception as e:
+            st.error(f"페이지를 표시하는 중 오류가 발생했습니다: {e}")
+
+    if _debug_enabled():
+        _show_query_debug_panel(query_log)
+    if profiling:
+        _show_profile_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+rerun 단위 프로파일링 (?profile=1 또는 EMERGENCY_PROFILE=1 일 때만)
+
+main.main()이 페이지를 그리는 동안 별도 스레드가 스크립트 스레드의 호출 스택을 일정 간격으로 수집(sampling)한다.
+cProfile처럼 모든 호출을 가로채지 않으므로 운영 중에도 켤 수 있고, 여러 세션이 동시에 켜도 서로 간섭하지 않는다.
+
+수집한 스택은 rerun마다 RerunProfile 하나로 만들어 세션별 링 버퍼(st.session_state, 최근 PROFILE_RING_SIZE개)에 보관한다.
+사이드바의 프로파일 패널은 자기 세션의 rerun 중 선택한 것의 상위 함수(자체/누적 시간)와 folded 스택 파일을 보여준다.
+(다른 방문자의 rerun, 페이지 이름은 보이지 않으며 세션이 끝나면 함께 사라진다)
+folded 파일(한 줄에 "바깥;...;안쪽 샘플수")은 speedscope, flamegraph.pl 등으로 바로 플레임그래프를 그릴 수 있다.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_INTERVAL_SECONDS = float(os.environ.get("EMERGENCY_PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_RING_SIZE = int(os.environ.get("EMERGENCY_PROFILE_RING", "20"))
+
+_RING_KEY = "_rerun_profiles"
+
+
+class RerunProfile:
+    """
+    rerun 한 번의 샘플링 결과
+
+    Attributes:
+        started: 시작 시각
+        page: 페이지 이름
+        wall_seconds: rerun 소요 시간
+        interval: 샘플링 간격(초)
+        stacks: {"바깥;...;안쪽" 프레임 문자열: 샘플 수}
+    """
+
+    def __init__(self, started, page, wall_seconds, interval, stacks):
+        self.started = started
+        self.page = page
+        self.wall_seconds = wall_seconds
+        self.interval = interval
+        self.stacks = stacks
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def label(self):
+        return f"{self.started:%H:%M:%S} · {self.page} · {self.wall_seconds * 1000:,.0f}ms"
+
+    def top_functions(self, limit=30):
+        """
+        함수별 자체(self)/누적(inclusive) 샘플을 누적 순으로
+
+        Returns:
+            list[dict]: function, self_ms, total_ms, self_pct, total_pct
+        """
+        total = self.samples
+        if not total:
+            return []
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        # 샘플 비율을 실제 rerun 시간에 나눠 ms로 환산
+        ms_per_sample = self.wall_seconds * 1000 / total
+        return [{
+            "function": frame,
+            "self_ms": round(own[frame] * ms_per_sample, 1),
+            "total_ms": round(count * ms_per_sample, 1),
+            "self_pct": round(own[frame] / total * 100, 1),
+            "total_pct": round(count / total * 100, 1),
+        } for frame, count in inclusive.most_common(limit)]
+
+    def folded(self):
+        """플레임그래프용 folded 스택 텍스트"""
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.stacks.items())) + "\n"
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class _Sampler(threading.Thread):
+    """대상 스레드의 스택을 interval마다 수집 (base_frames에 있는 바깥 프레임(Streamlit 실행기)은 제외)"""
+
+    def __init__(self, thread_id, base_frames, interval):
+        super().__init__(name="rerun-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.base_frames = base_frames
+        self.interval = interval
+        self.stacks = Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None and id(frame) not in self.base_frames:
+                frames.append(_frame_label(frame))
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+def _session_ring():
+    """현재 세션의 링 버퍼 (없으면 만든다)"""
+    import streamlit as st
+
+    if _RING_KEY not in st.session_state:
+        st.session_state[_RING_KEY] = deque(maxlen=PROFILE_RING_SIZE)
+    return st.session_state[_RING_KEY]
+
+
+def profiling_enabled():
+    import streamlit as st
+
+    return os.environ.get("EMERGENCY_PROFILE") == "1" or st.query_params.get("profile") == "1"
+
+
+@contextmanager
+def profile_rerun(page, enabled=True):
+    """with 블록(페이지 로드 + 렌더링)을 샘플링해 현재 세션의 링 버퍼에 추가 (enabled=False면 아무것도 하지 않음)"""
+    if not enabled:
+        yield
+        return
+
+    # 이 시점의 호출 스택(Streamlit 실행기 ~ with 문)은 매 샘플에서 잘라낸다
+    base_frames = set()
+    frame = sys._getframe(2)
+    while frame is not None:
+        base_frames.add(id(frame))
+        frame = frame.f_back
+
+    sampler = _Sampler(threading.get_ident(), base_frames, PROFILE_INTERVAL_SECONDS)
+    started = datetime.now()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.done.set()
+        sampler.join()
+        profile = RerunProfile(started, page, time.perf_counter() - start, PROFILE_INTERVAL_SECONDS, sampler.stacks)
+        _session_ring().append(profile)
+
+
+def recent_profiles():
+    """현재 세션의 최근 프로파일 (최신 순)"""
+    return list(reversed(_session_ring()))
@@ -0,0 +1,133 @@
+"""
+Erlang C (M/M/c 대기행렬) 기반 필요 구급차 수 계산
+
+utils.required_ambulances는 호출량 × 사이클 타임 / 목표 가동률의 단순 비율이라 출동 대기를 고려하지 않는다.
+여기서는 호출을 포아송 도착(λ, 시간당), 출동 1건의 사이클 타임을 지수분포 서비스(μ = 1 / 사이클 타임)로 보고
+"호출이 대기할 확률" 또는 "t시간 넘게 대기할 확률"이 목표 이하가 되는 최소 구급차 수 c를 구한다.
+
+    P(대기) = Erlang C(c, a),  a = λ / μ (제공 부하, Erlang)
+    P(대기 > t) = P(대기) · exp(-(cμ - λ) t)
+
+Erlang C는 팩토리얼/거듭제곱을 직접 계산하면 부하가 수백 Erlang일 때 overflow 되므로,
+Erlang B 점화식 B(c) = a·B(c-1) / (c + a·B(c-1))로 0~1 사이 값만 다루고 C = c·B / (c - a(1 - B))로 변환한다.
+여러 지역/연도/시나리오의 부하를 배열 하나로 받아 c를 1씩 늘리며 동시에 계산한다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+HOURS_PER_YEAR = 365 * 24
+
+# 보관할 (입력 -> 최소 구급차 수) 항목 수. 슬라이더/예측값마다 새 키가 생기므로 오래 안 쓴 것부터 제거
+SERVER_CACHE_SIZE = 65536
+
+# (λ, μ, 목표 대기확률, 대기 시간) -> 최소 구급차 수
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _key(lam, mu, max_wait_prob, wait_hours):
+    # 부동소수 오차로 같은 입력이 다른 키가 되지 않도록 반올림
+    return (round(float(lam), 9), round(float(mu), 9), round(float(max_wait_prob), 9), round(float(wait_hours), 9))
+
+
+def _solve(lam, mu, max_wait_prob, wait_hours):
+    """
+    캐시에 없는 입력들에 대해 최소 구급차 수를 한 번에 계산 (모두 같은 길이의 1차원 배열)
+    """
+    load = lam / mu
+    result = np.zeros(len(load), dtype=np.int64)
+    pending = load > 0                      # 호출이 없으면 0대
+    erlang_b = np.ones(len(load))           # B(0) = 1
+
+    c = 0
+    while pending.any():
+        c += 1
+        erlang_b = load * erlang_b / (c + load * erlang_b)
+        stable = c > load                   # c <= a 이면 대기열이 무한히 길어짐
+        with np.errstate(divide="ignore", invalid="ignore"):
+            erlang_c = np.where(stable, c * erlang_b / (c - load * (1 - erlang_b)), 1.0)
+            wait_prob = erlang_c * np.exp(-np.maximum(c * mu - lam, 0) * wait_hours)
+        met = pending & stable & (wait_prob <= max_wait_prob)
+        result[met] = c
+        pending &= ~met
+    return result
+
+
+def min_servers(calls_per_year, avg_cycle_time_hours, max_wait_prob=0.2, wait_hours=0.0):
+    """
+    대기 확률 목표를 만족하는 최소 구급차 수 (배열 입력 가능, NumPy 브로드캐스팅)
+
+    Args:
+        calls_per_year: 연간 호출 수
+        avg_cycle_time_hours: 평균 사이클 타임 (시간)
+        max_wait_prob: 허용하는 대기 확률 (0.2 = 호출의 20%까지 대기 허용)
+        wait_hours: 0이면 P(대기) 기준, 0보다 크면 P(대기 > wait_hours) 기준 (응답시간 SLA)
+
+    Returns:
+        np.ndarray: 입력을 브로드캐스팅한 모양의 최소 구급차 수 (정수)
+    """
+    calls, cycle, target, wait = np.broadcast_arrays(
+        np.asarray(calls_per_year, dtype=float), np.asarray(avg_cycle_time_hours, dtype=float),
+        np.asarray(max_wait_prob, dtype=float), np.asarray(wait_hours, dtype=float))
+    lam = (calls / HOURS_PER_YEAR).ravel()
+    mu = (1.0 / cycle).ravel()
+    # 대기 시간 0에서 목표 0은 어떤 c로도 만족할 수 없으므로 하한을 둔다
+    target = np.clip(target.ravel(), 1e-6, 1.0)
+    wait = wait.ravel()
+
+    # 같은 (λ, μ, 목표)는 한 번만 계산하고 이후 호출(슬라이더 재조작 등)은 캐시에서 가져온다
+    keys = [_key(*k) for k in zip(lam, mu, target, wait)]
+    result = np.empty(len(keys), dtype=np.int64)
+    missing = {}
+    with _cache_lock:
+        for i, key in enumerate(keys):
+            cached = _cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                _cache.move_to_end(key)
+                result[i] = cached
+
+    if missing:
+        first = [idx[0] for idx in missing.values()]
+        solved = _solve(lam[first], mu[first], target[first], wait[first])
+        with _cache_lock:
+            for (key, idx), value in zip(missing.items(), solved):
+                _cache[key] = int(value)
+                result[idx] = value
+            while len(_cache) > SERVER_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    return result.reshape(calls.shape)
+
+
+def erlang_c(calls_per_year, avg_cycle_time_hours, servers):
+    """
+    구급차 수가 정해져 있을 때의 정상 상태 대기 지표 (배열 입력 가능, NumPy 브로드캐스팅)
+
+    Args:
+        calls_per_year: 연간 호출 수
+        avg_cycle_time_hours: 평균 사이클 타임 (시간)
+        servers: 구급차 수
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (P(대기), 평균 대기 시간(시간)). c <= a이면 (1, inf)
+    """
+    calls, cycle, servers = np.broadcast_arrays(
+        np.asarray(calls_per_year, dtype=float), np.asarray(avg_cycle_time_hours, dtype=float),
+        np.asarray(servers, dtype=np.int64))
+    lam = (calls / HOURS_PER_YEAR).ravel()
+    mu = (1.0 / cycle).ravel()
+    c = servers.ravel()
+    load = lam / mu
+
+    erlang_b = np.ones(len(load))
+    for k in range(1, int(c.max(initial=0)) + 1):
+        erlang_b = np.where(k <= c, load * erlang_b / (k + load * erlang_b), erlang_b)
+    stable = c > load
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wait_prob = np.where(stable, c * erlang_b / (c - load * (1 - erlang_b)), 1.0)
+        mean_wait = np.where(stable, wait_prob / (c * mu - lam), np.inf)
+    return wait_prob.reshape(calls.shape), mean_wait.reshape(calls.shape)
@@ -0,0 +1,192 @@
+"""
+전국 구급차 재배치 최적화
+
+지역별 과부족(필요 - 현재, 양수면 부족)을 받아, 전국 구급차 총수는 그대로 둔 채
+여유 지역에서 부족 지역으로 옮기는 대수를 이동 비용(거리 km × 대수)이 작도록 정한다.
+
+여유 지역 × 부족 지역의 모든 (비용, 보내는 곳, 받는 곳) 간선을 힙에 넣고 가장 싼 간선부터
+min(남은 여유, 남은 부족)만큼 배정하는 탐욕법(최소 비용 우선 배정)을 쓴다.
+간선 수는 여유 × 부족 지역 수이므로 시군구 단위 수백 개 지점도 한 번에 힙을 만들어 1초 안에 끝난다.
+(최적해와의 차이는 보통 몇 % 이내이며, 최근에 계산한 같은 입력은 _cache에서 바로 돌려준다)
+
+시도 17개는 REGION_CENTROIDS의 대표 좌표로 거리를 계산하고, 시군구처럼 더 작은 단위는
+EMERGENCY_REGION_COORDS 좌표 파일(CSV: 지역, 위도, 경도)로 좌표를 더하거나 비용 행렬을 직접 넘긴다.
+좌표가 없는 지점은 has_coordinates()로 걸러 재배치에서 제외한다.
+"""
+import os
+import csv
+import heapq
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 시도청 소재지 기준 대표 좌표 (위도, 경도)
+REGION_CENTROIDS = {
+    "서울": (37.5665, 126.9780),
+    "부산": (35.1796, 129.0756),
+    "대구": (35.8714, 128.6014),
+    "인천": (37.4563, 126.7052),
+    "광주": (35.1595, 126.8526),
+    "대전": (36.3504, 127.3845),
+    "울산": (35.5384, 129.3114),
+    "세종": (36.4800, 127.2890),
+    "경기": (37.2752, 127.0095),
+    "강원": (37.8854, 127.7298),
+    "충북": (36.6357, 127.4917),
+    "충남": (36.6588, 126.6728),
+    "전북": (35.8202, 127.1088),
+    "전남": (34.8161, 126.4629),
+    "경북": (36.5760, 128.5056),
+    "경남": (35.2383, 128.6925),
+    "제주": (33.4890, 126.4983),
+}
+
+# REGION_CENTROIDS에 더할 지점 좌표 파일 (CSV, 첫 줄은 헤더, 열 순서: 지역, 위도, 경도)
+REGION_COORDS_PATH = os.environ.get("EMERGENCY_REGION_COORDS")
+
+EARTH_RADIUS_KM = 6371.0
+# 보관할 이동 계획 수 (슬라이더 조합마다 하나씩 생기므로 오래 안 쓴 것부터 제거)
+PLAN_CACHE_SIZE = 128
+
+# (연도, 파라미터, 과부족 벡터, 비용 행렬 해시) -> 이동 계획
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def distance_matrix(lat, lon):
+    """좌표 배열 (N,)로 지점 간 대원 거리(km) 행렬 (N, N)"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+_extra_coords = None
+_coords_lock = threading.Lock()
+
+
+def region_coordinates():
+    """지점 이름 -> (위도, 경도) (REGION_CENTROIDS + REGION_COORDS_PATH 파일, 파일은 처음 한 번만 읽음)"""
+    global _extra_coords
+    with _coords_lock:
+        if _extra_coords is None:
+            _extra_coords = {}
+            if REGION_COORDS_PATH:
+                with open(REGION_COORDS_PATH, encoding="utf-8-sig", newline="") as f:
+                    rows = csv.reader(f)
+                    next(rows, None)
+                    for row in rows:
+                        if len(row) >= 3 and row[0].strip():
+                            _extra_coords[row[0].strip()] = (float(row[1]), float(row[2]))
+        return {**REGION_CENTROIDS, **_extra_coords}
+
+
+def has_coordinates(regions):
+    """지점별 좌표 유무 (bool 배열)"""
+    coords = region_coordinates()
+    return np.array([r in coords for r in regions], dtype=bool)
+
+
+def region_distance_matrix(regions):
+    """지점 이름 배열의 거리 행렬 (좌표가 없는 지점이 있으면 ValueError - 먼저 has_coordinates로 거른다)"""
+    coords = region_coordinates()
+    missing = [r for r in regions if r not in coords]
+    if missing:
+        raise ValueError(f"좌표가 없는 지역: {missing}")
+    lat, lon = np.array([coords[r] for r in regions]).reshape(-1, 2).T
+    return distance_matrix(lat, lon)
+
+
+def plan_transfers(shortage, cost, max_cost=None):
+    """
+    최소 비용 우선 탐욕법으로 이동 계획을 계산
+
+    Args:
+        shortage: 지점별 과부족 (N,) - 양수면 부족, 음수면 여유
+        cost: 구급차 1대를 i에서 j로 옮기는 비용 (N, N)
+        max_cost: 이보다 비싼 이동(예: 너무 먼 거리)은 하지 않음
+
+    Returns:
+        tuple[list[tuple[int, int, int]], np.ndarray]: ([(보내는 곳, 받는 곳, 대수)], 재배치 후 과부족 (N,))
+    """
+    balance = np.asarray(shortage, dtype=np.int64).copy()
+    cost = np.asarray(cost, dtype=float)
+    donors = np.flatnonzero(balance < 0)
+    receivers = np.flatnonzero(balance > 0)
+    if len(donors) == 0 or len(receivers) == 0:
+        return [], balance
+
+    sub = cost[np.ix_(donors, receivers)]
+    allowed = np.isfinite(sub) if max_cost is None else np.isfinite(sub) & (sub <= max_cost)
+    d_idx, r_idx = np.nonzero(allowed)
+    heap = list(zip(sub[d_idx, r_idx].tolist(), donors[d_idx].tolist(), receivers[r_idx].tolist()))
+    heapq.heapify(heap)
+
+    surplus = {int(i): int(-balance[i]) for i in donors}
+    deficit = {int(j): int(balance[j]) for j in receivers}
+    remaining = sum(deficit.values())
+    transfers = []
+    while heap and remaining and surplus:
+        _, i, j = heapq.heappop(heap)
+        if i not in surplus or deficit[j] == 0:
+            continue
+        moved = min(surplus[i], deficit[j])
+        transfers.append((i, j, moved))
+        deficit[j] -= moved
+        remaining -= moved
+        surplus[i] -= moved
+        if surplus[i] == 0:
+            del surplus[i]
+        balance[i] += moved
+        balance[j] -= moved
+    return transfers, balance
+
+
+def reallocate(year, regions, shortage, params=(), cost=None, max_cost=None):
+    """
+    한 연도의 재배치 계획 표 (같은 연도/파라미터/과부족/비용 행렬이면 캐시에서 반환)
+
+    Args:
+        year: 연도 (캐시 키)
+        regions: 지점 이름 (N,)
+        shortage: 지점별 과부족 (N,)
+        params: 과부족을 계산한 파라미터 튜플 (사이클 타임, 목표값 등 - 캐시 키)
+        cost: 비용 행렬 (N, N). 없으면 시도 대표 좌표 간 거리(km)
+
+    Returns:
+        tuple[pd.DataFrame, np.ndarray]: (보내는 지역, 받는 지역, 대수, 거리(km) 표, 재배치 후 과부족)
+    """
+    shortage = np.asarray(shortage, dtype=np.int64)
+    if cost is not None:
+        cost = np.ascontiguousarray(cost, dtype=float)
+    # 직접 넘긴 비용 행렬은 내용 해시로 구분 (None이면 시도 대표 좌표 거리)
+    cost_key = None if cost is None else (cost.shape, hashlib.sha1(cost.tobytes()).hexdigest())
+    key = (year, tuple(params), max_cost, tuple(regions), shortage.tobytes(), cost_key)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    if cost is None:
+        cost = region_distance_matrix(regions)
+    transfers, after = plan_transfers(shortage, cost, max_cost)
+    regions = np.asarray(regions)
+    moves = pd.DataFrame(transfers, columns=["from", "to", "대수"])
+    table = pd.DataFrame({
+        "보내는 지역": regions[moves["from"].to_numpy(dtype=int)],
+        "받는 지역": regions[moves["to"].to_numpy(dtype=int)],
+        "대수": moves["대수"].to_numpy(dtype=int),
+        "거리(km)": np.round(cost[moves["from"].to_numpy(dtype=int), moves["to"].to_numpy(dtype=int)], 1),
+    })
+    result = (table, after)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > PLAN_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
@@ -1,65 +1,122 @@
 import os
 import sys
+import socket
 import subprocess
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 # 프로젝트 루트 경로 추가
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'streamlit_py'))
 
 # sql문 사용을 위한 import
 import sql_py.emergency_car as sql_car
 import sql_py.emergency_ex as sql_ex
 import sql_py.emergency_faq as sql_faq
 import sql_py.emergerncy_move as sql_move 
+import sql_py.quarantine as sql_quarantine
 
 # csv data upload를 위한 import
 import csv_py.emergency_car as csv_car
 import csv_py.emergency_move as csv_move
 import csv_py.emergency_ex as csv_ex
+import csv_py.telemetry as telemetry
+
+# 적재 중 대시보드가 스냅샷을 쓰도록 표시
+from utils import mark_ingest_running, mark_ingest_done
+
+STREAMLIT_PORT = 8501
+# Streamlit 프로세스 안에서 Prometheus 메트릭(/metrics)을 내보낼 포트 (metrics.py, 0이면 끔)
+METRICS_PORT = int(os.environ.get("EMERGENCY_METRICS_PORT", "9464"))
+READY_TIMEOUT_SECONDS = 30
+POLL_INTERVAL_SECONDS = 0.1
+
+# 테이블별 (테이블명, 생성 함수, 데이터 로드 함수, 교체 함수). 테이블끼리는 서로 독립이라 병렬로 처리한다.
+# 데이터 테이블은 *_staging에 적재한 뒤 교체하므로 적재 중에도 기존 테이블이 그대로 조회된다.
+TABLE_JOBS = [
+    ("emergency_car", sql_car.emergency_car_table, csv_car.load_car, sql_car.emergency_car_swap),
+    ("emergency_move", sql_move.emergency_move_table, csv_move.load_move, sql_move.emergency_move_swap),
+    ("emergency_ex", sql_ex.emergency_ex_table, csv_ex.main, sql_ex.emergency_ex_swap),
+    ("emergency_faq", sql_faq.emergency_faq_table, None, None),
+]
+
+def _setup_table(name, create_table, load_data, swap_table):
+    """테이블 하나를 생성하고 (있다면) 데이터를 로드한 뒤 live 테이블과 교체"""
+    create_table()
+    print(f"✅ {name} 테이블 생성 완료")
+    if load_data is not None:
+        load_data()
+        print(f"✅ {name} 데이터 로드 완료")
+    if swap_table is not None:
+        swap_table()
+        print(f"✅ {name} 테이블 교체 완료")
 
 def setup_database():
-    """데이터베이스 테이블 생성 및 데이터 로드"""
-    print("🔧 데이터베이스 테이블 생성 중...")
-    
+    """데이터베이스 테이블 생성 및 데이터 로드 (테이블별로 병렬 실행)"""
+    print("🔧 데이터베이스 테이블 생성 및 데이터 로드 중...")
+    start = time.perf_counter()
+    mark_ingest_running()
+    # 파일/단계별 시간, 행 수, rows/s는 csv_py.telemetry가 JSON Lines로 기록하고 마지막에 요약 표로 출력
+    telemetry.start_run()
+
     try:
-        # 테이블 생성
-        sql_car.emergency_car_table()
-        print("✅ emergency_car 테이블 생성 완료")
-        
-        sql_ex.emergency_ex_table()
-        print("✅ emergency_ex 테이블 생성 완료")
-        
-        sql_faq.emergency_faq_table()
-        print("✅ emergency_faq 테이블 생성 완료")
-        
-        sql_move.emergency_move_table()
-        print("✅ emergency_move 테이블 생성 완료")
-        
-        print("\n📊 CSV 데이터 로드 중...")
-        
-        # CSV 데이터 로드
-        csv_car.load_car()
-        print("✅ emergency_car 데이터 로드 완료")
-        
-        csv_move.load_move()
-        print("✅ emergency_move 데이터 로드 완료")
-        
-        csv_ex.main()
-        print("✅ emergency_ex 데이터 로드 완료")
-        
-        print("\n🎉 모든 데이터베이스 설정이 완료되었습니다!")
-        
+        # 검증에 실패한 행을 보관할 격리 테이블 (테이블별 적재가 각자 자기 기록만 지우고 채운다)
+        sql_quarantine.quarantine_table()
+
+        with ThreadPoolExecutor(max_workers=len(TABLE_JOBS)) as pool:
+            futures = [pool.submit(_setup_table, *job) for job in TABLE_JOBS]
+            # 하나라도 실패하면 예외가 여기서 다시 발생
+            for future in futures:
+                future.result()
+
+        print(f"\n🎉 모든 데이터베이스 설정이 완료되었습니다! ({time.perf_counter() - start:.1f}초)")
+
     except Exception as e:
         print(f"❌ 데이터베이스 설정 중 오류 발생: {e}")
         return False
-    
+
+    finally:
+        mark_ingest_done()
+        telemetry.finish_run()
+
     return True
 
+def _port_open(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(POLL_INTERVAL_SECONDS)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+def wait_for_port_free(port, timeout=5):
+    """기존 Streamlit이 포트를 놓을 때까지 대기 (고정 sleep 대신 폴링)"""
+    deadline = time.monotonic() + timeout
+    while _port_open(port) and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL_SECONDS)
+    return not _port_open(port)
+
+def wait_until_ready(process, port, timeout=READY_TIMEOUT_SECONDS):
+    """Streamlit 헬스 체크(/_stcore/health)가 응답할 때까지 폴링"""
+    url = f"http://127.0.0.1:{port}/_stcore/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=POLL_INTERVAL_SECONDS * 5) as resp:
+                if resp.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(POLL_INTERVAL_SECONDS)
+    return False
+
 def run_streamlit():
     """Streamlit 애플리케이션 실행"""
     print("🚀 Streamlit 애플리케이션을 시작합니다...")
     
+    start = time.perf_counter()
+
     # 기존 Streamlit 프로세스 종료
     print("🔄 기존 Streamlit 프로세스를 정리합니다...")
     try:
@@ -67,26 +124,39 @@ def run_streamlit():
     except:
         pass
     
-    # 잠시 대기
-    time.sleep(2)
+    # 포트가 비워질 때까지 대기
+    for port in (STREAMLIT_PORT, METRICS_PORT):
+        if port and not wait_for_port_free(port):
+            print(f"⚠️ 포트 {port}이 아직 사용 중입니다. 그대로 시작을 시도합니다.")
     
     # main.py의 절대 경로
     main_py_path = os.path.join(project_root, 'streamlit_py', 'main.py')
     
+    process = None
     try:
-        print(f"📍 Streamlit을 포트 8501에서 시작합니다...")
-        print(f"🌐 브라우저에서 http://localhost:8501 접속하세요")
+        print(f"📍 Streamlit을 포트 {STREAMLIT_PORT}에서 시작합니다...")
         
-        # Streamlit 실행 (백그라운드가 아닌 직접 실행)
-        result = subprocess.run([
+        # main.py가 EMERGENCY_METRICS_PORT를 보고 메트릭 서버를 같은 프로세스에서 띄운다
+        env = dict(os.environ, EMERGENCY_METRICS_PORT=str(METRICS_PORT) if METRICS_PORT else "")
+        process = subprocess.Popen([
             sys.executable, '-m', 'streamlit', 'run', main_py_path,
-            '--server.port', '8501'
-        ], cwd=project_root)
+            '--server.port', str(STREAMLIT_PORT)
+        ], cwd=project_root, env=env)
+        
+        if wait_until_ready(process, STREAMLIT_PORT):
+            print(f"🌐 브라우저에서 http://localhost:{STREAMLIT_PORT} 접속하세요 (준비 시간 {time.perf_counter() - start:.1f}초)")
+            if METRICS_PORT:
+                print(f"📈 메트릭: http://127.0.0.1:{METRICS_PORT}/metrics (첫 페이지 접속 후 시작)")
+        else:
+            print(f"⚠️ {READY_TIMEOUT_SECONDS}초 안에 Streamlit 준비 상태를 확인하지 못했습니다.")
         
-        return result.returncode == 0
+        # Streamlit 종료까지 대기
+        return process.wait() == 0
         
     except KeyboardInterrupt:
         print("\n🛑 사용자가 애플리케이션을 종료했습니다.")
+        if process is not None:
+            process.terminate()
         return True
     except Exception as e:
         print(f"❌ Streamlit 실행 중 오류 발생: {e}")
@@ -107,21 +177,28 @@ def run():
         return False
 
 def main():
-    """전체 실행 함수 - 데이터베이스 설정 + Streamlit 실행"""
+    """
+    전체 실행 함수 - 데이터베이스 설정과 Streamlit 실행을 동시에 진행
+    적재가 끝나기 전까지 대시보드는 마지막 스냅샷 데이터를 보여준다.
+    """
     print("=" * 50)
     print("🏥 응급의료 데이터 분석 시스템 시작")
     print("=" * 50)
     
-    # 데이터베이스 설정
-    if setup_database():
-        # Streamlit 실행
-        success = run_streamlit()
-        if success:
-            print("✅ 애플리케이션이 정상적으로 실행되었습니다.")
-        else:
-            print("❌ Streamlit 실행 중 문제가 발생했습니다.")
+    # 데이터베이스 설정은 백그라운드에서 진행
+    ingest = ThreadPoolExecutor(max_workers=1)
+    setup_future = ingest.submit(setup_database)
+    setup_future.add_done_callback(
+        lambda f: None if f.result() else print("❌ 데이터베이스 설정 실패 - 대시보드는 스냅샷 데이터로 동작합니다.")
+    )
+    
+    # Streamlit 실행
+    success = run_streamlit()
+    if success:
+        print("✅ 애플리케이션이 정상적으로 실행되었습니다.")
     else:
-        print("❌ 데이터베이스 설정 실패로 인해 애플리케이션을 시작할 수 없습니다.")
+        print("❌ Streamlit 실행 중 문제가 발생했습니다.")
+    ingest.shutdown(wait=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
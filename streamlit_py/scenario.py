@@ -0,0 +1,136 @@
+"""
+구급차 수요 what-if 시나리오 엔진
+
+지역 × 연도 × 시나리오 3차원 배열에 NumPy 브로드캐스팅으로 필요 구급차 수와 과부족을 한 번에 계산한다.
+시나리오는 (도시 사이클 타임, 농촌 사이클 타임, 목표값) 조합이며, 지역마다 도시/농촌 사이클 타임을
+다르게 적용하거나 특정 지역만 따로 지정(override)할 수 있다.
+목표값은 계산 방식에 따라 목표 가동률(utils.required_ambulances) 또는 허용 대기 확률(queueing.min_servers)이다.
+지역 17개 × 연도 5개 × 시나리오 수백 개도 한 번의 배열 연산이므로 슬라이더 조작에 바로 반응한다.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from utils import required_ambulances
+from queueing import min_servers
+
+# 특별시·광역시·특별자치시는 도시, 나머지(도)는 농촌 사이클 타임을 적용
+URBAN_REGIONS = frozenset(["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종"])
+
+# 분석 페이지 설명의 범위 (도시 0.5~1.0시간, 농촌 2.0~2.5시간, 목표 가동률 0.3~0.5)
+DEFAULT_URBAN_CYCLE_HOURS = 0.75
+DEFAULT_RURAL_CYCLE_HOURS = 2.25
+DEFAULT_TARGET_UTILIZATION = 0.5
+# Erlang C 방식의 기본 목표: 호출의 20%까지만 대기 허용
+DEFAULT_MAX_WAIT_PROB = 0.2
+
+# 계산 방식 -> 시나리오 표에서 목표값으로 쓰는 컬럼
+TARGET_COLUMNS = {"utilization": "목표_가동률", "erlang_c": "목표_대기확률"}
+
+
+class Panel:
+    """
+    지역 × 연도 배열로 펼친 호출 수/구급차 수
+
+    Attributes:
+        regions: 지역 이름 배열 (R,)
+        years: 연도 배열 (Y,)
+        calls: 연간 호출 수 (R, Y) - 데이터가 없는 칸은 NaN
+        fleet: 현재 구급차 수 (R, Y) - 데이터가 없는 칸은 NaN
+    """
+
+    def __init__(self, regions, years, calls, fleet):
+        self.regions = regions
+        self.years = years
+        self.calls = calls
+        self.fleet = fleet
+
+    @classmethod
+    def from_frame(cls, df, fleet_column="구급차수"):
+        """
+        create_sample_data() 결과(연도, 지역, 구급차수, 가용구급차수, 이송환자수)를 배열로 변환
+
+        fleet_column="가용구급차수"면 보유 대수 대신 인력 기준으로 운영 가능한 대수를 현재 구급차 수로 쓴다.
+        """
+        calls = df.pivot_table(index="지역", columns="연도", values="이송환자수", aggfunc="first")
+        fleet = df.pivot_table(index="지역", columns="연도", values=fleet_column, aggfunc="first")
+        fleet = fleet.reindex(index=calls.index, columns=calls.columns)
+        return cls(calls.index.to_numpy(), calls.columns.to_numpy(),
+                   calls.to_numpy(dtype=float), fleet.to_numpy(dtype=float))
+
+    def is_urban(self):
+        return np.isin(self.regions, list(URBAN_REGIONS))
+
+
+def scenario_grid(urban_cycle_hours, rural_cycle_hours, target, method="utilization"):
+    """
+    세 파라미터 목록의 모든 조합을 시나리오 표로 만든다
+
+    Args:
+        target: 목표 가동률(method="utilization") 또는 허용 대기 확률(method="erlang_c") 목록
+
+    Returns:
+        pd.DataFrame: 도시_사이클, 농촌_사이클, 목표값(TARGET_COLUMNS[method]) 컬럼 (행 하나가 시나리오 하나)
+    """
+    rows = list(itertools.product(np.atleast_1d(urban_cycle_hours),
+                                  np.atleast_1d(rural_cycle_hours),
+                                  np.atleast_1d(target)))
+    return pd.DataFrame(rows, columns=["도시_사이클", "농촌_사이클", TARGET_COLUMNS[method]])
+
+
+def cycle_matrix(panel, scenarios, overrides=None):
+    """
+    지역별 사이클 타임 (R, S). 도시/농촌 구분을 적용한 뒤 overrides({지역: 시간})로 덮어쓴다
+    """
+    urban = panel.is_urban()[:, None]
+    cycle = np.where(urban, scenarios["도시_사이클"].to_numpy()[None, :],
+                     scenarios["농촌_사이클"].to_numpy()[None, :])
+    for region, hours in (overrides or {}).items():
+        cycle[panel.regions == region, :] = hours
+    return cycle
+
+
+def evaluate(panel, scenarios, overrides=None, method="utilization", wait_hours=0.0):
+    """
+    모든 지역 × 연도 × 시나리오의 필요 구급차 수와 과부족을 계산
+
+    Args:
+        method: "utilization" (가동률 비율 공식) 또는 "erlang_c" (M/M/c 대기 확률 기준)
+        wait_hours: erlang_c에서 P(대기 > wait_hours)를 목표로 할 때의 대기 시간 (0이면 P(대기))
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (필요 구급차 수, 과부족) 둘 다 (R, Y, S).
+        과부족 = 필요 - 현재 (양수면 부족). 데이터가 없는 칸은 0으로 계산된다.
+    """
+    cycle = cycle_matrix(panel, scenarios, overrides)[:, None, :]                          # (R, 1, S)
+    target = scenarios[TARGET_COLUMNS[method]].to_numpy(dtype=float)[None, None, :]       # (1, 1, S)
+    calls = np.nan_to_num(panel.calls)[:, :, None]                                         # (R, Y, 1)
+    if method == "erlang_c":
+        required = min_servers(calls, cycle, target, wait_hours)
+    else:
+        required = required_ambulances(calls, cycle, target)
+    shortage = required - np.nan_to_num(panel.fleet).astype(np.int64)[:, :, None]
+    return required, shortage
+
+
+def summarize(panel, scenarios, shortage):
+    """
+    시나리오 × 연도별 부족 지역 수와 총 부족 대수
+
+    Returns:
+        pd.DataFrame: 시나리오 컬럼 + 연도, 부족_지역수, 총_부족대수
+    """
+    has_data = ~np.isnan(panel.calls)[:, :, None]
+    short = (shortage > 0) & has_data
+    shortage_regions = short.sum(axis=0)                              # (Y, S)
+    total_shortage = np.where(short, shortage, 0).sum(axis=0)         # (Y, S)
+
+    frames = []
+    for y, year in enumerate(panel.years):
+        frame = scenarios.copy()
+        frame["연도"] = year
+        frame["부족_지역수"] = shortage_regions[y]
+        frame["총_부족대수"] = total_shortage[y]
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
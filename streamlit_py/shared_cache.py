@@ -0,0 +1,137 @@
+"""
+여러 Streamlit 서버 프로세스가 함께 쓰는 테이블 캐시
+
+로드밸런서 뒤에 Streamlit 프로세스를 여러 개 띄우면 프로세스마다 같은 테이블을 DB에서 다시 읽는다.
+이 모듈은 utils의 테이블 조회 결과를 (테이블명, 적재 세대) 단위로 공유한다.
+적재 세대는 run.py가 적재를 끝낼 때마다 바뀌므로, 데이터가 바뀔 때 한 번만 DB를 읽게 된다.
+
+EMERGENCY_CACHE_BACKEND로 저장소를 고른다.
+    mmap    (기본) 같은 호스트의 프로세스끼리 공유. EMERGENCY_CACHE_DIR 아래 파일을 mmap으로 읽음
+    network 네트워크 키-값 저장소 (EMERGENCY_CACHE_URL, 예: redis://127.0.0.1:6379/0, `pip install redis` 필요)
+    local   프로세스 내부 dict (network 백엔드 대역, 개발/테스트용)
+    none    캐시 사용 안 함
+"""
+import os
+import mmap
+import pickle
+
+CACHE_BACKEND = os.environ.get("EMERGENCY_CACHE_BACKEND", "mmap").lower()
+# 공유 메모리(/dev/shm)가 있으면 그 아래, 없으면 프로젝트 루트의 .snapshot/cache
+CACHE_DIR = os.environ.get(
+    "EMERGENCY_CACHE_DIR",
+    "/dev/shm/emergency_cache" if os.path.isdir("/dev/shm")
+    else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".snapshot", "cache"),
+)
+CACHE_URL = os.environ.get("EMERGENCY_CACHE_URL", "redis://127.0.0.1:6379/0")
+# 네트워크 저장소에 남는 이전 세대 항목은 만료 시간으로 정리 (초)
+CACHE_TTL_SECONDS = int(os.environ.get("EMERGENCY_CACHE_TTL_SECONDS", str(24 * 3600)))
+
+
+class MmapCache:
+    """한 호스트 안의 프로세스가 공유하는 파일 캐시 (읽기는 mmap, 쓰기는 임시 파일 후 원자적 교체)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, name, generation):
+        return os.path.join(self.directory, f"{name}.{generation}.pkl")
+
+    def get(self, name, generation):
+        try:
+            with open(self._path(name, generation), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return pickle.loads(buf)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, name, generation, value):
+        path = self._path(name, generation)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        # 같은 테이블의 이전 세대 파일 정리
+        current = os.path.basename(path)
+        for filename in os.listdir(self.directory):
+            if filename.startswith(f"{name}.") and filename.endswith(".pkl") and filename != current:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+
+class NetworkCache:
+    """
+    get(key) / set(key, value, ex=초) 인터페이스를 가진 클라이언트(예: redis.Redis)를 쓰는 캐시
+    저장소 장애는 캐시 미스로 처리하여 DB 조회로 넘어간다.
+    """
+
+    def __init__(self, client, prefix="emergency", ttl_seconds=CACHE_TTL_SECONDS):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, name, generation):
+        return f"{self.prefix}:{name}:{generation}"
+
+    def get(self, name, generation):
+        try:
+            raw = self.client.get(self._key(name, generation))
+            return pickle.loads(raw) if raw is not None else None
+        except Exception:
+            return None
+
+    def put(self, name, generation, value):
+        try:
+            self.client.set(self._key(name, generation),
+                            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=self.ttl_seconds)
+        except Exception:
+            pass
+
+
+class LocalClient:
+    """네트워크 저장소 대신 쓰는 프로세스 내부 dict 클라이언트 (만료 시간은 무시)"""
+
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._data[key] = value
+
+
+class NullCache:
+    """캐시를 쓰지 않을 때 (항상 미스)"""
+
+    def get(self, name, generation):
+        return None
+
+    def put(self, name, generation, value):
+        pass
+
+
+_cache = None
+
+def get_shared_cache():
+    """EMERGENCY_CACHE_BACKEND 설정에 맞는 캐시 (프로세스당 하나)"""
+    global _cache
+    if _cache is None:
+        if CACHE_BACKEND == "mmap":
+            _cache = MmapCache(CACHE_DIR)
+        elif CACHE_BACKEND == "network":
+            import redis
+            _cache = NetworkCache(redis.Redis.from_url(CACHE_URL))
+        elif CACHE_BACKEND == "local":
+            _cache = NetworkCache(LocalClient())
+        elif CACHE_BACKEND == "none":
+            _cache = NullCache()
+        else:
+            raise ValueError(f"지원하지 않는 EMERGENCY_CACHE_BACKEND: {CACHE_BACKEND} (mmap / network / local / none)")
+    return _cache
@@ -4,10 +4,26 @@ import streamlit as st
 import pymysql
 import sys
 import os
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # 프로젝트 루트의 db_config 모듈을 import하기 위해 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db_config import get_connection
+from single_flight import SingleFlight
+from shared_cache import get_shared_cache
+from metrics import instrument_loader
+
+# 적재(run.py)가 진행 중이거나 DB가 비어 있을 때 보여줄 마지막 정상 데이터 스냅샷 위치
+SNAPSHOT_DIR = os.environ.get(
+    "EMERGENCY_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".snapshot"),
+)
+_INGEST_RUNNING = os.path.join(SNAPSHOT_DIR, "ingest_running")
+_INGEST_DONE = os.path.join(SNAPSHOT_DIR, "ingest_done")
 
 def get_mysql_connection():
     """MySQL 데이터베이스 연결"""
@@ -18,21 +34,114 @@ def get_mysql_connection():
         st.error(f"MySQL 연결 오류: {e}")
         return None
 
+# ---------- 스냅샷 ----------
+def mark_ingest_running():
+    """run.py가 적재를 시작할 때 호출 - 이 동안 대시보드는 스냅샷을 사용"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    open(_INGEST_RUNNING, "w").close()
+
+def mark_ingest_done():
+    """적재 완료 표시 - 이후 처음 읽은 DB 결과로 스냅샷/공유 캐시를 갱신"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    # 파일 내용이 적재 세대(generation) - 공유 캐시 키로 쓰인다
+    with open(_INGEST_DONE, "w") as f:
+        f.write(str(time.time_ns()))
+    if os.path.exists(_INGEST_RUNNING):
+        os.remove(_INGEST_RUNNING)
+
+def ingest_generation():
+    """마지막 적재 완료 세대. 적재 기록이 없으면 None (이때는 공유 캐시를 쓰지 않음)"""
+    try:
+        with open(_INGEST_DONE) as f:
+            return f.read().strip() or str(os.stat(_INGEST_DONE).st_mtime_ns)
+    except OSError:
+        return None
+
+def _snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.pkl")
+
+def _read_snapshot(name):
+    path = _snapshot_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        return None
+
+def _save_snapshot(name, df):
+    """마지막 적재 완료 이후 아직 스냅샷을 갱신하지 않았을 때만 저장 (원자적 교체)"""
+    path = _snapshot_path(name)
+    done_at = os.path.getmtime(_INGEST_DONE) if os.path.exists(_INGEST_DONE) else 0
+    if os.path.exists(path) and os.path.getmtime(path) >= done_at:
+        return
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+# 여러 세션이 동시에 같은 테이블을 요청하면 DB 조회는 한 번만 하고 결과를 나눠 쓴다
+_table_flight = SingleFlight()
+
+def _read_table(name, query):
+    """
+    테이블 조회. 적재 중이거나 DB 결과가 비어 있으면(또는 연결 실패 시) 마지막 스냅샷을 대신 반환
+    스냅샷도 없으면 DB 결과를 그대로 반환하거나 예외를 다시 던진다.
+    같은 적재 세대의 결과는 다른 Streamlit 프로세스와 공유 캐시로 나눠 쓰고,
+    프로세스 안의 동시 요청은 하나의 조회로 합친다.
+    """
+    if os.path.exists(_INGEST_RUNNING):
+        snapshot = _read_snapshot(name)
+        if snapshot is not None:
+            return snapshot
+
+    generation = ingest_generation()
+    df, shared = _table_flight.do((name, generation), _load_table, name, query, generation)
+    # 호출한 쪽에서 컬럼을 추가/변경하므로 함께 받은 결과는 각자 복사본을 쓴다
+    return df.copy() if shared else df
+
+def _load_table(name, query, generation):
+    """공유 캐시 -> DB 순으로 테이블을 읽는다 (_read_table에서 single-flight로 호출)"""
+    if generation is not None:
+        cached = get_shared_cache().get(name, generation)
+        if cached is not None:
+            return cached
+
+    try:
+        connection = get_connection()
+        try:
+            df = pd.read_sql(query, connection)
+        finally:
+            connection.close()
+    except Exception:
+        snapshot = _read_snapshot(name)
+        if snapshot is not None:
+            return snapshot
+        raise
+
+    if df.empty:
+        snapshot = _read_snapshot(name)
+        return snapshot if snapshot is not None else df
+
+    _save_snapshot(name, df)
+    if generation is not None:
+        get_shared_cache().put(name, generation, df)
+    return df
+
+# 로더별 호출 수, 소요 시간, 반환 행 수는 metrics 모듈이 /metrics로 내보낸다
+@instrument_loader
 def load_emergency_car_data():
     """emergency_car 테이블에서 구급차 및 이송환자 데이터 로드"""
     try:
-        connection = get_mysql_connection()
-        if connection is None:
-            st.warning("데이터베이스 연결에 실패했습니다.")
-            return pd.DataFrame()
-        
         query = """
-        SELECT year, car_local as 지역, car_count as 구급차수
+        SELECT year, car_local as 지역, car_count as 구급차수, staffed_car_count as 가용구급차수
         FROM emergency_car 
         ORDER BY year, car_local
         """
-        df = pd.read_sql(query, connection)
-        connection.close()
+        df = _read_table("emergency_car", query)
         
         if df.empty:
             st.warning("emergency_car 테이블에 데이터가 없습니다.")
@@ -42,11 +151,7 @@ def load_emergency_car_data():
         df['연도'] = df['year'].astype(int)
         df = df.drop('year', axis=1)
         
-        # '전체' 지역 제외
-        df = df[df['지역'] != '전체']
-        
-        # 중복 데이터 제거 (연도, 지역 기준으로)
-        df = df.drop_duplicates(subset=['연도', '지역'], keep='first')
+        # '전체' 합계 행은 적재 때 제외되고, (연도, 지역)은 UNIQUE 제약으로 하나뿐이므로 조회 후 정리 불필요
         
         return df
         
@@ -55,30 +160,22 @@ def load_emergency_car_data():
         st.error(f"오류 세부사항: {str(e)}")
         return pd.DataFrame()
 
+@instrument_loader
 def load_emergency_move_data():
     """emergency_move 테이블에서 후송 횟수 데이터 로드"""
     try:
-        connection = get_mysql_connection()
-        if connection is None:
-            return pd.DataFrame()
-        
         query = """
         SELECT year, move_local as 지역, move_count as 이송환자수
         FROM emergency_move 
         ORDER BY year, move_local
         """
-        df = pd.read_sql(query, connection)
-        connection.close()
+        df = _read_table("emergency_move", query)
         
         # 연도를 정수형으로 변환
         df['연도'] = df['year'].astype(int)
         df = df.drop('year', axis=1)
         
-        # '전체' 지역 제외
-        df = df[df['지역'] != '전체']
-        
-        # 중복 데이터 제거 (연도, 지역 기준으로)
-        df = df.drop_duplicates(subset=['연도', '지역'], keep='first')
+        # '전체' 합계 행은 적재 때 제외되고, (연도, 지역)은 UNIQUE 제약으로 하나뿐이므로 조회 후 정리 불필요
         
         return df
         
@@ -86,20 +183,16 @@ def load_emergency_move_data():
         st.error(f"후송 데이터 로드 중 오류가 발생했습니다: {e}")
         return pd.DataFrame()
 
+@instrument_loader
 def load_emergency_ex_data():
     """emergency_ex 테이블에서 환자 정보 데이터 로드"""
     try:
-        connection = get_mysql_connection()
-        if connection is None:
-            return pd.DataFrame()
-        
         query = """
         SELECT year, local as 지역, cause as 증상, gender as 성별, job as 직업
         FROM emergency_ex 
         ORDER BY year, local
         """
-        df = pd.read_sql(query, connection)
-        connection.close()
+        df = _read_table("emergency_ex", query)
         
         # 연도를 정수형으로 변환
         df['연도'] = df['year'].astype(int)
@@ -114,11 +207,35 @@ def load_emergency_ex_data():
         st.error(f"환자 정보 데이터 로드 중 오류가 발생했습니다: {e}")
         return pd.DataFrame()
 
+def load_concurrently(*loaders):
+    """
+    서로 독립인 로드 함수들을 동시에 실행하고 결과를 인자 순서대로 반환
+
+    캐시가 비어 있을 때(적재 직후) 테이블 조회를 하나씩 기다리면 페이지 로딩이 모든 쿼리 시간의 합이 되므로,
+    스레드마다 자기 연결로 동시에 조회하여 가장 느린 쿼리 시간에 가깝게 줄인다.
+    각 스레드에는 호출한 쪽의 contextvars(쿼리 로그의 페이지 태그 등)와 Streamlit 실행 컨텍스트를 복사하여
+    st.error/st.warning이 원래 페이지에 그대로 표시되게 한다.
+    """
+    if len(loaders) <= 1:
+        return tuple(loader() for loader in loaders)
+
+    script_ctx = get_script_run_ctx(suppress_warning=True)
+
+    def run(ctx, loader):
+        if script_ctx is not None:
+            add_script_run_ctx(threading.current_thread(), script_ctx)
+        return ctx.run(loader)
+
+    # 호출마다 작은 풀을 만든다 (로드 함수 안에서 다시 load_concurrently를 불러도 서로 기다리지 않음)
+    with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="table_load") as pool:
+        futures = [pool.submit(run, contextvars.copy_context(), loader) for loader in loaders]
+        return tuple(future.result() for future in futures)
+
 def get_regional_data(region):
     """특정 지역의 종합 데이터 반환"""
-    car_data = load_emergency_car_data()
-    move_data = load_emergency_move_data()
-    ex_data = load_emergency_ex_data()
+    car_data, move_data, ex_data = load_concurrently(
+        load_emergency_car_data, load_emergency_move_data, load_emergency_ex_data
+    )
     
     # 지역별 필터링
     region_car = car_data[car_data['지역'] == region] if not car_data.empty else pd.DataFrame()
@@ -131,26 +248,30 @@ def get_regional_data(region):
         'ex_data': region_ex
     }
 
+# 통합 데이터 컬럼 (가용구급차수: 인력 기준으로 상시 운영 가능한 구급차 수, csv_py.emergency_car.add_staffed_capacity)
+DATA_COLUMNS = ['연도', '지역', '구급차수', '가용구급차수', '이송환자수']
+
 # 통합 데이터 생성 함수 (기존 create_sample_data 대체)
+@instrument_loader
 def create_sample_data():
     """통합 데이터 생성 - 구급차 데이터와 후송 데이터를 병합"""
     try:
-        car_data = load_emergency_car_data()
-        move_data = load_emergency_move_data()
+        car_data, move_data = load_concurrently(load_emergency_car_data, load_emergency_move_data)
         
         # 두 데이터 모두 비어있으면 기본 구조 반환
         if car_data.empty and move_data.empty:
-            return pd.DataFrame(columns=['연도', '지역', '구급차수', '이송환자수'])
+            return pd.DataFrame(columns=DATA_COLUMNS)
         
         # 구급차 데이터가 비어있으면 후송 데이터만 반환
         if car_data.empty and not move_data.empty:
             move_data['구급차수'] = 0
-            return move_data[['연도', '지역', '구급차수', '이송환자수']]
+            move_data['가용구급차수'] = 0
+            return move_data[DATA_COLUMNS]
         
         # 후송 데이터가 비어있으면 구급차 데이터만 반환  
         if move_data.empty and not car_data.empty:
             car_data['이송환자수'] = 0
-            return car_data[['연도', '지역', '구급차수', '이송환자수']]
+            return car_data[DATA_COLUMNS]
         
         # 두 데이터 모두 있으면 병합
         if not car_data.empty and not move_data.empty:
@@ -161,17 +282,11 @@ def create_sample_data():
                 how='outer'
             )
             
-            # NaN 값을 0으로 채우기
+            # NaN 값을 0으로 채우기 (두 테이블 모두 (연도, 지역)이 유일하므로 병합 결과도 유일)
             merged_data = merged_data.fillna(0)
             
-            # '전체' 지역 제외 (혹시 병합 과정에서 생성되었을 경우)
-            merged_data = merged_data[merged_data['지역'] != '전체']
-            
-            # 중복 데이터 제거 (연도, 지역 기준으로)
-            merged_data = merged_data.drop_duplicates(subset=['연도', '지역'], keep='first')
-            
             # 숫자형 컬럼의 데이터 타입 정리
-            numeric_cols = ['구급차수', '이송환자수']
+            numeric_cols = ['구급차수', '가용구급차수', '이송환자수']
             for col in numeric_cols:
                 if col in merged_data.columns:
                     merged_data[col] = pd.to_numeric(merged_data[col], errors='coerce').fillna(0).astype(int)
@@ -179,13 +294,26 @@ def create_sample_data():
             return merged_data
         
         # 기본 빈 DataFrame 반환
-        return pd.DataFrame(columns=['연도', '지역', '구급차수', '이송환자수'])
+        return pd.DataFrame(columns=DATA_COLUMNS)
         
     except Exception as e:
         st.error(f"데이터 생성 중 오류: {e}")
-        return pd.DataFrame(columns=['연도', '지역', '구급차수', '이송환자수'])
+        return pd.DataFrame(columns=DATA_COLUMNS)
 
 # 필요 구급차 수 계산 함수
+HOURS_PER_YEAR = 365 * 24
+
+def required_ambulances(calls_per_year, avg_cycle_time_hours, target_utilization):
+    """
+    필요 구급차 수 계산 (배열 입력 가능 - NumPy 브로드캐스팅으로 여러 지역/시나리오를 한 번에 계산)
+    calls_per_year: 연간 호출 수
+    avg_cycle_time_hours: 평균 사이클 타임 (시간)
+    target_utilization: 목표 가동률 (0.3 = 30%)
+    """
+    # 필요 구급차 수 = (호출량 * 평균 사이클 타임) / (연간 시간 * 목표 가동률)
+    required = (np.asarray(calls_per_year, dtype=float) * avg_cycle_time_hours) / (HOURS_PER_YEAR * np.asarray(target_utilization, dtype=float))
+    return np.ceil(required).astype(np.int64)
+
 def calculate_required_ambulances(calls_per_year, avg_cycle_time_hours, target_utilization):
     """
     필요 구급차 수 계산
@@ -193,10 +321,4 @@ def calculate_required_ambulances(calls_per_year, avg_cycle_time_hours, target_u
     avg_cycle_time_hours: 평균 사이클 타임 (시간)
     target_utilization: 목표 가동률 (0.3 = 30%)
     """
-    # 연간 시간 수
-    hours_per_year = 365 * 24
-    
-    # 필요 구급차 수 = (호출량 * 평균 사이클 타임) / (연간 시간 * 목표 가동률)
-    required = (calls_per_year * avg_cycle_time_hours) / (hours_per_year * target_utilization)
-    
-    return int(np.ceil(required))
\ No newline at end of file
+    return int(required_ambulances(calls_per_year, avg_cycle_time_hours, target_utilization))